@@ -1,6 +1,6 @@
 import os, json, logging, inspect, re
 from flask import Flask, request, jsonify
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
 
 # RAG 관리용 블루프린트 (rag_admin.py)
 from .rag_admin import rag_admin_bp
@@ -65,15 +65,26 @@ def _extract_year_from_query(query: str) -> int | None:
 # ─────────────────────────────────────────────────────────────
 # 설정 로딩
 # ─────────────────────────────────────────────────────────────
-def _load_cfg(app_root: str):
+_ORACLE_ENV_KEYS = ("ORACLE_USER", "ORACLE_PASSWORD", "ORACLE_DSN", "ORACLE_CLIENT_PATH")
+
+def _load_cfg(app_root: str, apply_env: bool = True):
+    """
+    apply_env=False: 다른 서비스 프로세스(LLM)에 공동 배치될 때 — .env/HF 캐시 경로를 os.environ에 쓰지 않고
+    설정 dict로만 전달 (호스트 프로세스의 환경은 그대로, 값 우선순위는 load_dotenv와 동일하게 os.environ 우선)
+    """
     # 1) .env
     env_file = os.path.join(app_root, ".env")
-    if os.path.exists(env_file):
-        load_dotenv(env_file)
-        log.info(".env loaded: %s", env_file)
+    if apply_env:
+        if os.path.exists(env_file):
+            load_dotenv(env_file)
+            log.info(".env loaded: %s", env_file)
+        env = os.environ
+    else:
+        env = {**(dotenv_values(env_file) if os.path.exists(env_file) else {}), **os.environ}
+        env = {k: v for k, v in env.items() if v is not None}
 
     # 2) rag_config.json (RAG 관련)
-    cfg_path = os.getenv("AGENT_CONFIG_PATH") or os.path.join(app_root, "configs", "rag_config.json")
+    cfg_path = env.get("AGENT_CONFIG_PATH") or os.path.join(app_root, "configs", "rag_config.json")
     try:
         with open(cfg_path, "r", encoding="utf-8") as f:
             rag_cfg = json.load(f)
@@ -88,15 +99,16 @@ def _load_cfg(app_root: str):
 
     # 3) 파일 경로 기본값
     base_files = os.path.join(app_root, "tools", "rag_agent_tool", "files")
-    pdf_dir = os.getenv("RAG_PDF_DIR", os.path.join(base_files, "pdf"))
-    chroma_dir = os.getenv("CHROMA_PERSIST_DIR", os.path.join(base_files, "chroma"))
+    pdf_dir = env.get("RAG_PDF_DIR", os.path.join(base_files, "pdf"))
+    chroma_dir = env.get("CHROMA_PERSIST_DIR", os.path.join(base_files, "chroma"))
 
-    # 4) HF 캐시
-    hf_home = os.getenv("HF_HOME", os.path.join(base_files, "model"))
-    os.environ.setdefault("HF_HOME", hf_home)
-    os.environ.setdefault("TRANSFORMERS_CACHE", hf_home)
-    os.environ.setdefault("SENTENCE_TRANSFORMERS_HOME", hf_home)
-    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    # 4) HF 캐시 (공동 배치 시에는 임베딩 모델 로드에 cache_folder로만 전달)
+    hf_home = env.get("HF_HOME", os.path.join(base_files, "model"))
+    if apply_env:
+        os.environ.setdefault("HF_HOME", hf_home)
+        os.environ.setdefault("TRANSFORMERS_CACHE", hf_home)
+        os.environ.setdefault("SENTENCE_TRANSFORMERS_HOME", hf_home)
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
     return {
         "RAG_PDF_DIR": pdf_dir,
@@ -106,7 +118,9 @@ def _load_cfg(app_root: str):
         "CHUNK_OVERLAP": int(rag_cfg.get("chunk", {}).get("overlap", 120)),
         "SEM_T_WEB_GUIDE": float(rag_cfg.get("semantic_thresholds", {}).get("web_guide", 0.46)),
         "SEM_T_GROUP": float(rag_cfg.get("semantic_thresholds", {}).get("group_match", 0.40)),
-        "ROUTER": rag_cfg.get("router", {"top_k":5, "preferred_group":"", "seed_phrases":[]})
+        "ROUTER": rag_cfg.get("router", {"top_k":5, "preferred_group":"", "seed_phrases":[]}),
+        "HF_HOME": hf_home,
+        "ORACLE_ENV": {k: env.get(k) for k in _ORACLE_ENV_KEYS},
     }
 
 # ─────────────────────────────────────────────────────────────
@@ -202,6 +216,109 @@ def _guess_tool_from_payload(payload: dict) -> str | None:
     log.info("No specific tool pattern detected, returning None")
     return None
 
+# ─────────────────────────────────────────────────────────────
+# 하위호환 plan_and_run (HTTP 라우트 / LLM 서비스 in-process 호출 공용)
+# ─────────────────────────────────────────────────────────────
+def plan_and_run(payload: dict):
+    """
+    orchestrator.agent_client 페이로드를 MCP 툴 호출로 매핑해 실행한다.
+    반환: (응답 dict, HTTP 상태코드)
+    """
+    log.info("[Compat] plan_and_run called with keys: %s", list(payload.keys()))
+    
+    try:
+        tool = _guess_tool_from_payload(payload)
+        if not tool:
+            log.error("Could not infer tool from payload: %s", payload)
+            return {"ok": False, "error": "could not infer tool from payload"}, 400
+
+        # 기본 args 구성
+        args = payload.get("args") or {}
+        
+        # 질문 텍스트 확보
+        query_text = ""
+        if "query" not in args:
+            query_text = payload.get("query") or payload.get("question") or payload.get("input") or ""
+            if query_text:
+                args["query"] = query_text
+        else:
+            query_text = args["query"]
+        
+        # 기타 페이로드 정보 전달
+        for k in ("usr_id","conv_id","session","slots","intent"):
+            if k in payload and k not in args:
+                args[k] = payload[k]
+
+        # 🔥 오라클 툴 전용: 파라미터 자동 추출
+        if tool.startswith("oracle_agent_tool."):
+            if query_text:
+                # 대학명 추출
+                if "university" not in args or not args["university"]:
+                    extracted_univ = _extract_university_from_query(query_text)
+                    if extracted_univ:
+                        args["university"] = extracted_univ
+                        log.info("[Compat] Extracted university: %s", extracted_univ)
+                
+                # 연도 추출
+                if "year" not in args or not args["year"]:
+                    extracted_year = _extract_year_from_query(query_text)
+                    if extracted_year:
+                        args["year"] = extracted_year
+                        log.info("[Compat] Extracted year: %s", extracted_year)
+
+        log.info("[Compat] /v1/agent/plan_and_run -> %s with args: %s", tool, list(args.keys()))
+        res = _call_tool(tool, args)
+
+        log.info("[Compat] Tool result keys: %s", list(res.keys()) if isinstance(res, dict) else type(res).__name__)
+
+        # ⬇⬇ 오케스트레이터가 바로 인식하도록 rag/final_text/final_data는 최상위로 승격
+        if isinstance(res, dict):
+            # RAG 결과가 있으면 최상위로 승격
+            if "rag" in res:
+                out = {"ok": True, "rag": res["rag"]}
+                log.info("[Compat] RAG result promoted to top level")
+                return out, 200
+            # 기타 중요 키들도 승격
+            elif any(key in res for key in ["final_text", "final_data", "matches"]):
+                out = {"ok": True}
+                out.update(res)
+                log.info("[Compat] Result keys promoted to top level")
+                return out, 200
+            # tool_result 내부에 RAG가 있는지 확인
+            elif "tool_result" in res and isinstance(res["tool_result"], dict):
+                for tool_name, tool_res in res["tool_result"].items():
+                    if isinstance(tool_res, dict) and "rag" in tool_res:
+                        out = {"ok": True, "rag": tool_res["rag"]}
+                        log.info("[Compat] RAG result found in tool_result and promoted")
+                        return out, 200
+            # 오라클 결과 처리: result 키가 있으면 final_data로 승격
+            elif tool.startswith("oracle_agent_tool.") and "result" in res:
+                if res.get("ok"):
+                    out = {"ok": True, "final_data": res["result"]}
+                    log.info("[Compat] Oracle result promoted to final_data")
+                    return out, 200
+
+        # 기본 응답 구조
+        return {"ok": True, "data": res}, 200
+    except Exception as e:
+        log.exception("compat plan_and_run error: %s", e)
+        return {"ok": False, "error": str(e)}, 500
+
+
+def init_local_runtime(app_root: str | None = None) -> dict:
+    """
+    Flask 앱 없이 툴 레지스트리만 초기화 (LLM 서비스와 같은 프로세스에 배치될 때 사용)
+    - 이미 초기화되어 있으면 재사용
+    - 호스트 프로세스의 os.environ은 수정하지 않음 (.env 값은 CFG로만 툴에 전달)
+    """
+    global CFG
+    if not REGISTRY:
+        app_root = app_root or os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        CFG = _load_cfg(app_root, apply_env=False)
+        _register_builtin_tools(CFG)
+        log.info("local runtime ready: tools=%s", ", ".join(sorted(REGISTRY.keys())))
+    return REGISTRY
+
 # ─────────────────────────────────────────────────────────────
 # Flask 앱
 # ─────────────────────────────────────────────────────────────
@@ -260,85 +377,8 @@ def create_app():
         페이로드를 MCP 툴 호출로 매핑해 실행한다.
         """
         payload = request.get_json(silent=True) or {}
-        log.info("[Compat] /v1/agent/plan_and_run called with keys: %s", list(payload.keys()))
-        
-        try:
-            tool = _guess_tool_from_payload(payload)
-            if not tool:
-                log.error("Could not infer tool from payload: %s", payload)
-                return jsonify({"ok": False, "error": "could not infer tool from payload"}), 400
-
-            # 기본 args 구성
-            args = payload.get("args") or {}
-            
-            # 질문 텍스트 확보
-            query_text = ""
-            if "query" not in args:
-                query_text = payload.get("query") or payload.get("question") or payload.get("input") or ""
-                if query_text:
-                    args["query"] = query_text
-            else:
-                query_text = args["query"]
-            
-            # 기타 페이로드 정보 전달
-            for k in ("usr_id","conv_id","session","slots","intent"):
-                if k in payload and k not in args:
-                    args[k] = payload[k]
-
-            # 🔥 오라클 툴 전용: 파라미터 자동 추출
-            if tool.startswith("oracle_agent_tool."):
-                if query_text:
-                    # 대학명 추출
-                    if "university" not in args or not args["university"]:
-                        extracted_univ = _extract_university_from_query(query_text)
-                        if extracted_univ:
-                            args["university"] = extracted_univ
-                            log.info("[Compat] Extracted university: %s", extracted_univ)
-                    
-                    # 연도 추출
-                    if "year" not in args or not args["year"]:
-                        extracted_year = _extract_year_from_query(query_text)
-                        if extracted_year:
-                            args["year"] = extracted_year
-                            log.info("[Compat] Extracted year: %s", extracted_year)
-
-            log.info("[Compat] /v1/agent/plan_and_run -> %s with args: %s", tool, list(args.keys()))
-            res = _call_tool(tool, args)
-
-            log.info("[Compat] Tool result keys: %s", list(res.keys()) if isinstance(res, dict) else type(res).__name__)
-
-            # ⬇⬇ 오케스트레이터가 바로 인식하도록 rag/final_text/final_data는 최상위로 승격
-            if isinstance(res, dict):
-                # RAG 결과가 있으면 최상위로 승격
-                if "rag" in res:
-                    out = {"ok": True, "rag": res["rag"]}
-                    log.info("[Compat] RAG result promoted to top level")
-                    return jsonify(out)
-                # 기타 중요 키들도 승격
-                elif any(key in res for key in ["final_text", "final_data", "matches"]):
-                    out = {"ok": True}
-                    out.update(res)
-                    log.info("[Compat] Result keys promoted to top level")
-                    return jsonify(out)
-                # tool_result 내부에 RAG가 있는지 확인
-                elif "tool_result" in res and isinstance(res["tool_result"], dict):
-                    for tool_name, tool_res in res["tool_result"].items():
-                        if isinstance(tool_res, dict) and "rag" in tool_res:
-                            out = {"ok": True, "rag": tool_res["rag"]}
-                            log.info("[Compat] RAG result found in tool_result and promoted")
-                            return jsonify(out)
-                # 오라클 결과 처리: result 키가 있으면 final_data로 승격
-                elif tool.startswith("oracle_agent_tool.") and "result" in res:
-                    if res.get("ok"):
-                        out = {"ok": True, "final_data": res["result"]}
-                        log.info("[Compat] Oracle result promoted to final_data")
-                        return jsonify(out)
-
-            # 기본 응답 구조
-            return jsonify({"ok": True, "data": res})
-        except Exception as e:
-            log.exception("compat plan_and_run error: %s", e)
-            return jsonify({"ok": False, "error": str(e)}), 500
+        out, status = plan_and_run(payload)
+        return jsonify(out), status
 
     # ── RAG 관리 편의 엔드포인트
     @app.post("/v1/mcp/rag/sync")
@@ -10,11 +10,12 @@ from typing import Any, Dict, List, Optional
 import logging, re
 
 try:
-    from .db import ConnCtx
+    from .db import ConnCtx, configure as configure_db
     from .mapping import normalize_metric_label, code_for_label
 except ImportError as e:
     logging.error("Oracle tool dependencies not available: %s", e)
     ConnCtx = None
+    configure_db = None
 
 log = logging.getLogger("oracle_agent_tool")
 
@@ -205,6 +206,8 @@ def query_estimation_score(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 def register_mcp_tools(registry: Dict[str, Any], _cfg: Dict[str, Any] | None = None) -> None:
     log.info("[ORACLE] Registering MCP tools")
+    if configure_db is not None and _cfg and _cfg.get("ORACLE_ENV"):
+        configure_db(_cfg["ORACLE_ENV"])
     registry["oracle_agent_tool.query_university_metric"] = query_university_metric
     registry["oracle_agent_tool.query_estimation_score"]  = query_estimation_score
     log.info("[ORACLE] MCP tools registered: %s", ["oracle_agent_tool.query_university_metric", "oracle_agent_tool.query_estimation_score"])
\ No newline at end of file
@@ -4,6 +4,14 @@ import os
 import cx_Oracle
 
 _POOL = None
+_ENV = {}  # 툴 등록 시 주입된 접속 설정 (ORACLE_USER 등, 없으면 os.environ)
+
+def configure(env: dict | None) -> None:
+    global _ENV
+    _ENV = {k: v for k, v in (env or {}).items() if v}
+
+def _env(key: str):
+    return _ENV.get(key) or os.getenv(key)
 
 def _session_init(conn, _):
     # 필요 시 스키마 지정. 실사용 계정이 기본 스키마면 생략 가능
@@ -14,10 +22,10 @@ def get_pool():
     global _POOL
     if _POOL:
         return _POOL
-    user = os.getenv("ORACLE_USER")
-    pwd  = os.getenv("ORACLE_PASSWORD")
-    dsn_raw = os.getenv("ORACLE_DSN")  # e.g., localhost:1521/XE
-    ic_path = os.getenv("ORACLE_CLIENT_PATH") or ""
+    user = _env("ORACLE_USER")
+    pwd  = _env("ORACLE_PASSWORD")
+    dsn_raw = _env("ORACLE_DSN")  # e.g., localhost:1521/XE
+    ic_path = _env("ORACLE_CLIENT_PATH") or ""
     if ic_path:
         try:
             cx_Oracle.init_oracle_client(lib_dir=ic_path)
@@ -24,7 +24,7 @@ def _load_model():
     if _MODEL is None:
         name = _get_cfg_val("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
         log.info("[RAG] Loading embedding model: %s", name)
-        _MODEL = SentenceTransformer(name)
+        _MODEL = SentenceTransformer(name, cache_folder=_get_cfg_val("HF_HOME"))
     return _MODEL
 
 class _SBertEmbeddingFn:
@@ -41,6 +41,21 @@ class OracleDBConnection:
         except Exception as e:
             print("[오류] Oracle DB 연결 실패:", e)
 
+    def create_pooled_engine(self, pool_size: int = 4, max_overflow: int = 4):
+        """
+        프로세스 공용 SQLAlchemy 엔진 (커넥션 풀)
+        - 요청마다 connect()로 엔진/연결을 새로 만들지 않고 engine.raw_connection()으로 빌려 씀
+        """
+        dsn_str = f'oracle+oracledb://{self.username}:{self.password}@{self.dsn}'
+        self.engine = create_engine(
+            dsn_str,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+        return self.engine
+
     def close(self):
         if self.cursor:
             self.cursor.close()
@@ -1,7 +1,12 @@
 import os
+import json
+import zlib
+import datetime
+import decimal
 import cx_Oracle
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, Response
 from dotenv import load_dotenv
+from werkzeug.http import http_date
 
 # .env 로드
 env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.env'))
@@ -15,37 +20,201 @@ if oracle_client_path and os.path.exists(oracle_client_path):
 else:
     print("⚠️ ORACLE_CLIENT_PATH가 존재하지 않거나 잘못되었습니다.")
 
+# 스트리밍 내보내기 설정
+EXPORT_ARRAYSIZE = int(os.getenv("DATA_EXPORT_ARRAYSIZE", "1000") or 1000)  # fetchmany 1회 행 수 (= 왕복당 행 수)
+EXPORT_MAX_LIMIT = int(os.getenv("DATA_EXPORT_MAX_LIMIT", "100000") or 100000)
+
 # Blueprint 생성
 data_api = Blueprint('data_api', __name__)
 
-@data_api.route('/api/get-estimationfuture', methods=['GET'])
-def get_estimationfuture():
-    # Oracle 접속 정보 로드
+_pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is not None:
+        return _pool
     ORACLE_USER = os.getenv("ORACLE_USER")
     ORACLE_PASSWORD = os.getenv("ORACLE_PASSWORD")
     ORACLE_DSN = os.getenv("ORACLE_DSN")
-
     if not all([ORACLE_USER, ORACLE_PASSWORD, ORACLE_DSN]):
-        return jsonify({'error': 'DB 접속 정보가 .env에 없습니다.'})
+        raise RuntimeError('DB 접속 정보가 .env에 없습니다.')
+    _pool = cx_Oracle.SessionPool(
+        user=ORACLE_USER,
+        password=ORACLE_PASSWORD,
+        dsn=ORACLE_DSN,
+        min=1, max=int(os.getenv("DATA_API_POOL_MAX", "4") or 4), increment=1,
+        encoding="UTF-8",
+        threaded=True
+    )
+    print("[data_api] Oracle SessionPool created:", ORACLE_DSN)
+    return _pool
+
+
+def _q_col(name: str) -> str:
+    # 컬럼명은 테이블 메타데이터와 대조한 값만 들어옴 → 따옴표로 감싸 대소문자 그대로 사용
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _json_default(v):
+    # jsonify 와 같은 표현 유지 (날짜: HTTP-date, Decimal: 숫자)
+    if isinstance(v, datetime.datetime) or isinstance(v, datetime.date):
+        return http_date(v)
+    if isinstance(v, decimal.Decimal):
+        return float(v)
+    if isinstance(v, cx_Oracle.LOB):
+        return v.read()
+    raise TypeError(f"Object of type {type(v).__name__} is not JSON serializable")
+
+
+def _encode_rows(cursor, columns, fmt):
+    """fetchmany 단위로 읽으며 JSON 배열 / NDJSON 조각을 차례로 생성"""
+    dumps = json.JSONEncoder(ensure_ascii=False, default=_json_default).encode
+    first = True
+    if fmt == "json":
+        yield "["
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            break
+        parts = []
+        for row in rows:
+            item = dumps(dict(zip(columns, row)))
+            if fmt == "ndjson":
+                parts.append(item + "\n")
+            else:
+                parts.append(item if first else "," + item)
+                first = False
+        yield "".join(parts)
+    if fmt == "json":
+        yield "]"
+
+
+def _gzip_chunks(chunks):
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → gzip 헤더
+    for chunk in chunks:
+        out = comp.compress(chunk.encode("utf-8"))
+        if out:
+            yield out
+    yield comp.flush()
+
 
-    # Oracle 연결
+@data_api.route('/api/get-estimationfuture', methods=['GET'])
+def get_estimationfuture():
+    """
+    ESTIMATIONFUTURE 스트리밍 내보내기
+    - 기본: 기존과 같은 JSON 배열 (한 번에 만들지 않고 fetchmany 단위로 흘려보냄)
+    - ?format=ndjson : 한 줄에 한 행
+    - ?columns=SNM,SCR_EST_2024 : 컬럼 선택
+    - ?key=SNM&after=<마지막 키>&after_rid=<마지막 _ROWID>&limit=N : 키셋 페이지네이션
+      · 페이지 응답의 각 행에 _ROWID 포함, 정렬은 (key NULLS LAST, ROWID) → 같은 key 값이 페이지 경계에 걸려도 누락 없음
+      · 다음 페이지: 마지막 행의 key 값을 after, _ROWID를 after_rid로 (마지막 key가 NULL이면 after 생략, after_rid만)
+    - Accept-Encoding: gzip 이면 gzip 압축 (?gzip=0 으로 끔)
+    """
+    fmt = (request.args.get("format") or "json").strip().lower()
+    if fmt not in ("json", "ndjson"):
+        return jsonify({'error': "format 은 json 또는 ndjson 입니다."}), 400
+    try:
+        limit = int(request.args["limit"]) if request.args.get("limit") else None
+    except ValueError:
+        return jsonify({'error': "limit 는 정수여야 합니다."}), 400
+    if limit is not None and not (0 < limit <= EXPORT_MAX_LIMIT):
+        return jsonify({'error': f"limit 는 1~{EXPORT_MAX_LIMIT} 범위여야 합니다."}), 400
+    after = request.args.get("after")
+    after_rid = request.args.get("after_rid") or None
+    want_cols = [c.strip() for c in (request.args.get("columns") or "").split(",") if c.strip()]
+    key = (request.args.get("key") or "").strip()
+
+    conn = cursor = None
     try:
-        conn = cx_Oracle.connect(ORACLE_USER, ORACLE_PASSWORD, ORACLE_DSN)
+        conn = _get_pool().acquire()
         cursor = conn.cursor()
 
-        # 쿼리 실행
-        cursor.execute("SELECT * FROM ESTIMATIONFUTURE")
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
+        # 컬럼 메타데이터 (행은 읽지 않음) → 요청 컬럼/키 검증
+        cursor.execute("SELECT * FROM ESTIMATIONFUTURE WHERE 1 = 0")
+        all_cols = [desc[0] for desc in cursor.description]
+        by_upper = {c.upper(): c for c in all_cols}
+        unknown = [c for c in want_cols + ([key] if key else []) if c.upper() not in by_upper]
+        if unknown:
+            raise ValueError(f"알 수 없는 컬럼: {', '.join(unknown)}")
+        columns = [by_upper[c.upper()] for c in dict.fromkeys(want_cols)] or all_cols
 
-        # 결과 변환
-        result = [dict(zip(columns, row)) for row in rows]
-        return jsonify(result)
+        paged = after is not None or after_rid is not None or limit is not None
+        if paged and not key:
+            key = "SNM" if "SNM" in by_upper else ""
+            if not key:
+                raise ValueError("페이지네이션에는 key 컬럼이 필요합니다.")
+        key = by_upper[key.upper()] if key else ""
+
+        sql, binds, columns = _export_query(columns, key if paged else "", after, after_rid, limit)
+
+        cursor.arraysize = EXPORT_ARRAYSIZE
+        cursor.prefetchrows = EXPORT_ARRAYSIZE + 1
+        cursor.execute(sql, binds)
+    except ValueError as e:
+        _release(conn, cursor)
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
+        _release(conn, cursor)
         return jsonify({'error': f'Oracle 연결 실패: {str(e)}'})
-    finally:
+
+    def generate():
+        # 연결은 스트림이 끝나거나 클라이언트가 끊을 때(generator close) 풀에 반납
         try:
-            cursor.close()
-            conn.close()
-        except:
-            pass
+            yield from _encode_rows(cursor, columns, fmt)
+        finally:
+            _release(conn, cursor)
+
+    body = generate()
+    headers = {}
+    use_gzip = request.args.get("gzip", "1") != "0" and "gzip" in (request.headers.get("Accept-Encoding") or "").lower()
+    if use_gzip:
+        body = _gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    mimetype = "application/x-ndjson" if fmt == "ndjson" else "application/json"
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+def _export_query(columns, key, after=None, after_rid=None, limit=None):
+    """
+    ESTIMATIONFUTURE 조회 SQL 구성 → (sql, binds, 출력 컬럼)
+    - key가 있으면 키셋 페이지: ORDER BY key NULLS LAST, ROWID + 커서 (after, after_rid) 이후 행만
+      (key가 유일하지 않아도 ROWID로 순서가 전순서가 되어 경계 행 누락/중복 없음, NULL key 행은 맨 뒤)
+    - after만 있고 after_rid가 없으면(이전 클라이언트) key > after 와 NULL key 행
+    """
+    out_cols = list(columns)
+    select = [_q_col(c) for c in columns]
+    binds = {}
+    where = ""
+    if key:
+        k = _q_col(key)
+        select.append('ROWIDTOCHAR(ROWID) AS "_ROWID"')
+        out_cols.append("_ROWID")
+        if after_rid is not None and after is None:
+            where = f" WHERE {k} IS NULL AND ROWID > CHARTOROWID(:after_rid)"
+            binds["after_rid"] = after_rid
+        elif after_rid is not None:
+            where = (f" WHERE ({k} > :after OR ({k} = :after AND ROWID > CHARTOROWID(:after_rid))"
+                     f" OR {k} IS NULL)")
+            binds.update(after=after, after_rid=after_rid)
+        elif after is not None:
+            where = f" WHERE ({k} > :after OR {k} IS NULL)"
+            binds["after"] = after
+    sql = f"SELECT {', '.join(select)} FROM ESTIMATIONFUTURE{where}"
+    if key:
+        sql += f" ORDER BY {_q_col(key)} NULLS LAST, ROWID"
+    if limit is not None:
+        sql += " FETCH FIRST :lim ROWS ONLY"
+        binds["lim"] = limit
+    return sql, binds, out_cols
+
+
+def _release(conn, cursor):
+    try:
+        if cursor: cursor.close()
+    except Exception:
+        pass
+    try:
+        if conn: conn.close()
+    except Exception:
+        pass
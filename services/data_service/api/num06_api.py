@@ -1,4 +1,6 @@
 import os
+import time
+import threading
 import cx_Oracle
 from flask import Blueprint, request, jsonify
 from dotenv import load_dotenv
@@ -119,6 +121,180 @@ def num06_metrics():
         except Exception:
             pass
 
+# ─────────────────────────────────────────────────────────────
+# 배치 조회: 여러 대학 × 연도 범위를 UNION ALL 1회로
+# ─────────────────────────────────────────────────────────────
+BATCH_MAX_YEARS = 20
+BATCH_MAX_SNMS = 50
+# 테이블 버전(LAST_DDL_TIME) 재확인 주기(초). 업로더는 테이블을 재생성(DDL) 후 적재하므로 DDL 시각이 곧 데이터 버전
+VERSION_TTL_S = float(os.getenv("NUM06_VERSION_TTL_S", "30") or 0)
+
+_cache_lock = threading.Lock()
+# {테이블 기본명: {"version": LAST_DDL_TIME, "rows": {snm: (cps, lps, vps) | None}}}
+_table_cache = {}
+# {연도: (확인 시각, LAST_DDL_TIME | None=테이블 없음)} — 연도별로 독립 갱신
+_versions = {}
+_cache_stats = {"hits": 0, "misses": 0, "queries": 0}
+
+
+def _schema_owner() -> str:
+    return (ORACLE_SCHEMA or ORACLE_USER or "").upper()
+
+
+def _table_versions(cur, years):
+    """
+    NUM06_<year> 테이블의 존재/버전 조회. 없는 테이블은 결과에서 빠짐
+    - 연도별 확인 시각을 따로 두고, VERSION_TTL_S가 지난(또는 처음 보는) 연도만 조회해 기존 맵에 병합
+      (다른 연도 범위 요청이 번갈아 와도 서로의 캐시를 지우지 않음)
+    """
+    years = tuple(sorted(set(years)))
+    now = time.monotonic()
+    with _cache_lock:
+        stale = [y for y in years if y not in _versions or now - _versions[y][0] >= VERSION_TTL_S]
+    if stale:
+        names = {f"NUM06_{y}": y for y in stale}
+        binds = {f"t{i}": n for i, n in enumerate(names)}
+        binds["owner"] = _schema_owner()
+        sql = (
+            "SELECT OBJECT_NAME, LAST_DDL_TIME FROM ALL_OBJECTS "
+            "WHERE OWNER = :owner AND OBJECT_TYPE = 'TABLE' "
+            f"AND OBJECT_NAME IN ({', '.join(':' + k for k in binds if k != 'owner')})"
+        )
+        cur.execute(sql, binds)
+        found = {names[name]: ddl for name, ddl in cur.fetchall()}
+        with _cache_lock:
+            for y in stale:
+                _versions[y] = (now, found.get(y))
+            _cache_stats["queries"] += 1
+    with _cache_lock:
+        return {y: _versions[y][1] for y in years if y in _versions and _versions[y][1] is not None}
+
+
+def fetch_num06_batch(snms, years):
+    """
+    {snm: {year: (cps, lps, vps) | None}} 반환
+    - 캐시는 테이블 버전별 — 버전이 바뀐 테이블은 통째로 무효화
+    - 캐시 미스만 모아 연도별 SELECT를 UNION ALL 한 번으로 조회
+    """
+    out = {snm: {} for snm in snms}
+    conn = cur = None
+    try:
+        conn = _acquire()
+        cur = conn.cursor()
+        versions = _table_versions(cur, years)
+
+        todo = {}  # year -> [snm...]
+        with _cache_lock:
+            for y in years:
+                if y not in versions:
+                    continue
+                base = f"NUM06_{y}"
+                ent = _table_cache.get(base)
+                if ent is None or ent["version"] != versions[y]:
+                    ent = _table_cache[base] = {"version": versions[y], "rows": {}}
+                for snm in snms:
+                    if snm in ent["rows"]:
+                        out[snm][y] = ent["rows"][snm]
+                        _cache_stats["hits"] += 1
+                    else:
+                        todo.setdefault(y, []).append(snm)
+                        _cache_stats["misses"] += 1
+
+        if todo:
+            col_cps, col_lps, col_vps = _q_ident("CPSS_CPS"), _q_ident("LPS_LPS"), _q_ident("VPS_VPS")
+            parts, binds = [], {}
+            for y, names in sorted(todo.items()):
+                ph = []
+                for snm in names:
+                    k = f"s{len(binds)}"
+                    binds[k] = snm
+                    ph.append(":" + k)
+                parts.append(
+                    f"SELECT {int(y)} AS YR, SNM, {col_cps}, {col_lps}, {col_vps} "
+                    f"FROM {_table_name_num06(y)} WHERE SNM IN ({', '.join(ph)})"
+                )
+            sql = "\nUNION ALL\n".join(parts)
+            print(f"[num06_api] BATCH tables={len(parts)} snms={len(snms)} (cache misses={sum(map(len, todo.values()))})")
+            cur.execute(sql, binds)
+            got = {}
+            for yr, snm, cps, lps, vps in cur:
+                got.setdefault(int(yr), {})[snm] = (cps, lps, vps)
+            with _cache_lock:
+                _cache_stats["queries"] += 1
+                for y, names in todo.items():
+                    ent = _table_cache.get(f"NUM06_{y}")
+                    for snm in names:
+                        row = got.get(y, {}).get(snm)
+                        out[snm][y] = row
+                        if ent is not None and ent["version"] == versions[y]:
+                            ent["rows"][snm] = row
+        return out, sorted(set(years) - set(versions))
+    finally:
+        try:
+            if cur: cur.close()
+            if conn: conn.close()
+        except Exception:
+            pass
+
+
+def _parse_years(args):
+    years = [y for y in (args.get("years") or "").replace(" ", "").split(",") if y]
+    if years:
+        return sorted({int(y) for y in years})
+    y_from, y_to = args.get("year_from"), args.get("year_to")
+    if y_from and y_to:
+        lo, hi = int(y_from), int(y_to)
+        if lo > hi:
+            lo, hi = hi, lo
+        return list(range(lo, hi + 1))
+    return []
+
+
+@num06_bp.get("/num06-metrics/batch")
+def num06_metrics_batch():
+    """
+    ?snm=A&snm=B (또는 snm=A,B) & years=2021,2022 (또는 year_from=&year_to=)
+    → {success, data: {snm: {year: {CPS, LPS, VPS, table} | null}}, missing_tables: [year...]}
+    """
+    snms = []
+    for v in request.args.getlist("snm"):
+        snms.extend(x.strip() for x in v.split(",") if x.strip())
+    snms = list(dict.fromkeys(snms))
+    try:
+        years = _parse_years(request.args)
+    except ValueError:
+        return jsonify(success=False, error="years/year_from/year_to 는 정수여야 합니다."), 400
+    if not snms or not years:
+        return jsonify(success=False, error="snm, years(또는 year_from/year_to) 는 필수입니다."), 400
+    if len(snms) > BATCH_MAX_SNMS or len(years) > BATCH_MAX_YEARS:
+        return jsonify(success=False, error=f"최대 대학 {BATCH_MAX_SNMS}개, 연도 {BATCH_MAX_YEARS}개까지 조회할 수 있습니다."), 400
+
+    try:
+        rows, missing = fetch_num06_batch(snms, years)
+    except cx_Oracle.DatabaseError as e:
+        return jsonify(success=False, error=str(e)), 500
+    except Exception as e:
+        return jsonify(success=False, error=str(e)), 500
+
+    data = {
+        snm: {
+            str(y): ({"CPS": r[0], "LPS": r[1], "VPS": r[2], "table": _table_name_num06(y)} if r else None)
+            for y, r in per_year.items()
+        }
+        for snm, per_year in rows.items()
+    }
+    return jsonify(success=True, data=data, missing_tables=missing)
+
+
+@num06_bp.get("/num06-metrics/cache")
+def num06_cache_stats():
+    with _cache_lock:
+        return jsonify(
+            tables={k: {"version": str(v["version"]), "rows": len(v["rows"])} for k, v in _table_cache.items()},
+            **_cache_stats,
+        )
+
+
 @num06_bp.get("/health")
 def health():
     try:
@@ -0,0 +1,163 @@
+# services/llm_service/api/admission.py
+import os
+import math
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional
+
+# 우선순위 클래스 (작을수록 먼저 처리)
+PRIORITIES = {"interactive": 0, "admin": 1, "background": 2}
+DEFAULT_PRIORITY = "interactive"
+
+
+class AdmissionRejected(Exception):
+    """
+    입장 거절
+    - 429: 대기열 가득 참 / 더 높은 우선순위 요청에 자리를 뺏김
+    - 503: 최대 대기 시간 초과
+    """
+    def __init__(self, status: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("prio", "seq", "cls", "event", "granted", "shed")
+
+    def __init__(self, prio: int, seq: int, cls: str):
+        self.prio = prio
+        self.seq = seq
+        self.cls = cls
+        self.event = threading.Event()
+        self.granted = False
+        self.shed = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.prio, self.seq) < (other.prio, other.seq)
+
+
+class AdmissionController:
+    """
+    LLM 요청 입장 제어 (백엔드 락 앞단의 유한 대기열)
+    - 동시 처리 max_concurrent개, 초과분은 우선순위 큐에서 최대 max_wait_s 대기
+    - 대기열(max_queue)이 차면: 새 요청이 더 높은 우선순위면 가장 낮은 우선순위/최신 대기자를 밀어냄, 아니면 429
+    - 슬롯 반납 시 우선순위 → 도착 순으로 다음 대기자에게 슬롯 이양
+    - Retry-After: 최근 처리 시간 평균 × (대기열 길이 / 동시성) 근사
+    """
+    def __init__(self, max_concurrent: int, max_queue: int, max_wait_s: float):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait_s = max(0.0, float(max_wait_s))
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._service_ema = 1.0
+        self._waits: Deque[float] = deque(maxlen=512)
+        self._stats = {cls: {"admitted": 0, "rejected_full": 0, "shed": 0, "timeouts": 0} for cls in PRIORITIES}
+
+    # ----- 내부 -----
+    def _retry_after(self) -> int:
+        depth = len(self._waiters) + 1
+        return max(1, int(math.ceil(self._service_ema * depth / self.max_concurrent)))
+
+    def _acquire(self, cls: str) -> None:
+        prio = PRIORITIES[cls]
+        t0 = time.monotonic()
+        with self._lock:
+            if self._in_flight < self.max_concurrent and not self._waiters:
+                self._in_flight += 1
+                self._stats[cls]["admitted"] += 1
+                self._waits.append(0.0)
+                return
+            w = _Waiter(prio, next(self._seq), cls)
+            if len(self._waiters) >= self.max_queue:
+                worst = max(self._waiters) if self._waiters else None
+                if worst is None or worst.prio <= prio:
+                    self._stats[cls]["rejected_full"] += 1
+                    raise AdmissionRejected(429, "queue full", self._retry_after())
+                self._waiters.remove(worst)
+                heapq.heapify(self._waiters)
+                worst.shed = True
+                worst.event.set()
+            heapq.heappush(self._waiters, w)
+
+        w.event.wait(self.max_wait_s)
+        with self._lock:
+            if w.granted:
+                self._stats[cls]["admitted"] += 1
+                self._waits.append(time.monotonic() - t0)
+                return
+            if w.shed:
+                self._stats[cls]["shed"] += 1
+                raise AdmissionRejected(429, "preempted by higher priority request", self._retry_after())
+            self._waiters.remove(w)
+            heapq.heapify(self._waiters)
+            self._stats[cls]["timeouts"] += 1
+            raise AdmissionRejected(503, "admission wait deadline exceeded", self._retry_after())
+
+    def _release(self, elapsed: float) -> None:
+        with self._lock:
+            self._service_ema = 0.8 * self._service_ema + 0.2 * elapsed
+            if self._waiters:
+                # 슬롯을 반납하지 않고 다음 대기자에게 그대로 이양
+                w = heapq.heappop(self._waiters)
+                w.granted = True
+                w.event.set()
+                return
+            self._in_flight -= 1
+
+    # ----- 공개 API -----
+    @staticmethod
+    def normalize(priority: Optional[str]) -> str:
+        p = (priority or "").strip().lower()
+        return p if p in PRIORITIES else DEFAULT_PRIORITY
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None):
+        """with admission.slot("interactive"): ... — 거절 시 AdmissionRejected"""
+        self._acquire(self.normalize(priority))
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - t0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            depth = {cls: 0 for cls in PRIORITIES}
+            for w in self._waiters:
+                depth[w.cls] += 1
+            waits = sorted(self._waits)
+            per_class = {cls: dict(v) for cls, v in self._stats.items()}
+            in_flight = self._in_flight
+            ema = self._service_ema
+
+        def pct(q: float) -> Optional[float]:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 3) if waits else None
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_wait_s": self.max_wait_s,
+            "in_flight": in_flight,
+            "queue_depth": sum(depth.values()),
+            "queue_depth_by_class": depth,
+            "wait_p50_s": pct(0.50),
+            "wait_p99_s": pct(0.99),
+            "service_ema_s": round(ema, 3),
+            "per_class": per_class,
+        }
+
+
+admission = AdmissionController(
+    max_concurrent=int(os.getenv("LLM_ADMIT_CONCURRENCY", "2") or 2),
+    max_queue=int(os.getenv("LLM_ADMIT_QUEUE", "16") or 0),
+    max_wait_s=float(os.getenv("LLM_ADMIT_MAX_WAIT_S", "20") or 0),
+)
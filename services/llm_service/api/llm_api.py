@@ -1,16 +1,26 @@
 # services/llm_service/api/llm_api.py
-import os, logging
+import os, logging, queue, threading
 from flask import request, jsonify
 from services.llm_service.db import llm_repository_cx as repo
-from services.llm_service.orchestrator import handle as orchestrate
+from services.llm_service.db.statement_registry import registry as sql_registry
+from services.llm_service.api.admission import admission, AdmissionRejected
+from services.llm_service.orchestrator import handle as orchestrate, handle_with_deadline
+from services.llm_service.orchestrator.planner import plan_cache
+from services.llm_service.model.cancellation import CancelToken, RequestCancelled, cancel_on_disconnect
 from services.llm_service.orchestrator.schemas import OrchestratorInput
 
 log = logging.getLogger("llm_api")
 
+_LOOPBACK_ADDRS = {"127.0.0.1", "::1", "::ffff:127.0.0.1"}
+
 def build_handlers(app, router, cfg):
     mt = (cfg.get("multiturn") or {})
     CONTEXT_TURNS = int(mt.get("context_turns", 6))
     SUMMARY_TURNS = int(mt.get("summary_turns", 12))
+    # 요청 전체 데드라인(초). 0이면 기존 동기 경로
+    REQUEST_DEADLINE_S = float(os.getenv("LLM_REQUEST_DEADLINE_S", "0") or 0)
+    # 클라이언트 연결 종료 시 생성 중단 (werkzeug 서버 소켓 감시, 미지원 서버는 무시)
+    CANCEL_ON_DISCONNECT = os.getenv("LLM_CANCEL_ON_DISCONNECT", "true").lower() == "true"
 
     def apply_output_policy(text: str) -> str:
         pol = cfg.get("policy", {})
@@ -39,16 +49,58 @@ def build_handlers(app, router, cfg):
                     {"role": "system", "content": "다음 대화를 5줄 이내 한국어 bullet로 요약하라. 불확실한 내용은 생략."},
                     {"role": "user", "content": f"[기존요약]\n{prev_summary[0] if prev_summary else '(없음)'}\n[대화]\n{conv_dump}"}
                 ]
-                summary_text = router.generate_messages(sum_messages, overrides={
-                    "temperature": 0.2, "max_new_tokens": 160, "enforce_max_sentences": 5
-                })
+                # 요약 워커 스레드에서만 호출 — 백그라운드 우선순위로 입장 대기(응답 경로는 기다리지 않음)
+                with admission.slot("background"):
+                    summary_text = router.generate_messages(sum_messages, overrides={
+                        "temperature": 0.2, "max_new_tokens": 160, "enforce_max_sentences": 5
+                    })
                 repo.upsert_summary_on_latest_row(conv_id, summary_text=summary_text, cover_to_msg_id=latest_msg_id)
                 return True
+        except AdmissionRejected as e:
+            log.info("요약 롤링 보류(혼잡): %s", e.reason)
         except Exception as e:
             log.warning("요약 롤링 실패: %s", e)
         return False
 
+    # 요약 롤링은 응답 경로 밖(단일 워커 스레드)에서 처리
+    # - 같은 대화가 이미 대기 중이면 중복 등록하지 않음
+    # - 대기열이 가득 차면 이번 턴은 건너뜀 (다음 턴에 다시 등록)
+    rotation_queue: "queue.Queue[int]" = queue.Queue(maxsize=int(os.getenv("LLM_SUMMARY_QUEUE", "64") or 64))
+    rotation_pending = set()
+    rotation_lock = threading.Lock()
+    rotation_worker = []
+
+    def rotation_loop():
+        while True:
+            conv_id = rotation_queue.get()
+            with rotation_lock:
+                rotation_pending.discard(conv_id)
+            handle_summary_rotation(conv_id)
+
+    def schedule_summary_rotation(conv_id: int) -> bool:
+        with rotation_lock:
+            if conv_id in rotation_pending:
+                return False
+            try:
+                rotation_queue.put_nowait(conv_id)
+            except queue.Full:
+                log.info("요약 롤링 보류(대기열 가득 참): conv_id=%s", conv_id)
+                return False
+            rotation_pending.add(conv_id)
+            if not rotation_worker:
+                t = threading.Thread(target=rotation_loop, name="llm-summary-rotation", daemon=True)
+                t.start()
+                rotation_worker.append(t)
+        return True
+
+    def reject_response(rej: AdmissionRejected):
+        resp = jsonify({"error": rej.reason, "retry_after": rej.retry_after})
+        resp.status_code = rej.status
+        resp.headers["Retry-After"] = str(rej.retry_after)
+        return resp
+
     def health_handler():
+        sql_stats = sql_registry.stats()
         return {
             "status": "ok",
             "backend": router.backend_name,
@@ -57,7 +109,12 @@ def build_handlers(app, router, cfg):
                 "context_turns": CONTEXT_TURNS,
                 "summary_turns": SUMMARY_TURNS,
                 "langchain_enabled": True
-            }
+            },
+            "sql": {k: sql_stats[k] for k in ("statements", "parses", "executes")},
+            "generation": router.backend_stats(),
+            "admission": admission.stats(),
+            "plan_cache": plan_cache.stats(),
+            "response_cache": router.cache_stats()
         }
 
     def generate_handler():
@@ -86,13 +143,8 @@ def build_handlers(app, router, cfg):
         else:
             conv_id = None
 
-        # 사용자 메시지 저장 (로그인 사용자만)
-        if usr_id and conv_id is not None:
-            try:
-                repo.append_message(conv_id, usr_id, "user", user_text)
-            except Exception as e:
-                log.exception("DB error(append user msg): %s", e)
-                return jsonify({"error": f"DB error: {e}"}), 500
+        # 사용자 메시지는 답변과 함께 한 번에 저장 (로그인 사용자만, 아래 append_turn)
+        # - 히스토리 조회 측은 마지막 user 메시지를 제외하므로 저장 시점이 늦어져도 문맥은 동일
 
         # ==== 오케스트레이터 호출 ====
         log.info(
@@ -108,8 +160,17 @@ def build_handlers(app, router, cfg):
             headers=dict(request.headers),
             meta={"client": "web", "locale": "ko-KR", "session": {}}
         )
+        # 우선순위 클래스: X-Priority (interactive | admin | background), 기본 interactive
+        priority = admission.normalize(request.headers.get("X-Priority"))
         try:
-            out = orchestrate(router, cfg, repo, inp)
+            with admission.slot(priority):
+                client_sock = request.environ.get("werkzeug.socket") if CANCEL_ON_DISCONNECT else None
+                if REQUEST_DEADLINE_S > 0 or client_sock is not None:
+                    token = CancelToken(REQUEST_DEADLINE_S or None)
+                    with cancel_on_disconnect(client_sock, token):
+                        out = handle_with_deadline(router, cfg, repo, inp, REQUEST_DEADLINE_S, token=token)
+                else:
+                    out = orchestrate(router, cfg, repo, inp)
             answer = out.answer
             route = out.route
             meta = out.meta or {}
@@ -123,8 +184,25 @@ def build_handlers(app, router, cfg):
                 intent.get("external_entities"),
             )
             
+        except AdmissionRejected as rej:
+            log.warning("[ADMISSION] rejected status=%d class=%s reason=%s", rej.status, priority, rej.reason)
+            return reject_response(rej)
+        except RequestCancelled as rc:
+            log.warning("[CANCEL] request cancelled: %s", rc.reason)
+            if usr_id and conv_id is not None:
+                try:
+                    repo.append_message(conv_id, usr_id, "user", user_text)
+                except Exception as e2:
+                    log.exception("DB error(append user msg): %s", e2)
+            return jsonify({"error": rc.reason}), 504
         except Exception as e:
             log.exception("오케스트레이터 처리 실패: %s", e)
+            # 실패해도 사용자 메시지는 기록
+            if usr_id and conv_id is not None:
+                try:
+                    repo.append_message(conv_id, usr_id, "user", user_text)
+                except Exception as e2:
+                    log.exception("DB error(append user msg): %s", e2)
             return jsonify({"error": str(e)}), 500
         
 
@@ -142,13 +220,14 @@ def build_handlers(app, router, cfg):
 
         answer = apply_output_policy(answer)
 
-        # 어시스턴트 메시지 저장 + 요약 롤링 (로그인 사용자만)
+        # 사용자+어시스턴트 메시지 일괄 저장 + 요약 롤링 (로그인 사용자만)
         if usr_id and conv_id is not None:
             try:
-                repo.append_message(conv_id, usr_id, "assistant", answer)
+                repo.append_turn(conv_id, usr_id, [("user", user_text), ("assistant", answer)])
             except Exception as e:
-                log.exception("DB error(append assistant msg): %s", e)
-            _ = handle_summary_rotation(conv_id)
+                # 기록 실패는 로그만 남기고 이미 생성한 답변은 그대로 반환
+                log.exception("DB error(append turn): %s", e)
+            schedule_summary_rotation(conv_id)
 
         return jsonify({
             "message": user_text,
@@ -158,11 +237,52 @@ def build_handlers(app, router, cfg):
             "meta": {"route": route, **(meta or {})}
         })
 
+    def history_handler():
+        """UI용 과거 대화 키셋 페이지네이션: ?conv_id=&before=&limit="""
+        usr_id = request.headers.get("X-User-Id")
+        if not usr_id:
+            return jsonify({"error": "login required"}), 401
+        conv_id = request.args.get("conv_id", type=int)
+        if conv_id is None:
+            return jsonify({"error": "conv_id is required"}), 400
+        before = request.args.get("before", type=int)
+        limit = request.args.get("limit", default=20, type=int)
+        try:
+            page = repo.fetch_history_page(conv_id, str(usr_id), before_msg_id=before, limit=limit)
+        except Exception as e:
+            log.exception("DB error(history page): %s", e)
+            return jsonify({"error": f"DB error: {e}"}), 500
+        return jsonify({"conv_id": conv_id, **page})
+
+    def _local_only():
+        """/dev/* 관리용 엔드포인트: 같은 호스트(루프백)에서만 허용"""
+        if request.remote_addr not in _LOOPBACK_ADDRS:
+            log.warning("dev endpoint denied: %s %s", request.remote_addr, request.path)
+            return jsonify({"error": "forbidden"}), 403
+        return None
+
+    def history_cache_stats_handler():
+        denied = _local_only()
+        if denied:
+            return denied
+        return jsonify(repo.history_cache_stats())
+
+    def history_cache_clear_handler():
+        denied = _local_only()
+        if denied:
+            return denied
+        cleared = repo.clear_history_cache()
+        log.info("history cache cleared (conversations=%d)", cleared)
+        return jsonify({"status": "ok", "cleared": cleared})
+
     return {
         "health": health_handler,
         "generate": generate_handler,
         "api_generate": generate_handler,
         "api_chat": generate_handler,
+        "api_history": history_handler,
+        "dev_history_cache": history_cache_stats_handler,
+        "dev_history_cache_clear": history_cache_clear_handler,
     }
 
 def register_routes_once(app, handlers):
@@ -171,6 +291,9 @@ def register_routes_once(app, handlers):
         ("/generate", "generate", ["POST"]),
         ("/api/generate", "api_generate", ["POST"]),
         ("/api/chat", "api_chat", ["POST"]),
+        ("/api/history", "api_history", ["GET"]),
+        ("/dev/history-cache", "dev_history_cache", ["GET"]),
+        ("/dev/history-cache/clear", "dev_history_cache_clear", ["POST"]),
     ]
     for rule, endpoint, methods in mapping:
         if endpoint not in app.view_functions:
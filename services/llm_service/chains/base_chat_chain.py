@@ -6,6 +6,8 @@ from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain_core.messages import BaseMessage
 from langchain_core.output_parsers import PydanticOutputParser
 
+from .prompt_budget import PromptAssembler
+
 
 # === 1) 정형 출력 스키마 (structured 모드에서만 사용) ===
 class LibraReply(BaseModel):
@@ -40,12 +42,14 @@ def _lcmsgs_to_llama(msgs: List[BaseMessage]) -> List[Dict[str, str]]:
     return out
 
 
-def build_base_chat_chain(backend_generate_fn, cfg: Dict[str, Any]):
+def build_base_chat_chain(backend_generate_fn, cfg: Dict[str, Any], assembler: PromptAssembler | None = None):
     """
     backend_generate_fn(messages, gen_params) -> str
     입력 페이로드: {"message": "...", "overrides": {...}}
     - 기본: 빠른 경로 (형식 지시문/파서 없음)
     - overrides.structured=True 일 때만 짧은 JSON 지시문 + 파서 사용
+    - assembler가 있으면 토큰 예산 적용(system 지시문 + 질문), 결과 dict의 "prompt_tokens"에 토큰 내역 포함
+      (요약/히스토리/RAG가 붙는 다중 섹션 프롬프트는 ModelRouter.generate_messages 경로에서 조립)
     """
     prompts_cfg = cfg.get("prompts") or {}
     roles: List[Dict[str, str]] = prompts_cfg.get("roles", []) or []
@@ -76,15 +80,21 @@ def build_base_chat_chain(backend_generate_fn, cfg: Dict[str, Any]):
 
         prompt = ChatPromptTemplate.from_messages(tuples)
         fmt_vars = {**variables, **inp}
-        msgs = prompt.format_messages(**fmt_vars)
-        return {"lc_msgs": msgs, "overrides": overrides, "structured": structured}
+        msgs = _lcmsgs_to_llama(prompt.format_messages(**fmt_vars))
+
+        report = None
+        if assembler is not None:
+            llama_msgs, report = assembler.fit_messages(msgs, overrides.get("max_new_tokens"))
+        else:
+            llama_msgs = msgs
+        return {"messages": llama_msgs, "overrides": overrides, "structured": structured, "prompt_tokens": report}
 
     def call_backend(packed: Dict[str, Any]) -> Dict[str, Any]:
         text = backend_generate_fn(
-            messages=_lcmsgs_to_llama(packed["lc_msgs"]),
+            messages=packed["messages"],
             gen_params=packed.get("overrides", {}) or {}
         )
-        return {"text": text, "structured": packed.get("structured", False)}
+        return {"text": text, "structured": packed.get("structured", False), "prompt_tokens": packed.get("prompt_tokens")}
 
     def parse_out(packed: Dict[str, Any]) -> Dict[str, Any]:
         txt = (packed.get("text") or "").strip()
@@ -100,6 +110,8 @@ def build_base_chat_chain(backend_generate_fn, cfg: Dict[str, Any]):
                 d = {"answer": txt, "summary": None, "citations": []}
         else:
             d = {"answer": txt, "summary": None, "citations": []}
+        if packed.get("prompt_tokens") is not None:
+            d["prompt_tokens"] = packed["prompt_tokens"]
         return d
 
     def apply_policy(d: Dict[str, Any]) -> Dict[str, Any]:
@@ -119,8 +131,8 @@ def build_base_chat_chain(backend_generate_fn, cfg: Dict[str, Any]):
     # === LCEL ===
     chain = (
         RunnablePassthrough()          # {"message": "...", "overrides": {...}}
-        | RunnableLambda(render)       # -> {"lc_msgs":[...], "overrides":..., "structured":bool}
-        | RunnableLambda(call_backend) # -> {"text": "...", "structured":bool}
+        | RunnableLambda(render)       # -> {"messages":[...], "overrides":..., "structured":bool, "prompt_tokens":{...}}
+        | RunnableLambda(call_backend) # -> {"text": "...", "structured":bool, "prompt_tokens":{...}}
         | RunnableLambda(parse_out)    # -> dict
         | RunnableLambda(apply_policy) # -> dict
     )
@@ -0,0 +1,200 @@
+# services/llm_service/chains/prompt_budget.py
+import math
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger("prompt_budget")
+
+# 채팅 템플릿이 메시지마다 붙이는 헤더/구분 토큰 근사치
+_PER_MESSAGE_OVERHEAD = 4
+
+# 섹션 가치(낮을수록 먼저 잘림). system 지시문/현재 질문은 자르지 않는다.
+SECTION_PRIORITY = {
+    "history": 10,
+    "rag": 20,
+    "summary": 30,
+    "user_data": 40,
+    "system": 100,
+    "user": 100,
+}
+_UNTRIMMABLE = {"system", "user"}
+
+# 메시지 내용으로 섹션 추정 (orchestrator/local_exec가 만든 메시지 배열용)
+_CONTENT_MARKERS: List[Tuple[str, str]] = [
+    ("[USAGE GUIDE SNIPPETS]", "rag"),
+    ("[사용자 데이터 사전]", "user_data"),
+    ("[기존요약]", "summary"),
+    ("[대화 요약]", "summary"),
+]
+
+
+class TokenCounter:
+    """
+    백엔드 토크나이저가 있으면 사용, 없으면 글자 수 × token_per_char 근사
+    - 같은 텍스트(시스템 프롬프트 등)는 반복 계산하지 않도록 LRU 캐시
+    - 백엔드가 None을 반환하면(토크나이저 미지원, 예: OpenVINO) 이후로는 근사만 사용
+    - source: 실제로 사용된 계수 방식 (backend | approx | mixed)
+    """
+    def __init__(self, backend_count_fn: Optional[Callable[[str], Optional[int]]], token_per_char: float):
+        self._backend_count = backend_count_fn
+        self._tpc = float(token_per_char) if token_per_char else 0.6
+        self._used = {"backend": 0, "approx": 0}
+        self.count = lru_cache(maxsize=1024)(self._count)
+
+    @property
+    def source(self) -> str:
+        b, a = self._used["backend"], self._used["approx"]
+        if b and a:
+            return "mixed"
+        if b or a:
+            return "backend" if b else "approx"
+        return "backend" if self._backend_count is not None else "approx"
+
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._backend_count is not None:
+            try:
+                n = self._backend_count(text)
+                if n is not None:
+                    self._used["backend"] += 1
+                    return int(n)
+                log.info("backend tokenizer unavailable → approx token counting")
+                self._backend_count = None
+            except Exception as e:
+                log.debug("backend tokenizer failed, using approx: %s", e)
+        self._used["approx"] += 1
+        return int(math.ceil(len(text) * self._tpc))
+
+
+def _truncate_text(text: str, target_tokens: int, counter: TokenCounter) -> str:
+    """
+    target_tokens 이하로 자르기: 줄 단위(앞쪽 우선 유지) → 한 줄도 안 맞으면 글자 비례 컷
+    """
+    if target_tokens <= 0:
+        return ""
+    if counter.count(text) <= target_tokens:
+        return text
+    kept: List[str] = []
+    used = 0
+    for ln in text.splitlines():
+        n = counter.count(ln) + 1
+        if used + n > target_tokens:
+            break
+        kept.append(ln)
+        used += n
+    if kept:
+        return "\n".join(kept)
+    total = max(1, counter.count(text))
+    cut = max(0, int(len(text) * target_tokens / total) - 1)
+    return text[:cut].rstrip() + ("…" if cut > 0 else "")
+
+
+class PromptAssembler:
+    """
+    섹션별 토큰 예산으로 프롬프트 조립
+    - 예산 = n_ctx - max_new_tokens - reserve_tokens
+    - 초과 시 가치 낮은 섹션부터 축소: history(오래된 턴부터 제거) → rag → summary → user_data
+    - system/user(현재 질문)는 유지
+    - report: {"budget", "total", "counter", "sections": {name: {"tokens","original_tokens","messages","trimmed"}}}
+    """
+    def __init__(self, cfg: Dict[str, Any], backend_count_fn: Optional[Callable[[str], Optional[int]]] = None):
+        mt = (cfg.get("multiturn") or {})
+        lp = (cfg.get("load_params") or {})
+        self.n_ctx = int(lp.get("n_ctx") or mt.get("max_context_tokens") or 4096)
+        self.reserve = int(mt.get("reserve_tokens", 256))
+        self.default_max_new = int((cfg.get("generation") or {}).get("max_new_tokens", 512))
+        self.counter = TokenCounter(backend_count_fn, float(mt.get("token_per_char", 0.6)))
+
+    def budget_for(self, max_new_tokens: Optional[int]) -> int:
+        max_new = int(max_new_tokens or self.default_max_new)
+        # 생성 토큰이 과하게 잡혀도 프롬프트 몫이 1/4 아래로 내려가지 않도록
+        return max(self.n_ctx // 4, self.n_ctx - max_new - self.reserve)
+
+    def _msg_tokens(self, m: Dict[str, str]) -> int:
+        return self.counter.count(m.get("content") or "") + _PER_MESSAGE_OVERHEAD
+
+    def assemble(self, sections: List[Tuple[str, List[Dict[str, str]]]],
+                 max_new_tokens: Optional[int] = None) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        sections: [(섹션명, 메시지 목록), ...] — 출력 순서는 입력 순서 유지
+        """
+        budget = self.budget_for(max_new_tokens)
+        work = [(name, [dict(m) for m in msgs]) for name, msgs in sections]
+        orig = {}
+        for name, msgs in work:
+            orig[name] = orig.get(name, 0) + sum(self._msg_tokens(m) for m in msgs)
+        total = sum(orig.values())
+
+        trimmed = set()
+        if total > budget:
+            order = sorted(
+                (i for i, (name, _) in enumerate(work) if name not in _UNTRIMMABLE),
+                key=lambda i: SECTION_PRIORITY.get(work[i][0], 50),
+            )
+            for i in order:
+                if total <= budget:
+                    break
+                name, msgs = work[i]
+                if name == "history":
+                    # 오래된 턴부터 제거
+                    while msgs and total > budget:
+                        total -= self._msg_tokens(msgs.pop(0))
+                        trimmed.add(name)
+                    continue
+                # 텍스트 블록: 뒤에서부터 잘라 남은 예산에 맞춤
+                for m in reversed(msgs):
+                    if total <= budget:
+                        break
+                    before = self._msg_tokens(m)
+                    target = before - _PER_MESSAGE_OVERHEAD - (total - budget)
+                    m["content"] = _truncate_text(m.get("content") or "", target, self.counter)
+                    total -= before - self._msg_tokens(m)
+                    trimmed.add(name)
+                work[i] = (name, [m for m in msgs if (m.get("content") or "").strip()])
+
+        out: List[Dict[str, str]] = []
+        sec_report: Dict[str, Dict[str, Any]] = {}
+        for name, msgs in work:
+            out.extend(msgs)
+            r = sec_report.setdefault(name, {"tokens": 0, "original_tokens": orig.get(name, 0),
+                                             "messages": 0, "trimmed": name in trimmed})
+            r["tokens"] += sum(self._msg_tokens(m) for m in msgs)
+            r["messages"] += len(msgs)
+
+        report = {
+            "budget": budget,
+            "total": sum(r["tokens"] for r in sec_report.values()),
+            "counter": self.counter.source,
+            "sections": sec_report,
+        }
+        if trimmed:
+            log.info("[PROMPT] over budget → trimmed %s (orig=%d, now=%d, budget=%d)",
+                     sorted(trimmed), sum(orig.values()), report["total"], budget)
+        return out, report
+
+    def fit_messages(self, messages: List[Dict[str, str]],
+                     max_new_tokens: Optional[int] = None) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        역할 메시지 배열(섹션 정보 없음)을 섹션으로 분류한 뒤 assemble
+        - 마지막 user = 현재 질문, 그 외 user/assistant = history
+        - system 중 내용 마커로 rag/user_data/summary 구분, 나머지는 system
+        """
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        sections: List[Tuple[str, List[Dict[str, str]]]] = []
+        for i, m in enumerate(messages):
+            role = m.get("role")
+            if i == last_user:
+                name = "user"
+            elif role in ("user", "assistant"):
+                name = "history"
+            else:
+                content = m.get("content") or ""
+                name = next((sec for marker, sec in _CONTENT_MARKERS if marker in content), "system")
+            # 같은 섹션이 연속되면 묶어서 순서 유지
+            if sections and sections[-1][0] == name:
+                sections[-1][1].append(m)
+            else:
+                sections.append((name, [m]))
+        return self.assemble(sections, max_new_tokens)
@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Tuple, Optional
 from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 
 from services.llm_service.db import llm_repository_cx as repo
+from services.llm_service.db.statement_registry import registry as sql_registry, USER_DATA_COLUMNS
 from services.llm_service.model.prompts import render_messages
 
 log = logging.getLogger("user_data_chain")
@@ -101,173 +102,197 @@ def _has_any_year_payload(data: Dict[str, Any]) -> bool:
 # 데이터 로딩
 # =========================
 
-# 숫자로 시작하는 컬럼을 안전하게 감싸는 헬퍼
-def _maybe_quote(c: str) -> str:
-    return f'"{c}"' if c and c[0].isdigit() else c
+# 스키마 파싱 결과 캐시: path -> (mtime, (id_col, select_cols, alias_map))
+_SCHEMA_CACHE: Dict[str, Tuple[float, Tuple[str, List[str], Dict[str, str]]]] = {}
+
+def _load_schema_columns(schema_path: Optional[str]) -> Tuple[str, List[str], Dict[str, str]]:
+    """
+    user_schema.json → (id_col, SELECT 컬럼 목록, {정규화 DB 컬럼명: alias})
+    파일 mtime이 바뀌지 않았으면 파싱 결과 재사용
+    """
+    if not schema_path or not os.path.exists(schema_path):
+        raise FileNotFoundError(f"user schema not found: {schema_path}")
+
+    mtime = os.path.getmtime(schema_path)
+    hit = _SCHEMA_CACHE.get(schema_path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+
+    with open(schema_path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+
+    tables = schema.get("tables", [])
+    t_user = next((t for t in tables if t.get("name") == "USER_DATA"), None)
+    if not t_user:
+        raise ValueError("USER_DATA table not found in schema")
+
+    id_col = t_user.get("id_column") or "USR_ID"
+    cols = t_user.get("columns") or {}
+
+    # SELECT 컬럼 목록과 alias 매핑 준비
+    select_cols: List[str] = []
+    alias_map: Dict[str, str] = {}  # 정규화된 DB 컬럼명 -> alias(y2.LPS 등)
+    for db_col, meta in cols.items():
+        select_cols.append(db_col)
+        alias = (meta or {}).get("alias")
+        if alias:
+            alias_map[_norm_col(db_col)] = alias  # ✅ 정규화해서 저장
+
+    parsed = (id_col, list(dict.fromkeys(select_cols)), alias_map)
+    _SCHEMA_CACHE[schema_path] = (mtime, parsed)
+    return parsed
+
+def _fold_via_schema(row_dict: Dict[str, Any], alias_map: Dict[str, str]) -> Dict[str, Any]:
+    """
+    {정규화 DB 컬럼명: 값} + alias 매핑 → {name, university, y1..y4:{year,CPS,LPS,VPS,score}}
+    """
+    # 디버그
+    log.debug("[UDC] via_schema row_dict keys=%s", list(row_dict.keys())[:40])
+    probe_keys = [
+        "USR_NAME","USR_SNM",
+        "1ST_USR_LPS","2ND_USR_LPS","3RD_USR_LPS","4TH_USR_LPS",
+        "1ST_YR","2ND_YR","3RD_YR","4TH_YR",
+        "SCR_EST_1ST","SCR_EST_2ND","SCR_EST_3RD","SCR_EST_4TH"
+    ]
+    log.debug("[UDC] via_schema row_dict probe=%s",
+             {k: row_dict.get(k) for k in probe_keys})
+
+    # alias 키로 재구성
+    row_aliases: Dict[str, Any] = {}
+    for norm_db_col, alias in alias_map.items():
+        if norm_db_col in row_dict:
+            row_aliases[alias] = row_dict[norm_db_col]
+
+    # 프로필 보정
+    if "name" not in row_aliases and "USR_NAME" in row_dict:
+        row_aliases["name"] = row_dict["USR_NAME"]
+    if "university" not in row_aliases and "USR_SNM" in row_dict:
+        row_aliases["university"] = row_dict["USR_SNM"]
+
+    log.debug("[UDC] via_schema alias_keys=%s", sorted(list(row_aliases.keys()))[:40])
+
+    # 정규화/접기
+    norm = _normalize_alias_keys(row_aliases)
+    folded = _fold_from_norm(norm)
+
+    log.debug("[UDC] via_schema folded_y1=%s", folded.get("y1"))
+    log.debug("[UDC] via_schema folded_y2=%s", folded.get("y2"))
+    log.debug("[UDC] via_schema folded_y3=%s", folded.get("y3"))
+    log.debug("[UDC] via_schema folded_y4=%s", folded.get("y4"))
+
+    return folded
+
+def _fold_direct(d: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    표준 USER_DATA 컬럼명 기준으로 직접 접기 (스키마 alias가 없거나 비어 있을 때)
+    """
+    # 프리뷰
+    log.debug("[UDC] direct preview: "
+             "1ST_YR=%r 2ND_YR=%r 3RD_YR=%r 4TH_YR=%r | "
+             "2ND_USR_LPS=%r 3RD_USR_LPS=%r 4TH_USR_LPS=%r",
+             d.get("1ST_YR"), d.get("2ND_YR"), d.get("3RD_YR"), d.get("4TH_YR"),
+             d.get("2ND_USR_LPS"), d.get("3RD_USR_LPS"), d.get("4TH_USR_LPS"))
+
+    return {
+        "name": d.get("USR_NAME"),
+        "university": d.get("USR_SNM"),
+        "y1": {"year": d.get("1ST_YR"), "CPS": d.get("1ST_USR_CPS"), "LPS": d.get("1ST_USR_LPS"),
+               "VPS": d.get("1ST_USR_VPS"), "score": d.get("SCR_EST_1ST")},
+        "y2": {"year": d.get("2ND_YR"), "CPS": d.get("2ND_USR_CPS"), "LPS": d.get("2ND_USR_LPS"),
+               "VPS": d.get("2ND_USR_VPS"), "score": d.get("SCR_EST_2ND")},
+        "y3": {"year": d.get("3RD_YR"), "CPS": d.get("3RD_USR_CPS"), "LPS": d.get("3RD_USR_LPS"),
+               "VPS": d.get("3RD_USR_VPS"), "score": d.get("SCR_EST_3RD")},
+        "y4": {"year": d.get("4TH_YR"), "CPS": d.get("4TH_USR_CPS"), "LPS": d.get("4TH_USR_LPS"),
+               "VPS": d.get("4TH_USR_VPS"), "score": d.get("SCR_EST_4TH")},
+    }
 
 def _fetch_user_data_via_schema_local(usr_id: str, schema_path: Optional[str]) -> Dict[str, Any]:
     """
-    user_schema.json을 직접 파싱해 SELECT를 만들고 실행한다.
+    user_schema.json 컬럼만으로 조회 (레지스트리의 바인드 SELECT 재사용).
     반환: {name, university, y1..y4:{year,CPS,LPS,VPS,score}}
     """
     try:
-        if not schema_path or not os.path.exists(schema_path):
-            raise FileNotFoundError(f"user schema not found: {schema_path}")
-
-        with open(schema_path, "r", encoding="utf-8") as f:
-            schema = json.load(f)
-
-        tables = schema.get("tables", [])
-        t_user = next((t for t in tables if t.get("name") == "USER_DATA"), None)
-        if not t_user:
-            raise ValueError("USER_DATA table not found in schema")
-
-        id_col = t_user.get("id_column") or "USR_ID"
-        cols = t_user.get("columns") or {}
-
-        # SELECT 컬럼 목록과 alias 매핑 준비
-        select_cols: List[str] = []
-        alias_map: Dict[str, str] = {}  # 정규화된 DB 컬럼명 -> alias(y2.LPS 등)
-        for db_col, meta in cols.items():
-            select_cols.append(db_col)
-            alias = (meta or {}).get("alias")
-            if alias:
-                alias_map[_norm_col(db_col)] = alias  # ✅ 정규화해서 저장
-
-        select_cols_uniq = list(dict.fromkeys(select_cols))
-        # ✅ 숫자로 시작하는 컬럼은 더블쿼트로 감싸서 Oracle이 이름을 망가뜨리지 않게
-        select_for_sql = [_maybe_quote(c) for c in select_cols_uniq]
-
-        sql = f"SELECT {', '.join(select_for_sql)} FROM USER_DATA WHERE {id_col} = :usr_id"
-        params = {"usr_id": usr_id}
-
-        # ✅ description을 믿지 말고 tuple로 받고, 우리가 알고 있는 원래 컬럼명으로 dict 구성
-        row_dict: Optional[Dict[str, Any]] = None
-        if hasattr(repo, "fetch_one"):
-            row = repo.fetch_one(sql, params)
-            if row:
-                # 키는 정규화된 원래 컬럼명 (예: 1ST_YR → 1ST_YR)
-                row_dict = {_norm_col(select_cols_uniq[i]): row[i] for i in range(len(select_cols_uniq))}
-        else:
-            # 최후의 보루 (여전히 description 문제 있을 수 있음)
-            row_dict = repo.fetch_one_dict(sql, params) if hasattr(repo, "fetch_one_dict") else None
-
-        log.debug("[UDC] via_schema sql=%s", sql)
+        id_col, select_cols, alias_map = _load_schema_columns(schema_path)
+        row_dict = sql_registry.fetch_user_row(usr_id, select_cols, id_col)
         if not row_dict:
             log.debug("[UDC] via_schema: no row")
             return {}
-
-        # 디버그
-        log.debug("[UDC] via_schema row_dict keys=%s", list(row_dict.keys())[:40])
-        probe_keys = [
-            "USR_NAME","USR_SNM",
-            "1ST_USR_LPS","2ND_USR_LPS","3RD_USR_LPS","4TH_USR_LPS",
-            "1ST_YR","2ND_YR","3RD_YR","4TH_YR",
-            "SCR_EST_1ST","SCR_EST_2ND","SCR_EST_3RD","SCR_EST_4TH"
-        ]
-        log.debug("[UDC] via_schema row_dict probe=%s",
-                 {k: row_dict.get(k) for k in probe_keys})
-
-        # alias 키로 재구성
-        row_aliases: Dict[str, Any] = {}
-        for norm_db_col, alias in alias_map.items():
-            if norm_db_col in row_dict:
-                row_aliases[alias] = row_dict[norm_db_col]
-
-        # 프로필 보정
-        if "name" not in row_aliases and "USR_NAME" in row_dict:
-            row_aliases["name"] = row_dict["USR_NAME"]
-        if "university" not in row_aliases and "USR_SNM" in row_dict:
-            row_aliases["university"] = row_dict["USR_SNM"]
-
-        log.debug("[UDC] via_schema alias_keys=%s", sorted(list(row_aliases.keys()))[:40])
-
-        # 정규화/접기
-        norm = _normalize_alias_keys(row_aliases)
-        folded = _fold_from_norm(norm)
-
-        log.debug("[UDC] via_schema folded_y1=%s", folded.get("y1"))
-        log.debug("[UDC] via_schema folded_y2=%s", folded.get("y2"))
-        log.debug("[UDC] via_schema folded_y3=%s", folded.get("y3"))
-        log.debug("[UDC] via_schema folded_y4=%s", folded.get("y4"))
-
-        return folded
-
+        return _fold_via_schema(row_dict, alias_map)
     except Exception as e:
         log.warning("[UDC] via_schema error: %s", e)
         return {}
 
 def _fetch_user_data_direct(usr_id: str) -> Dict[str, Any]:
     """
-    스키마 경로 실패 시 직접 SELECT로 조회.
+    스키마 경로 실패 시 표준 컬럼으로 직접 조회.
     """
-    cols = [
-        "USR_NAME", "USR_SNM",
-        "1ST_YR", "1ST_USR_CPS", "1ST_USR_LPS", "1ST_USR_VPS", "SCR_EST_1ST",
-        "2ND_YR", "2ND_USR_CPS", "2ND_USR_LPS", "2ND_USR_VPS", "SCR_EST_2ND",
-        "3RD_YR", "3RD_USR_CPS", "3RD_USR_LPS", "3RD_USR_VPS", "SCR_EST_3RD",
-        "4TH_YR", "4TH_USR_CPS", "4TH_USR_LPS", "4TH_USR_VPS", "SCR_EST_4TH",
-    ]
-    # ✅ 숫자 시작 컬럼은 더블쿼트
-    sql = f"SELECT {', '.join([_maybe_quote(c) for c in cols])} FROM USER_DATA WHERE USR_ID = :usr_id"
     try:
-        d: Optional[Dict[str, Any]] = None
-        if hasattr(repo, "fetch_one"):
-            row = repo.fetch_one(sql, {"usr_id": usr_id})
-            if row:
-                d = {c.upper(): row[i] for i, c in enumerate(cols)}
-        elif hasattr(repo, "fetch_one_dict"):
-            d = repo.fetch_one_dict(sql, {"usr_id": usr_id})
-            if d:
-                d = {k.upper(): v for k, v in d.items()}
-
+        d = sql_registry.fetch_user_row(usr_id, USER_DATA_COLUMNS)
         if not d:
             return {}
-
-        # 프리뷰
-        log.debug("[UDC] direct preview: "
-                 "1ST_YR=%r 2ND_YR=%r 3RD_YR=%r 4TH_YR=%r | "
-                 "2ND_USR_LPS=%r 3RD_USR_LPS=%r 4TH_USR_LPS=%r",
-                 d.get("1ST_YR"), d.get("2ND_YR"), d.get("3RD_YR"), d.get("4TH_YR"),
-                 d.get("2ND_USR_LPS"), d.get("3RD_USR_LPS"), d.get("4TH_USR_LPS"))
-
-        out = {
-            "name": d.get("USR_NAME"),
-            "university": d.get("USR_SNM"),
-            "y1": {"year": d.get("1ST_YR"), "CPS": d.get("1ST_USR_CPS"), "LPS": d.get("1ST_USR_LPS"),
-                   "VPS": d.get("1ST_USR_VPS"), "score": d.get("SCR_EST_1ST")},
-            "y2": {"year": d.get("2ND_YR"), "CPS": d.get("2ND_USR_CPS"), "LPS": d.get("2ND_USR_LPS"),
-                   "VPS": d.get("2ND_USR_VPS"), "score": d.get("SCR_EST_2ND")},
-            "y3": {"year": d.get("3RD_YR"), "CPS": d.get("3RD_USR_CPS"), "LPS": d.get("3RD_USR_LPS"),
-                   "VPS": d.get("3RD_USR_VPS"), "score": d.get("SCR_EST_3RD")},
-            "y4": {"year": d.get("4TH_YR"), "CPS": d.get("4TH_USR_CPS"), "LPS": d.get("4TH_USR_LPS"),
-                   "VPS": d.get("4TH_USR_VPS"), "score": d.get("SCR_EST_4TH")},
-        }
-        return out
+        return _fold_direct(d)
     except Exception as e:
         log.warning("[UDC] direct error: %s", e)
         return {}
 
+def _profile_or_default(usr_id: str, prof_fallback: Optional[Tuple[str, str]], row_dict: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if prof_fallback:
+        name, snm = prof_fallback
+    elif row_dict and (row_dict.get("USR_NAME") or row_dict.get("USR_SNM")):
+        name, snm = row_dict.get("USR_NAME"), row_dict.get("USR_SNM")
+    else:
+        try:
+            prof = repo.get_user_profile(usr_id)
+        except Exception:
+            prof = None
+        name, snm = (prof or ("사용자", "미상"))
+    log.debug("[UDC] no year payload found. using profile only.")
+    return {"name": name, "university": snm}
+
 def load_full_user_data(usr_id: str, prof_fallback: Optional[Tuple[str, str]], cfg: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    1) 스키마 경유 조회(로컬 파서)
-    2) 학년 데이터 없으면 직접 SELECT fallback
-    3) 그래도 없으면 프로필만
+    스키마 컬럼 ∪ 표준 컬럼을 '한 번의' 바인드 SELECT로 가져온 뒤
+    1) 스키마 alias 기준 접기
+    2) 학년 데이터 없으면 표준 컬럼 기준 접기
+    3) 그래도 없으면 프로필만 (같은 행의 USR_NAME/USR_SNM 우선)
+    통합 조회가 실패하면(예: 스키마에 없는 컬럼) 기존 순차 조회로 폴백
     """
     schema_path = (cfg or {}).get("user_schema_path") or os.getenv("USER_SCHEMA_CONFIG")
 
-    via = _fetch_user_data_via_schema_local(usr_id, schema_path)
-    if via and _has_any_year_payload(via):
-        return via
+    try:
+        id_col, select_cols, alias_map = _load_schema_columns(schema_path)
+    except Exception as e:
+        log.debug("[UDC] schema unavailable: %s", e)
+        id_col, select_cols, alias_map = "USR_ID", [], {}
 
-    direct = _fetch_user_data_direct(usr_id)
-    if direct and _has_any_year_payload(direct):
-        log.debug("[UDC] fallback: direct select used.")
+    try:
+        row_dict = sql_registry.fetch_user_row(usr_id, list(select_cols) + list(USER_DATA_COLUMNS), id_col)
+    except Exception as e:
+        log.warning("[UDC] combined select error → sequential fallback: %s", e)
+        via = _fetch_user_data_via_schema_local(usr_id, schema_path)
+        if via and _has_any_year_payload(via):
+            return via
+        direct = _fetch_user_data_direct(usr_id)
+        if direct and _has_any_year_payload(direct):
+            log.debug("[UDC] fallback: direct select used.")
+            return direct
+        return _profile_or_default(usr_id, prof_fallback, None)
+
+    if not row_dict:
+        log.debug("[UDC] combined select: no row")
+        return _profile_or_default(usr_id, prof_fallback, None)
+
+    if alias_map:
+        via = _fold_via_schema(row_dict, alias_map)
+        if _has_any_year_payload(via):
+            return via
+
+    direct = _fold_direct(row_dict)
+    if _has_any_year_payload(direct):
+        log.debug("[UDC] fallback: direct columns used.")
         return direct
 
-    name, snm = (prof_fallback or ("사용자", "미상"))
-    log.debug("[UDC] no year payload found. using profile only.")
-    return {"name": name, "university": snm}
+    return _profile_or_default(usr_id, prof_fallback, row_dict)
 
 # =========================
 # 분류/파싱/직답
@@ -421,14 +446,9 @@ def build_user_data_chain(backend_generate_fn, cfg: Dict[str, Any]):
             inp["_relevant"] = {}
             return inp
 
-        # 프로필 (이름/소속)
-        try:
-            prof = repo.get_user_profile(usr_id)
-        except Exception:
-            prof = None
-
+        # 프로필(이름/소속)은 USER_DATA 통합 조회 결과에 포함되므로 별도 조회하지 않음
         try:
-            full = load_full_user_data(usr_id, prof, cfg)
+            full = load_full_user_data(usr_id, None, cfg)
             qtype = analyze_question_type(message)
             rel = _pick_relevant(full, qtype, message)
             ctx  = _format_context(rel)
@@ -0,0 +1,177 @@
+# services/llm_service/db/history_cache.py
+import os
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# 요약이 '아직 조회되지 않음'을 나타내는 표식 (None = 조회했지만 요약 없음)
+_UNKNOWN = object()
+
+
+class _Entry:
+    __slots__ = ("messages", "summary", "nbytes")
+
+    def __init__(self, tail: int):
+        self.messages: Deque[Tuple[Optional[int], str, str]] = deque(maxlen=tail)  # (msg_id, role, content)
+        self.summary: Any = _UNKNOWN
+        self.nbytes = 0
+
+
+def _sizeof_msg(m: Tuple[Optional[int], str, str]) -> int:
+    return sys.getsizeof(m) + sys.getsizeof(m[1]) + sys.getsizeof(m[2]) + (sys.getsizeof(m[0]) if m[0] is not None else 0)
+
+
+class ConversationTailCache:
+    """
+    대화별 최근 K개 메시지 + 최신 요약을 보관하는 프로세스 내 캐시
+    - 시드: DB에서 최근 K개를 읽은 뒤에만 엔트리 생성 (이후 쓰기는 append로 반영)
+    - 조회: limit <= K 이고 엔트리가 있으면 DB 없이 응답
+    - 축출: LRU — 대화 수(max_convs) 또는 총 메모리(max_bytes) 초과 시 가장 오래 안 쓴 대화부터
+    - 경합: 읽기~시드 사이에 같은 대화에 쓰기/삭제가 있었으면(epoch 변경) 시드하지 않음
+      epoch는 대화별(conv_id % epoch_stripes 슬롯)로 관리 → 다른 대화의 쓰기는 시드를 막지 않음
+      (conv_id는 시퀀스라 슬롯 충돌은 epoch_stripes 간격의 대화끼리만), clear()는 전체 세대 증가
+    ※ 단일 LLM 서버 프로세스가 LLM_DATA의 유일한 writer라는 전제. 외부 삭제 시 clear() 호출 필요
+    """
+    def __init__(self, tail: int, max_convs: int, max_bytes: int, epoch_stripes: int = 4096):
+        self.tail = max(1, int(tail))
+        self.max_convs = max(1, int(max_convs))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0                                   # clear() 시 증가
+        self._epochs = [0] * max(1, int(epoch_stripes))        # 대화별 쓰기 카운터 (슬롯)
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    # ----- 내부 -----
+    def _recount(self, e: _Entry) -> None:
+        new = sum(_sizeof_msg(m) for m in e.messages)
+        if isinstance(e.summary, tuple):
+            new += sys.getsizeof(e.summary[0])
+        self._bytes += new - e.nbytes
+        e.nbytes = new
+
+    def _evict_if_needed(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_convs
+            or (self.max_bytes and self._bytes > self.max_bytes and len(self._entries) > 1)
+        ):
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+            self._stats["evictions"] += 1
+
+    # ----- 읽기 -----
+    def _bump(self, conv_id: int) -> None:
+        self._epochs[conv_id % len(self._epochs)] += 1
+
+    def _epoch_of(self, conv_id: int) -> Tuple[int, int]:
+        return (self._generation, self._epochs[conv_id % len(self._epochs)])
+
+    def epoch(self, conv_id: int) -> Tuple[int, int]:
+        """DB 읽기 직전 호출 → seed/set_summary에 그대로 전달"""
+        with self._lock:
+            return self._epoch_of(conv_id)
+
+    def get_history(self, conv_id: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        if limit > self.tail:
+            return None
+        with self._lock:
+            e = self._entries.get(conv_id)
+            if e is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(conv_id)
+            self._stats["hits"] += 1
+            msgs = list(e.messages)[-limit:] if limit > 0 else []
+        return [{"role": r, "content": c} for _, r, c in msgs]
+
+    def get_summary(self, conv_id: int) -> Any:
+        """캐시된 요약 (text, up_to) / None, 모르면 _UNKNOWN"""
+        with self._lock:
+            e = self._entries.get(conv_id)
+            if e is None or e.summary is _UNKNOWN:
+                return _UNKNOWN
+            self._entries.move_to_end(conv_id)
+            return e.summary
+
+    # ----- 쓰기 -----
+    def seed(self, conv_id: int, rows: List[Tuple[Optional[int], str, str]], epoch: Tuple[int, int]) -> None:
+        """rows: DB에서 읽은 최근 메시지 (msg_id 오름차순)"""
+        with self._lock:
+            if epoch != self._epoch_of(conv_id) or conv_id in self._entries:
+                return
+            e = _Entry(self.tail)
+            e.messages.extend(rows[-self.tail:])
+            self._entries[conv_id] = e
+            self._recount(e)
+            self._evict_if_needed()
+
+    def append(self, conv_id: int, rows: List[Tuple[Optional[int], str, str]]) -> None:
+        with self._lock:
+            self._bump(conv_id)
+            e = self._entries.get(conv_id)
+            if e is None:
+                return
+            e.messages.extend(rows)
+            self._recount(e)
+            self._entries.move_to_end(conv_id)
+            self._evict_if_needed()
+
+    def set_summary(self, conv_id: int, summary: Optional[Tuple[str, int]],
+                    epoch: Optional[Tuple[int, int]] = None) -> None:
+        with self._lock:
+            if epoch is not None and epoch != self._epoch_of(conv_id):
+                return
+            if epoch is None:
+                self._bump(conv_id)
+            e = self._entries.get(conv_id)
+            if e is None:
+                return
+            e.summary = summary
+            self._recount(e)
+            self._evict_if_needed()
+
+    def invalidate(self, conv_id: int) -> None:
+        with self._lock:
+            self._bump(conv_id)
+            e = self._entries.pop(conv_id, None)
+            if e is not None:
+                self._bytes -= e.nbytes
+
+    def clear(self) -> int:
+        with self._lock:
+            self._generation += 1
+            n = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return n
+
+    # ----- 리포트 -----
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            convs = [
+                {"conv_id": cid, "messages": len(e.messages), "bytes": e.nbytes,
+                 "has_summary": isinstance(e.summary, tuple)}
+                for cid, e in self._entries.items()
+            ]
+            return {
+                "policy": {
+                    "eviction": "LRU",
+                    "tail_messages": self.tail,
+                    "max_conversations": self.max_convs,
+                    "max_bytes": self.max_bytes,
+                },
+                "conversations": len(convs),
+                "total_bytes": self._bytes,
+                **self._stats,
+                "per_conversation": convs,
+            }
+
+
+history_cache = ConversationTailCache(
+    tail=int(os.getenv("LLM_HISTORY_TAIL", "16") or 16),
+    max_convs=int(os.getenv("LLM_HISTORY_CACHE_CONVS", "512") or 512),
+    max_bytes=int(os.getenv("LLM_HISTORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)) or 0),
+    epoch_stripes=int(os.getenv("LLM_HISTORY_EPOCH_STRIPES", "4096") or 4096),
+)
@@ -1,9 +1,12 @@
 # services/llm_service/db/llm_repository_cx.py
-import os, re
+import os, re, time
+import atexit
 import pathlib
+import threading
 from typing import Optional, List, Tuple, Dict, Any
 import logging
 from .oracle_cx import ConnCtx
+from .history_cache import history_cache, _UNKNOWN
 
 from services.llm_service.db.user_schema_loader import load_user_schema, build_select_from_schema, map_row_to_aliases
 
@@ -96,36 +99,195 @@ def latest_conv_id(user_id: str) -> Optional[int]:
           )
          WHERE ROWNUM = 1
     """
+    _flush_if_pending()
     with ConnCtx() as conn:
         cur = conn.cursor()
         cur.execute(sql, [user_id])
         r = cur.fetchone()
         return int(r[0]) if r else None
 
-def append_message(conv_id: int, user_id: str, role: str, content: str, tokens: int = 0) -> int:
-    mid = next_msg_id()
-    sql = """
-      INSERT INTO llm_data (conv_id, usr_id, msg_id, role, content, tokens, created_at)
-      VALUES (:1, :2, :3, :4, :5, :6, SYSTIMESTAMP)
-    """
-    with ConnCtx() as conn:
-        cur = conn.cursor()
+def _clob_type():
+    """드라이버별 CLOB 바인드 타입 (없으면 None)"""
+    try:
+        import cx_Oracle
+        return cx_Oracle.CLOB
+    except Exception:
         try:
             import oracledb
-            cur.setinputsizes(None, None, None, None, oracledb.DB_TYPE_CLOB, None)
+            return oracledb.DB_TYPE_CLOB
         except Exception:
-            try:
-                import cx_Oracle
-                cur.setinputsizes(None, None, None, None, cx_Oracle.CLOB, None)
-            except Exception:
-                pass
-        cur.execute(sql, [int(conv_id), str(user_id), int(mid), str(role), str(content), int(tokens)])
+            return None
+
+# msg_id는 INSERT 안에서 시퀀스로 채우고 RETURNING으로 돌려받는다 (NEXTVAL 별도 왕복 제거)
+_INSERT_MSG_SQL = """
+  INSERT INTO llm_data (conv_id, usr_id, msg_id, role, content, tokens, created_at)
+  VALUES (:1, :2, SEQ_LLM_MSG.NEXTVAL, :3, :4, :5, SYSTIMESTAMP)
+  RETURNING msg_id INTO :6
+"""
+
+def _insert_messages(rows: List[Tuple[int, str, str, str, int]]) -> List[Optional[int]]:
+    """
+    rows: [(conv_id, usr_id, role, content, tokens), ...]
+    한 커넥션/한 번의 executemany로 기록하고 생성된 msg_id 목록을 반환
+    """
+    if not rows:
+        return []
+    data = [(int(c), str(u), str(r), str(t), int(k)) for (c, u, r, t, k) in rows]
+    with ConnCtx() as conn:
+        cur = conn.cursor()
+        out = cur.var(int, arraysize=len(data))
+        cur.setinputsizes(None, None, None, _clob_type(), None, out)
+        if len(data) == 1:
+            cur.execute(_INSERT_MSG_SQL, data[0])
+            ids = [out.getvalue()]
+        else:
+            cur.executemany(_INSERT_MSG_SQL, data)
+            ids = [out.getvalue(i) for i in range(len(data))]
+    # RETURNING 값은 행별 리스트([id])로 돌아오는 경우가 있어 평탄화
+    flat: List[Optional[int]] = []
+    for v in ids:
+        if isinstance(v, list):
+            v = v[0] if v else None
+        flat.append(int(v) if v is not None else None)
+    return flat
+
+def append_message(conv_id: int, user_id: str, role: str, content: str, tokens: int = 0) -> int:
+    _flush_if_pending()
+    mid = _insert_messages([(conv_id, user_id, role, content, tokens)])[0]
+    history_cache.append(int(conv_id), [(mid, str(role), str(content))])
     return mid
 
+def append_turn(conv_id: int, user_id: str, messages: List[Tuple[str, str]], tokens: int = 0) -> List[Optional[int]]:
+    """
+    한 턴의 메시지들(예: user + assistant)을 한 번에 기록
+    - 기본: 단일 executemany (커넥션 1회, 왕복 1회)
+    - LLM_WRITE_BEHIND_MS > 0 이면 버퍼에 넣고 즉시 반환(주기적 일괄 flush) → 빈 리스트 반환
+    """
+    rows = [(conv_id, user_id, role, content, tokens) for role, content in messages]
+    if _write_behind is not None:
+        _write_behind.submit(rows)
+        history_cache.append(int(conv_id), [(None, str(r), str(c)) for r, c in messages])
+        return []
+    ids = _insert_messages(rows)
+    history_cache.append(int(conv_id), [(mid, str(r), str(c)) for mid, (r, c) in zip(ids, messages)])
+    return ids
+
+# --- 선택: write-behind 버퍼 ---
+# 연속 flush 실패 시 재시도 간격 상한(초)
+_WRITE_BEHIND_BACKOFF_MAX_S = float(os.getenv("LLM_WRITE_BEHIND_BACKOFF_MAX_S", "60") or 60)
+
+class _WriteBehindBuffer:
+    """
+    동시 채팅이 많을 때 INSERT를 모아 interval_ms마다 한 번의 executemany로 flush
+    - max_batch 이상 쌓이면 주기를 기다리지 않고 flush
+    - 일괄 INSERT 실패 시 행 단위로 다시 기록 (문제 행 하나가 배치 전체를 막지 않도록)
+      → 그래도 실패한 행은 버리지 않고 버퍼 앞쪽에 되돌린 뒤 지수 백오프로 재시도
+      → 같은 대화에서 실패한 행 뒤의 행도 함께 보류 (msg_id 순서 = 대화 순서 유지)
+    - 읽기 쿼리(fetch_history 등) 전에 flush_pending()으로 read-your-writes 보장
+    """
+    def __init__(self, interval_ms: int, max_batch: int):
+        self._interval = max(1, interval_ms) / 1000.0
+        self._max_batch = max(1, max_batch)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: List[Tuple[int, str, str, str, int]] = []
+        self._failures = 0          # 연속 실패 횟수
+        self._retry_at = 0.0        # 백오프 중이면 다음 재시도 시각(monotonic)
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="llm-write-behind", daemon=True)
+        self._thread.start()
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def submit(self, rows) -> None:
+        with self._lock:
+            self._pending.extend(rows)
+            full = len(self._pending) >= self._max_batch
+        if full:
+            self._wake.set()
+
+    def _insert_row_by_row(self, batch) -> list:
+        """행 단위 기록, 실패한 행(및 같은 대화의 후속 행) 목록 반환"""
+        failed, blocked = [], set()
+        for row in batch:
+            if row[0] in blocked:
+                failed.append(row)
+                continue
+            try:
+                _insert_messages([row])
+            except Exception as e:
+                log.warning("write-behind 행 기록 실패(conv_id=%s): %s", row[0], e)
+                blocked.add(row[0])
+                failed.append(row)
+        return failed
+
+    def flush(self, force: bool = False) -> int:
+        """기록된 행 수 반환. 백오프 중에는 force=True(종료 시 등)일 때만 시도"""
+        with self._flush_lock:
+            if not force and time.monotonic() < self._retry_at:
+                return 0
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                _insert_messages(batch)
+                failed = []
+            except Exception as e:
+                log.warning("write-behind 일괄 flush 실패(rows=%d) → 행 단위 재시도: %s", len(batch), e)
+                failed = self._insert_row_by_row(batch) if len(batch) > 1 else batch
+
+            if failed:
+                self._failures += 1
+                delay = min(_WRITE_BEHIND_BACKOFF_MAX_S, self._interval * (2 ** self._failures))
+                self._retry_at = time.monotonic() + delay
+                with self._lock:
+                    self._pending = failed + self._pending
+                log.error("write-behind 기록 보류(rows=%d, 연속 실패 %d회) → %.1fs 후 재시도",
+                          len(failed), self._failures, delay)
+            else:
+                self._failures = 0
+                self._retry_at = 0.0
+            return len(batch) - len(failed)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            self.flush()
+
+_WRITE_BEHIND_MS = int(os.getenv("LLM_WRITE_BEHIND_MS", "0") or 0)
+_write_behind: Optional[_WriteBehindBuffer] = (
+    _WriteBehindBuffer(_WRITE_BEHIND_MS, int(os.getenv("LLM_WRITE_BEHIND_MAX", "64") or 64))
+    if _WRITE_BEHIND_MS > 0 else None
+)
+
+def flush_pending() -> int:
+    """버퍼에 남은 메시지를 즉시 기록 (버퍼 미사용 시 0, 백오프 무시)"""
+    return _write_behind.flush(force=True) if _write_behind is not None else 0
+
+def _flush_if_pending() -> None:
+    if _write_behind is not None and _write_behind.has_pending():
+        _write_behind.flush()
+
+if _write_behind is not None:
+    atexit.register(flush_pending)
+
 def fetch_history(conv_id: int, limit: int = 12) -> List[Dict[str, Any]]:
+    """
+    최근 limit개 메시지 (msg_id 오름차순)
+    - limit <= LLM_HISTORY_TAIL 이면 대화별 tail 캐시에서 응답
+    - 미스 시 최근 max(limit, tail)개를 읽어 캐시를 채움
+    """
+    limit = int(limit)
+    cached = history_cache.get_history(int(conv_id), limit)
+    if cached is not None:
+        return cached
+
     sql = """
-      SELECT role, content FROM (
-        SELECT role, content, msg_id
+      SELECT msg_id, role, content FROM (
+        SELECT msg_id, role, content
           FROM llm_data
          WHERE conv_id = :1
          ORDER BY msg_id DESC
@@ -133,13 +295,58 @@ def fetch_history(conv_id: int, limit: int = 12) -> List[Dict[str, Any]]:
       WHERE ROWNUM <= :2
       ORDER BY msg_id ASC
     """
+    _flush_if_pending()
+    epoch = history_cache.epoch(int(conv_id))
     with ConnCtx() as conn:
         cur = conn.cursor()
-        cur.execute(sql, [conv_id, limit])
+        cur.execute(sql, [conv_id, max(limit, history_cache.tail)])
+        rows = [(int(r[0]), r[1], _as_text(r[2])) for r in cur.fetchall()]
+    history_cache.seed(int(conv_id), rows, epoch)
+    rows = rows[-limit:] if limit > 0 else []
+    return [{"role": r[1], "content": r[2]} for r in rows]
+
+def fetch_history_page(conv_id: int, user_id: str, before_msg_id: Optional[int] = None, limit: int = 20) -> Dict[str, Any]:
+    """
+    UI용 과거 기록 키셋 페이지네이션 (OFFSET 없이 msg_id 기준)
+    - before_msg_id 미지정: 가장 최근 페이지
+    - 반환: {"messages": [...오름차순], "next_before": 다음 페이지 커서 | None}
+    """
+    limit = max(1, min(int(limit), 100))
+    sql = """
+      SELECT msg_id, role, content, created_at FROM (
+        SELECT msg_id, role, content, created_at
+          FROM llm_data
+         WHERE conv_id = :conv_id
+           AND usr_id = :usr_id
+           AND msg_id < :before_id
+         ORDER BY msg_id DESC
+      )
+      WHERE ROWNUM <= :lim
+    """
+    _flush_if_pending()
+    before = int(before_msg_id) if before_msg_id is not None else 2 ** 62
+    with ConnCtx() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, {"conv_id": int(conv_id), "usr_id": str(user_id), "before_id": before, "lim": limit + 1})
         rows = cur.fetchall()
-        return [{"role": r[0], "content": _as_text(r[1])} for r in rows]
+    has_more = len(rows) > limit
+    rows = list(reversed(rows[:limit]))
+    messages = [
+        {"msg_id": int(r[0]), "role": r[1], "content": _as_text(r[2]),
+         "created_at": r[3].isoformat() if hasattr(r[3], "isoformat") else r[3]}
+        for r in rows
+    ]
+    return {"messages": messages, "next_before": (messages[0]["msg_id"] if has_more and messages else None)}
+
+def clear_history_cache() -> int:
+    """LLM_DATA가 외부에서 삭제되었을 때 호출 (캐시된 대화 수 반환)"""
+    return history_cache.clear()
+
+def history_cache_stats() -> Dict[str, Any]:
+    return history_cache.stats()
 
 def max_msg_id(conv_id: int) -> int:
+    _flush_if_pending()
     with ConnCtx() as conn:
         cur = conn.cursor()
         cur.execute("SELECT NVL(MAX(msg_id), 0) FROM llm_data WHERE conv_id = :1", [conv_id])
@@ -147,6 +354,9 @@ def max_msg_id(conv_id: int) -> int:
 
 # --- 요약 관리 ---
 def get_latest_summary(conv_id: int) -> Optional[Tuple[str, int]]:
+    cached = history_cache.get_summary(int(conv_id))
+    if cached is not _UNKNOWN:
+        return cached
     sql = """
       SELECT summary, summary_up_to_msg_id FROM (
         SELECT summary, summary_up_to_msg_id, msg_id
@@ -157,13 +367,15 @@ def get_latest_summary(conv_id: int) -> Optional[Tuple[str, int]]:
       )
       WHERE ROWNUM = 1
     """
+    _flush_if_pending()
+    epoch = history_cache.epoch(int(conv_id))
     with ConnCtx() as conn:
         cur = conn.cursor()
         cur.execute(sql, [conv_id])
         r = cur.fetchone()
-        if not r:
-            return None
-        return (_as_text(r[0]), int(r[1]))
+        result = (_as_text(r[0]), int(r[1])) if r else None
+    history_cache.set_summary(int(conv_id), result, epoch)
+    return result
 
 def upsert_summary_on_latest_row(conv_id: int, summary_text: str, cover_to_msg_id: int) -> None:
     sql = """
@@ -172,6 +384,7 @@ def upsert_summary_on_latest_row(conv_id: int, summary_text: str, cover_to_msg_i
        WHERE conv_id = :3
          AND msg_id = (SELECT MAX(msg_id) FROM llm_data WHERE conv_id = :3)
     """
+    _flush_if_pending()
     with ConnCtx() as conn:
         cur = conn.cursor()
         try:
@@ -184,6 +397,7 @@ def upsert_summary_on_latest_row(conv_id: int, summary_text: str, cover_to_msg_i
             except Exception:
                 pass
         cur.execute(sql, [summary_text, int(cover_to_msg_id), int(conv_id)])
+    history_cache.set_summary(int(conv_id), (summary_text, int(cover_to_msg_id)))
 
 # --- (참고용) 스키마 기반 전체 데이터 조회 (현재 체인에선 미사용 가능) ---
 def get_full_user_data(usr_id: str) -> Dict[str, Any]:
@@ -47,6 +47,8 @@ def get_pool():
         encoding="UTF-8", nencoding="UTF-8",
         sessionCallback=_session_init,
     )
+    # 드라이버 statement cache: 세션별로 파싱된 커서를 재사용 (동일 SQL 텍스트 재실행 시 파스 생략)
+    _pool.stmtcachesize = int(os.getenv("ORACLE_STMT_CACHE_SIZE", "40"))
     return _pool
 
 class ConnCtx:
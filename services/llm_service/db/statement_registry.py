@@ -0,0 +1,81 @@
+# services/llm_service/db/statement_registry.py
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+
+from . import llm_repository_cx as repo
+
+# USER_DATA 표준 컬럼 순서 (컬럼 부분집합이 같으면 항상 같은 SQL 텍스트가 나오도록 정렬 기준으로 사용)
+USER_DATA_COLUMNS: Tuple[str, ...] = (
+    "USR_NAME", "USR_SNM",
+    "1ST_YR", "1ST_USR_CPS", "1ST_USR_LPS", "1ST_USR_VPS", "SCR_EST_1ST",
+    "2ND_YR", "2ND_USR_CPS", "2ND_USR_LPS", "2ND_USR_VPS", "SCR_EST_2ND",
+    "3RD_YR", "3RD_USR_CPS", "3RD_USR_LPS", "3RD_USR_VPS", "SCR_EST_3RD",
+    "4TH_YR", "4TH_USR_CPS", "4TH_USR_LPS", "4TH_USR_VPS", "SCR_EST_4TH",
+)
+_COL_ORDER = {c: i for i, c in enumerate(USER_DATA_COLUMNS)}
+
+_COL_NORM = re.compile(r'[^A-Za-z0-9_]+')
+def _norm_col(name: str) -> str:
+    return _COL_NORM.sub('', (name or '').strip()).upper()
+
+# 숫자로 시작하는 컬럼은 더블쿼트 (1ST_YR 등)
+def _maybe_quote(c: str) -> str:
+    return f'"{c}"' if c and c[0].isdigit() else c
+
+
+class StatementRegistry:
+    """
+    USER_DATA 조회 SQL 레지스트리
+    - 컬럼 부분집합별 SELECT를 1회만 생성하고 바인드 변수(:usr_id)로 재사용
+      → 동일 텍스트가 Oracle 공유 커서/드라이버 statement cache에 그대로 적중
+    - parses: 레지스트리가 새 SQL 텍스트를 만든 횟수(= 하드 파스 후보)
+    - executes: 레지스트리 경유 실행 횟수
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stmts: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _canonical(self, columns: Iterable[str]) -> Tuple[str, ...]:
+        uniq = {_norm_col(c) for c in columns if c}
+        return tuple(sorted(uniq, key=lambda c: (_COL_ORDER.get(c, len(_COL_ORDER)), c)))
+
+    def user_data_select(self, columns: Iterable[str], id_col: str = "USR_ID") -> Tuple[str, Tuple[str, ...]]:
+        """
+        (sql, 정렬된 컬럼 튜플) 반환. 결과 행의 i번째 값은 컬럼 튜플의 i번째 컬럼.
+        """
+        cols = self._canonical(columns)
+        key = (_norm_col(id_col) or "USR_ID", cols)
+        with self._lock:
+            sql = self._stmts.get(key)
+            if sql is None:
+                sql = f"SELECT {', '.join(_maybe_quote(c) for c in cols)} FROM USER_DATA WHERE {key[0]} = :usr_id"
+                self._stmts[key] = sql
+                self._stats[sql] = {"parses": 1, "executes": 0}
+        return sql, cols
+
+    def fetch_user_row(self, usr_id: str, columns: Iterable[str], id_col: str = "USR_ID") -> Optional[Dict[str, Any]]:
+        """
+        한 번의 쿼리로 요청 컬럼 전체를 조회해 {정규화 컬럼명: 값} dict로 반환 (없으면 None)
+        """
+        sql, cols = self.user_data_select(columns, id_col)
+        with self._lock:
+            self._stats[sql]["executes"] += 1
+        row = repo.fetch_one(sql, {"usr_id": usr_id})
+        if not row:
+            return None
+        return {cols[i]: row[i] for i in range(len(cols))}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_stmt: List[Dict[str, Any]] = [{"sql": s, **c} for s, c in self._stats.items()]
+        return {
+            "statements": len(per_stmt),
+            "parses": sum(s["parses"] for s in per_stmt),
+            "executes": sum(s["executes"] for s in per_stmt),
+            "per_statement": per_stmt,
+        }
+
+
+registry = StatementRegistry()
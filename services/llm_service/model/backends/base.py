@@ -1,7 +1,7 @@
 # model/backends/base.py
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 
 class IBackend(ABC):
     @abstractmethod
@@ -15,3 +15,17 @@ class IBackend(ABC):
 
     @abstractmethod
     def close(self) -> None: ...
+
+    def generate_stream(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any],
+                        on_piece: Callable[[str], bool]) -> str:
+        """
+        조각 단위 생성: on_piece(조각)이 True를 반환하면 디코딩 중단 후 지금까지의 텍스트 반환
+        (스트리밍 미지원 백엔드는 전체 생성 후 1회 전달)
+        """
+        text = self.generate(messages, gen_params)
+        on_piece(text)
+        return text
+
+    def count_tokens(self, text: str) -> Optional[int]:
+        """백엔드 토크나이저 기준 토큰 수 (미지원 백엔드는 None → 근사치 사용)"""
+        return None
@@ -1,14 +1,46 @@
 # model/backends/gguf_llamacpp.py
 import os
+import time
+import logging
 import threading
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 
 from huggingface_hub import hf_hub_download
 from huggingface_hub.utils import HfHubHTTPError
 from llama_cpp import Llama
 
+try:
+    from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+except Exception:  # 구버전 llama-cpp-python
+    LlamaPromptLookupDecoding = None
+
 from .base import IBackend
 
+log = logging.getLogger("gguf_backend")
+
+
+if LlamaPromptLookupDecoding is not None:
+    class _CountingPromptLookup(LlamaPromptLookupDecoding):
+        """
+        prompt-lookup 드래프트 + 호출/제안 토큰 계측
+        - llama.cpp 생성 루프는 디코드 스텝마다 드래프트를 1회 호출
+          → 수락된 드래프트 토큰 ≈ 생성 토큰 수 - 호출 수
+        """
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.calls = 0
+            self.proposed = 0
+
+        def reset_counters(self) -> None:
+            self.calls = 0
+            self.proposed = 0
+
+        def __call__(self, input_ids, **kwargs):
+            out = super().__call__(input_ids, **kwargs)
+            self.calls += 1
+            self.proposed += len(out)
+            return out
+
 
 class GGUFBackend(IBackend):
     """
@@ -26,6 +58,10 @@ class GGUFBackend(IBackend):
         self._model_path: Optional[str] = None
         self._n_ctx = int(self.cfg.get("load_params", {}).get("n_ctx", 4096))
         self._llm_init_kwargs = None  # warmup 시 저장해두고, 재초기화에 재사용
+        self._draft = None
+        self._last_stats: Dict[str, Any] = {}
+        self._totals = {"requests": 0, "completion_tokens": 0, "seconds": 0.0,
+                        "draft_proposed": 0, "draft_accepted": 0, "early_stops": 0}
 
     def name(self) -> str:
         return "gguf"
@@ -51,6 +87,24 @@ class GGUFBackend(IBackend):
         # 보관(충돌 시 재초기화 용)
         self._llm_init_kwargs = init_kwargs.copy()
         self._n_ctx = init_kwargs["n_ctx"]
+
+        # 추측 디코딩: 프롬프트 안의 n-gram을 드래프트로 재사용 (데이터 인용형 답변에 효과적)
+        spec = self.cfg.get("speculative") or {}
+        self._draft = None
+        if spec.get("mode") == "prompt_lookup":
+            if LlamaPromptLookupDecoding is None:
+                log.warning("[GGUF] prompt_lookup requested but llama_cpp.llama_speculative is unavailable")
+            else:
+                self._draft = _CountingPromptLookup(
+                    max_ngram_size=int(spec.get("max_ngram_size", 2)),
+                    num_pred_tokens=int(spec.get("num_pred_tokens", 10)),
+                )
+                init_kwargs["draft_model"] = self._draft
+                log.info("[GGUF] speculative decoding: prompt_lookup (ngram=%s, pred=%s)",
+                         spec.get("max_ngram_size"), spec.get("num_pred_tokens"))
+        elif spec.get("mode") not in (None, "", "off"):
+            log.warning("[GGUF] unsupported speculative mode=%r (supported: off, prompt_lookup)", spec.get("mode"))
+
         self._llm = Llama(**init_kwargs)
 
     # ----- lifecycle -----
@@ -89,6 +143,13 @@ class GGUFBackend(IBackend):
     def close(self) -> None:
         self._llm = None
 
+    def count_tokens(self, text: str) -> Optional[int]:
+        # 토크나이즈는 vocab 조회만 하므로 생성 락 없이 호출
+        llm = self._llm
+        if llm is None:
+            return None
+        return len(llm.tokenize((text or "").encode("utf-8"), add_bos=False, special=True))
+
     # ----- generation -----
     def _clamp_params(self, gen_params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -122,6 +183,9 @@ class GGUFBackend(IBackend):
         """
         llama 호출 (락 안에서만 호출할 것)
         """
+        if self._draft is not None:
+            self._draft.reset_counters()
+        t0 = time.perf_counter()
         out = self._llm.create_chat_completion(
             messages=messages,
             temperature=p["temperature"],
@@ -132,8 +196,79 @@ class GGUFBackend(IBackend):
             stop=p["stop"],
             stream=False,
         )
+        self._record_stats(out, time.perf_counter() - t0)
         return (out["choices"][0]["message"]["content"] or "").strip()
 
+    def _stream_llama(self, messages: List[Dict[str, str]], p: Dict[str, Any],
+                      on_piece: Callable[[str], bool]) -> str:
+        """
+        스트리밍 호출 (락 안에서만 호출할 것)
+        - on_piece가 True를 반환하면 제너레이터를 닫아 디코딩 중단
+        """
+        if self._draft is not None:
+            self._draft.reset_counters()
+        t0 = time.perf_counter()
+        it = self._llm.create_chat_completion(
+            messages=messages,
+            temperature=p["temperature"],
+            top_p=p["top_p"],
+            top_k=p["top_k"],
+            max_tokens=p["max_new_tokens"],
+            repeat_penalty=p["repetition_penalty"],
+            stop=p["stop"],
+            stream=True,
+        )
+        parts: List[str] = []
+        stopped = False
+        try:
+            for chunk in it:
+                piece = ((chunk["choices"][0].get("delta") or {}).get("content")) or ""
+                if not piece:
+                    continue
+                parts.append(piece)
+                if on_piece(piece):
+                    stopped = True
+                    break
+        finally:
+            close = getattr(it, "close", None)
+            if callable(close):
+                close()
+        # 스트림 응답에는 usage가 없음 → 청크 수(≈토큰 수)로 근사
+        self._record_stats({"usage": {"completion_tokens": len(parts)}}, time.perf_counter() - t0, early_stop=stopped)
+        return "".join(parts).strip()
+
+    def _record_stats(self, out: Dict[str, Any], elapsed: float, early_stop: bool = False) -> None:
+        """요청별 유효 tokens/sec 및 드래프트 수락률(추정) 기록 (락 안에서 호출됨)"""
+        completion = int(((out or {}).get("usage") or {}).get("completion_tokens") or 0)
+        st: Dict[str, Any] = {
+            "completion_tokens": completion,
+            "seconds": round(elapsed, 4),
+            "tokens_per_sec": round(completion / elapsed, 2) if elapsed > 0 else None,
+            "speculative": "prompt_lookup" if self._draft is not None else "off",
+            "early_stop": early_stop,
+        }
+        t = self._totals
+        t["requests"] += 1
+        t["early_stops"] += int(early_stop)
+        t["completion_tokens"] += completion
+        t["seconds"] += elapsed
+        if self._draft is not None:
+            proposed = self._draft.proposed
+            accepted = max(0, min(proposed, completion - self._draft.calls))
+            st.update(draft_proposed=proposed, draft_accepted=accepted,
+                      acceptance_rate=round(accepted / proposed, 3) if proposed else None)
+            t["draft_proposed"] += proposed
+            t["draft_accepted"] += accepted
+        self._last_stats = st
+        log.info("[GGUF] tokens=%d %.1f tok/s spec=%s accept=%s",
+                 completion, st["tokens_per_sec"] or 0.0, st["speculative"], st.get("acceptance_rate"))
+
+    def stats(self) -> Dict[str, Any]:
+        t = dict(self._totals)
+        t["tokens_per_sec"] = round(t["completion_tokens"] / t["seconds"], 2) if t["seconds"] > 0 else None
+        t["acceptance_rate"] = round(t["draft_accepted"] / t["draft_proposed"], 3) if t["draft_proposed"] else None
+        return {"last": dict(self._last_stats), "totals": t}
+
     def _retry_after_reinit(self, messages: List[Dict[str, str]], p: Dict[str, Any]) -> str:
         """
         충돌/에러 발생 시 1회 재초기화 후 더 보수적인 파라미터로 재시도
@@ -166,3 +301,17 @@ class GGUFBackend(IBackend):
             except Exception as e:
                 # ggml assert 등도 재초기화 후 1회 재시도
                 return self._retry_after_reinit(messages, p)
+
+    def generate_stream(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any],
+                        on_piece: Callable[[str], bool]) -> str:
+        if self._llm is None:
+            self.warmup()
+
+        p = self._clamp_params(gen_params)
+
+        with self._lock:
+            try:
+                return self._stream_llama(messages, p, on_piece)
+            except Exception:
+                # 기존 경로와 동일하게 재초기화 후 1회 재시도(비스트리밍, 컷은 _postprocess가 처리)
+                return self._retry_after_reinit(messages, p)
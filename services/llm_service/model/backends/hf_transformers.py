@@ -1,16 +1,119 @@
 # model/backends/hf_transformers.py
 
-from typing import List, Dict, Any
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import List, Dict, Any, Optional, Tuple
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
 from .base import IBackend
 
+log = logging.getLogger("hf_backend")
+
+
+class _BatchScheduler:
+    """
+    연속 배칭(continuous batching) 스케줄러
+    - 첫 요청 도착 후 최대 wait_ms 동안(또는 max_batch개가 찰 때까지) 같은 생성 파라미터의 요청을 모음
+    - 모은 프롬프트를 left-pad 하여 generate 1회로 처리 → 결과를 각 호출자의 Future로 분배
+    - 생성 파라미터(key)가 다른 요청은 큐에 남겨 다음 배치로
+    """
+    def __init__(self, run_batch, max_batch: int, wait_ms: float):
+        self._run_batch = run_batch  # (prompts, key) -> List[str]
+        self.max_batch = max(1, int(max_batch))
+        self.wait_s = max(0.0, float(wait_ms) / 1000.0)
+        self._cv = threading.Condition()
+        self._pending: "deque[Tuple[str, Tuple, Future]]" = deque()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"batches": 0, "requests": 0, "max_batch_seen": 0}
+
+    def submit(self, prompt: str, key: Tuple) -> Future:
+        fut: Future = Future()
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("batch scheduler is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="hf-batcher", daemon=True)
+                self._thread.start()
+            self._pending.append((prompt, key, fut))
+            self._cv.notify_all()
+        return fut
+
+    def _same_key(self, key: Tuple) -> int:
+        return sum(1 for _, k, _ in self._pending if k == key)
+
+    def _take_batch(self) -> Tuple[Tuple, List[Tuple[str, Tuple, Future]]]:
+        """락 안에서 호출: 선두 요청과 같은 key의 요청을 최대 max_batch개 꺼냄"""
+        key = self._pending[0][1]
+        deadline = time.monotonic() + self.wait_s
+        while not self._closed and self._same_key(key) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cv.wait(remaining)
+        batch, rest = [], deque()
+        while self._pending:
+            item = self._pending.popleft()
+            if item[1] == key and len(batch) < self.max_batch:
+                batch.append(item)
+            else:
+                rest.append(item)
+        self._pending = rest
+        return key, batch
+
+    def _loop(self) -> None:
+        while True:
+            with self._cv:
+                while not self._pending and not self._closed:
+                    self._cv.wait()
+                if not self._pending:
+                    return
+                key, batch = self._take_batch()
+
+            # 호출자가 이미 취소한 요청은 제외
+            batch = [b for b in batch if b[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                outs = self._run_batch([b[0] for b in batch], key)
+                for (_, _, fut), text in zip(batch, outs):
+                    fut.set_result(text)
+            except Exception as e:
+                log.exception("[HF] batch generate failed (size=%d)", len(batch))
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+
+            with self._cv:
+                self._stats["batches"] += 1
+                self._stats["requests"] += len(batch)
+                self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+
+    def close(self) -> None:
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cv:
+            st = dict(self._stats)
+            st["queued"] = len(self._pending)
+        st["avg_batch_size"] = round(st["requests"] / st["batches"], 2) if st["batches"] else None
+        st.update(max_batch=self.max_batch, wait_ms=int(self.wait_s * 1000))
+        return st
+
+
 class HFBackend(IBackend):
     def __init__(self, cfg: dict, env):
         self.cfg = cfg
         self.env = env
         self.pipe = None
         self._model_id = cfg["model"]["repo_id"]
+        self._batcher: Optional[_BatchScheduler] = None
 
     def name(self) -> str:
         return "hf"
@@ -32,6 +135,17 @@ class HFBackend(IBackend):
                              device_map=device_map, torch_dtype=dtype if dtype else None)
         self.eos_id = self.pipe.tokenizer.eos_token_id or getattr(getattr(self.pipe.model, "config", None), "eos_token_id", None)
 
+        # 배칭 모드: load_params.batch_max_size > 1 (env HF_BATCH_MAX_SIZE / HF_BATCH_WAIT_MS 오버라이드)
+        max_batch = int(self.env.get("HF_BATCH_MAX_SIZE") or lp.get("batch_max_size", 1))
+        wait_ms = float(self.env.get("HF_BATCH_WAIT_MS") or lp.get("batch_wait_ms", 10))
+        if max_batch > 1:
+            tok = self.pipe.tokenizer
+            tok.padding_side = "left"  # decoder-only: 생성 위치를 맞추기 위해 왼쪽 패딩
+            if tok.pad_token_id is None:
+                tok.pad_token = tok.eos_token
+            self._batcher = _BatchScheduler(self._run_batch, max_batch, wait_ms)
+            log.info("[HF] continuous batching enabled (max_batch=%d, wait_ms=%s)", max_batch, wait_ms)
+
     def generate(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any]) -> str:
         p = self.cfg.get("generation", {}).copy()
         p.update(gen_params or {})
@@ -44,18 +158,47 @@ class HFBackend(IBackend):
             # fallback
             rendered = "\n".join([f"{m['role']}: {m['content']}" for m in messages]) + "\nassistant:"
 
-        gen_kwargs = dict(
-            max_new_tokens=int(p.get("max_new_tokens", 512)),
-            return_full_text=False,
-            do_sample=bool(p.get("do_sample", True)),
-            temperature=float(p.get("temperature", 0.7)),
-            top_p=float(p.get("top_p", 0.9))
+        key = (
+            int(p.get("max_new_tokens", 512)),
+            bool(p.get("do_sample", True)),
+            float(p.get("temperature", 0.7)),
+            float(p.get("top_p", 0.9)),
         )
-        if getattr(self, "eos_id", None) is not None:
-            gen_kwargs.update(eos_token_id=self.eos_id, pad_token_id=self.eos_id)
+        if self._batcher is not None:
+            return self._batcher.submit(rendered, key).result()
 
+        gen_kwargs = dict(self._gen_kwargs(key), return_full_text=False)
         out = self.pipe(rendered, **gen_kwargs)[0]["generated_text"]
         return (out or "").strip()
 
+    def _gen_kwargs(self, key: Tuple) -> Dict[str, Any]:
+        max_new_tokens, do_sample, temperature, top_p = key
+        gen_kwargs = dict(max_new_tokens=max_new_tokens, do_sample=do_sample,
+                          temperature=temperature, top_p=top_p)
+        if getattr(self, "eos_id", None) is not None:
+            gen_kwargs.update(eos_token_id=self.eos_id, pad_token_id=self.eos_id)
+        return gen_kwargs
+
+    def _run_batch(self, prompts: List[str], key: Tuple) -> List[str]:
+        """배치 스레드 전용: left-pad 된 프롬프트 묶음을 generate 1회로 처리"""
+        tok, mdl = self.pipe.tokenizer, self.pipe.model
+        # chat template 렌더 결과에 이미 BOS 등 특수 토큰이 포함됨
+        enc = tok(prompts, return_tensors="pt", padding=True, add_special_tokens=False).to(mdl.device)
+        with torch.inference_mode():
+            out = mdl.generate(**enc, **self._gen_kwargs(key))
+        new_tokens = out[:, enc["input_ids"].shape[1]:]
+        return [t.strip() for t in tok.batch_decode(new_tokens, skip_special_tokens=True)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batching": self._batcher.stats()} if self._batcher is not None else {}
+
+    def count_tokens(self, text: str) -> Optional[int]:
+        if self.pipe is None:
+            return None
+        return len(self.pipe.tokenizer.encode(text or "", add_special_tokens=False))
+
     def close(self) -> None:
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
         self.pipe = None
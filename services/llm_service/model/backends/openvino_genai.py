@@ -1,9 +1,13 @@
 # model/backends/openvino_genai.py
 import os
+import re
+import time
+import queue
+import hashlib
 import logging
 import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 
 from huggingface_hub import snapshot_download, login
 from openvino_genai import LLMPipeline, GenerationConfig
@@ -20,6 +24,7 @@ except Exception:
         _OV_CORE_AVAILABLE = False
 
 from .base import IBackend
+from .. import cancellation
 
 
 class OVGenAIBackend(IBackend):
@@ -29,14 +34,23 @@ class OVGenAIBackend(IBackend):
     - HUGGINGFACE_TOKEN만 .env에서 읽음(선택)
     - NPU 우선(device="AUTO:NPU,CPU"), 실패/부재 시 CPU 폴백
     - HF 레포가 IR(OpenVINO) 형식이면 변환 없이 그대로 사용
+    - 컴파일 결과를 CACHE_DIR(<cache>/ov_compiled/<모델해시>_<디바이스>)에 보관 → 재시작 시 재컴파일 생략
+    - load_params.pool_size(env OV_PIPELINE_POOL)개의 파이프라인을 풀로 운용 (슬롯마다 모델 메모리 별도 사용)
     """
 
     def __init__(self, cfg: dict, env):
         self.cfg = cfg or {}
         self.env = env
-        self._lock = threading.Lock()
-        self._pipe: Optional[LLMPipeline] = None
+        self._lock = threading.Lock()  # 풀 구성/교체용
+        self._pool: "queue.Queue[LLMPipeline]" = queue.Queue()
+        self._pool_size = 0
+        self._device: Optional[str] = None
         self._model_dir: Optional[Path] = None
+        self._startup: Dict[str, Any] = {}
+        self._gen_stats = {"requests": 0, "busy_waits": 0, "fallbacks": 0, "wait_timeouts": 0}
+        self._stats_lock = threading.Lock()
+        # 풀 대기 상한(초) — 슬롯이 모두 사용 중일 때 무한 대기 방지
+        self._pool_wait_s = float(self.env.get("OV_POOL_WAIT_S") or 60)
 
         self.log = logging.getLogger("ov_genai")
         if not self.log.handlers:
@@ -164,6 +178,38 @@ class OVGenAIBackend(IBackend):
         except Exception as e:
             self.log.warning(f"[OV] Failed to query available_devices: {e!r}")
 
+    def _model_hash(self) -> str:
+        """IR xml 내용 + bin 크기/수정시각 기반 해시 (모델이 바뀌면 캐시 디렉터리도 바뀜)"""
+        h = hashlib.sha1()
+        xml = self._model_dir / "openvino_model.xml"
+        binf = self._model_dir / "openvino_model.bin"
+        if xml.exists():
+            h.update(xml.read_bytes())
+        if binf.exists():
+            st = binf.stat()
+            h.update(f"{st.st_size}:{int(st.st_mtime)}".encode())
+        return h.hexdigest()[:16]
+
+    def _compile_cache_dir(self, device: str) -> Path:
+        dev = re.sub(r"[^A-Za-z0-9]+", "_", device).strip("_") or "default"
+        path = self._resolve_cache() / "ov_compiled" / f"{self._model_hash()}_{dev}"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _new_pipeline(self, device: str) -> LLMPipeline:
+        """CACHE_DIR 지정 후 파이프라인 생성 (+ load_params.pipeline_properties 패스스루, 예: NPU MAX_PROMPT_LEN)"""
+        loadp = self._get(self.cfg, "load_params", {}) or {}
+        props = dict(loadp.get("pipeline_properties") or {})
+        cache_dir = self._compile_cache_dir(device)
+        warm = any(cache_dir.iterdir())
+        t0 = time.perf_counter()
+        pipe = LLMPipeline(self._model_dir.as_posix(), device, CACHE_DIR=cache_dir.as_posix(), **props)
+        sec = round(time.perf_counter() - t0, 3)
+        self._startup.setdefault("compile_seconds", []).append(sec)
+        self._startup.update(cache_dir=cache_dir.as_posix(), cache_warm=warm)
+        self.log.info(f"[OV] LLMPipeline compiled on '{device}' in {sec}s (cache={'hit' if warm else 'cold'})")
+        return pipe
+
     def _build_pipeline(self):
         model = self._get(self.cfg, "model", {})
         loadp = self._get(self.cfg, "load_params", {})
@@ -190,27 +236,51 @@ class OVGenAIBackend(IBackend):
 
         self.log.info(f"[OV] Loading LLMPipeline from: {self._model_dir.as_posix()}")
 
+        pool_size = max(1, int(os.getenv("OV_PIPELINE_POOL") or self._get(loadp, "pool_size", 1) or 1))
+        t0 = time.perf_counter()
+
         # 컴파일(로드) 시도 + 장치 폴백(장치 관련 실패 시)
         try:
-            self._pipe = LLMPipeline(self._model_dir.as_posix(), device)
+            first = self._new_pipeline(device)
+            self._device = device
             self.log.info(f"[OV] LLMPipeline ready on device='{device}'")
         except Exception as e:
             self.log.warning(f"[OV] Pipeline build failed on '{device}', reason={e!r}")
             # 장치 이슈일 수 있으니 CPU로 1회 폴백 시도
             # (그래프/IR 자체 shape 오류면 CPU도 실패할 수 있음)
             try:
-                self._pipe = LLMPipeline(self._model_dir.as_posix(), "CPU")
+                first = self._new_pipeline("CPU")
+                self._device = "CPU"
                 self.log.info("[OV] LLMPipeline ready on device='CPU' (fallback)")
             except Exception as e2:
                 self.log.error(f"[OV] Pipeline build failed on CPU as well. reason={e2!r}")
                 raise  # 더 이상 진행 불가 → 예외 전파
 
+        self._pool.put(first)
+        # 나머지 슬롯은 첫 컴파일이 채운 캐시를 재사용
+        for _ in range(pool_size - 1):
+            self._pool.put(self._new_pipeline(self._device))
+        self._pool_size = pool_size
+        self._startup.update(device=self._device, pool_size=pool_size,
+                             startup_seconds=round(time.perf_counter() - t0, 3))
+        self.log.info(f"[OV] pipeline pool ready: size={pool_size}, startup={self._startup['startup_seconds']}s")
+
     def warmup(self) -> None:
-        if self._pipe is None:
-            self._build_pipeline()
+        with self._lock:
+            if self._pool_size == 0:
+                self._build_pipeline()
 
     def close(self) -> None:
-        self._pipe = None
+        with self._lock:
+            while not self._pool.empty():
+                self._pool.get_nowait()
+            self._pool_size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            gen_stats = dict(self._gen_stats)
+        return {"startup": dict(self._startup), "pool_available": self._pool.qsize(),
+                "pool_size": self._pool_size, **gen_stats}
 
     # ---------- generation ----------
     def _gen_cfg_from(self, overrides: Dict[str, Any]) -> GenerationConfig:
@@ -230,7 +300,41 @@ class OVGenAIBackend(IBackend):
         # stop 문자열은 OV GenAI 파이프라인에서 별도 인자로 처리하지 않음(룰 레벨에서 컷)
 
     def generate(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any]) -> str:
-        if self._pipe is None:
+        return self._generate(messages, gen_params)
+
+    def generate_stream(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any],
+                        on_piece: Callable[[str], bool]) -> str:
+        return self._generate(messages, gen_params, on_piece)
+
+    def _bump_stat(self, key: str) -> None:
+        with self._stats_lock:
+            self._gen_stats[key] += 1
+
+    def _acquire_pipeline(self) -> "LLMPipeline":
+        """
+        풀에서 파이프라인 대여
+        - 비어 있으면 짧은 간격으로 대기하며 요청 취소/데드라인 확인 (RequestCancelled)
+        - OV_POOL_WAIT_S(또는 남은 데드라인) 안에 못 빌리면 TimeoutError
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            self._bump_stat("busy_waits")
+        deadline = time.monotonic() + cancellation.bounded_timeout(self._pool_wait_s)
+        while True:
+            cancellation.check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._bump_stat("wait_timeouts")
+                raise TimeoutError(f"[OV] no free pipeline within {self._pool_wait_s:g}s (pool_size={self._pool_size})")
+            try:
+                return self._pool.get(timeout=min(0.25, remaining))
+            except queue.Empty:
+                continue
+
+    def _generate(self, messages, gen_params: Dict[str, Any],
+                  on_piece: Optional[Callable[[str], bool]] = None) -> str:
+        if self._pool_size == 0:
             self.warmup()
 
         cfg = self._gen_cfg_from(gen_params or {})
@@ -245,16 +349,32 @@ class OVGenAIBackend(IBackend):
             # 방어: 알 수 없는 입력
             prompt = str(messages)
 
-        with self._lock:
-            try:
-                out = self._pipe.generate(prompt, cfg)
+        def _run(pipe) -> str:
+            if on_piece is None:
+                out = pipe.generate(prompt, cfg)
                 return (out if isinstance(out, str) else str(out)).strip()
-            except Exception as e:
-                self.log.warning(f"[OV] Generation failed on current device; fallback to CPU. reason={e!r}")
-                try:
-                    self._pipe = LLMPipeline(self._model_dir.as_posix(), "CPU")
-                    out = self._pipe.generate(prompt, cfg)
-                    return (out if isinstance(out, str) else str(out)).strip()
-                except Exception as e2:
-                    self.log.error(f"[OV] Generation failed on CPU fallback. reason={e2!r}")
-                    raise
+            pieces: List[str] = []
+
+            def _streamer(sub: str) -> bool:
+                pieces.append(sub)
+                return bool(on_piece(sub))  # True → 디코딩 중단
+
+            pipe.generate(prompt, cfg, _streamer)
+            return "".join(pieces).strip()
+
+        # 풀에서 파이프라인 1개를 빌려 사용 (파이프라인 자체는 스레드 안전하지 않음)
+        self._bump_stat("requests")
+        pipe = self._acquire_pipeline()
+        try:
+            return _run(pipe)
+        except Exception as e:
+            self.log.warning(f"[OV] Generation failed on current device; fallback to CPU. reason={e!r}")
+            self._bump_stat("fallbacks")
+            try:
+                pipe = self._new_pipeline("CPU")
+                return _run(pipe)
+            except Exception as e2:
+                self.log.error(f"[OV] Generation failed on CPU fallback. reason={e2!r}")
+                raise
+        finally:
+            self._pool.put(pipe)
@@ -0,0 +1,133 @@
+# services/llm_service/model/cancellation.py
+import time
+import select
+import socket
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestCancelled(BaseException):
+    """
+    요청 취소/데드라인 초과
+    - 오케스트레이터의 `except Exception` 폴백 경로에 삼켜지지 않도록 BaseException 상속
+      (asyncio.CancelledError와 같은 이유)
+    """
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    """
+    협조적 취소 토큰
+    - cancel(): 외부(연결 종료/데드라인)에서 취소 요청
+    - cancelled: 데드라인이 지났으면 자동 취소로 간주
+    - check(): 취소됐으면 RequestCancelled
+    """
+    def __init__(self, deadline_s: Optional[float] = None):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+        self.deadline = (time.monotonic() + float(deadline_s)) if deadline_s else None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline exceeded")
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise RequestCancelled(self.reason or "cancelled")
+
+
+# 현재 요청의 토큰 (워커 스레드에서 bind) — 하위 호출부에 인자로 넘기지 않아도 됨
+_current: ContextVar[Optional[CancelToken]] = ContextVar("llm_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+def check() -> None:
+    tok = _current.get()
+    if tok is not None:
+        tok.check()
+
+
+def bounded_timeout(timeout: float) -> float:
+    """HTTP 타임아웃 등을 남은 데드라인 이하로 제한"""
+    tok = _current.get()
+    rem = tok.remaining() if tok is not None else None
+    return timeout if rem is None else max(0.1, min(timeout, rem))
+
+
+@contextmanager
+def bind(token: Optional[CancelToken]):
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+# 상대의 쓰기 종료(FIN) 알림 — Linux poll 전용
+_POLLRDHUP = getattr(select, "POLLRDHUP", 0) if hasattr(select, "poll") else 0
+
+
+@contextmanager
+def cancel_on_disconnect(sock, token: CancelToken, interval_s: float = 0.2):
+    """
+    블록 실행 동안 클라이언트 소켓을 감시, 상대가 연결을 닫으면 token.cancel("client disconnected")
+    - Linux: poll(POLLRDHUP)로 상대 종료만 감시 → 미수신 바이트(keep-alive 다음 요청, 읽지 않은 본문)가 있어도 감지
+    - 그 외(Windows 등): select + MSG_PEEK로 EOF 확인 (바이트는 소비하지 않음)
+      미수신 바이트가 있으면 select가 즉시 반환하므로 interval_s만큼 쉬고 다시 확인 (바쁜 반복 방지)
+      → 이 경우 바이트가 남아 있는 동안은 종료를 감지하지 못함
+    - 일반 socket이 아니면(TLS 래핑, 미지원 서버) 감시하지 않음
+    """
+    if type(sock) is not socket.socket:
+        yield token
+        return
+    done = threading.Event()
+
+    def _watch_rdhup():
+        poller = select.poll()
+        poller.register(sock, _POLLRDHUP | select.POLLHUP | select.POLLERR)
+        while not done.is_set() and not token.cancelled:
+            if poller.poll(int(interval_s * 1000)):
+                token.cancel("client disconnected")
+                return
+
+    def _watch_peek():
+        while not done.is_set() and not token.cancelled:
+            readable, _, _ = select.select([sock], [], [], interval_s)
+            if readable:
+                if not sock.recv(1, socket.MSG_PEEK):
+                    token.cancel("client disconnected")
+                    return
+                done.wait(interval_s)
+
+    def _watch():
+        try:
+            (_watch_rdhup if _POLLRDHUP else _watch_peek)()
+        except (OSError, ValueError):
+            return
+
+    t = threading.Thread(target=_watch, name="llm-disconnect-watch", daemon=True)
+    t.start()
+    try:
+        yield token
+    finally:
+        done.set()
+        t.join(interval_s * 2)
@@ -80,5 +80,21 @@ def load_config(env: os._Environ) -> dict:
     cfg.setdefault("generation", {})
     cfg.setdefault("policy", {})
     cfg.setdefault("multiturn", {})
+    cfg["speculative"] = _speculative_config(cfg.get("speculative") or {}, env)
 
     return cfg
+
+def _speculative_config(spec: Dict[str, Any], env) -> Dict[str, Any]:
+    """
+    추측 디코딩(speculative decoding) 설정
+    - params.json "speculative": {"mode": "off"|"prompt_lookup", "num_pred_tokens": 10, "max_ngram_size": 2}
+    - env LLM_SPECULATIVE 로 mode 오버라이드 (예: 벤치마크 on/off 비교)
+    """
+    out = dict(spec)
+    mode = _sanitize_path(env.get("LLM_SPECULATIVE") or "").lower()
+    if mode:
+        out["mode"] = mode
+    out["mode"] = str(out.get("mode") or "off").lower()
+    out["num_pred_tokens"] = int(out.get("num_pred_tokens", 10))
+    out["max_ngram_size"] = int(out.get("max_ngram_size", 2))
+    return out
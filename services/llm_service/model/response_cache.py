@@ -0,0 +1,159 @@
+# services/llm_service/model/response_cache.py
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger("response_cache")
+
+# 생성 이후 단계(_postprocess)에서만 쓰이는 키 → 캐시 키에서 제외
+# (enforce_max_* 는 스트리밍 조기 중단으로 원문 자체가 달라지므로 키에 포함)
+_POSTPROCESS_KEYS = {"force_suffix"}
+
+
+def is_deterministic(params: Dict[str, Any]) -> bool:
+    """
+    같은 프롬프트 → 같은 답이 보장되는 샘플링인지
+    - do_sample=False / temperature<=0 / top_k==1 이면 greedy
+    - do_sample=True를 명시하면 top_k==1일 때만 결정적 (temperature 값과 무관하게 샘플링)
+    """
+    if params.get("do_sample") is False:
+        return True
+    try:
+        if params.get("do_sample") is True:
+            return int(params.get("top_k", 0) or 0) == 1
+        if float(params.get("temperature", 1.0)) <= 0:
+            return True
+        if int(params.get("top_k", 0) or 0) == 1:
+            return True
+    except (TypeError, ValueError):
+        return False
+    return False
+
+
+class ResponseCache:
+    """
+    결정적(greedy) 생성 결과 캐시 (content-addressed)
+    - key = sha256(backend, model, 샘플링 파라미터, 최종 메시지 배열)
+    - 메모리 tier: LRU, max_entries / TTL
+    - 디스크 tier(선택): <disk_dir>/<key[:2]>/<key>.json — 재시작 후에도 재사용
+    """
+    def __init__(self, max_entries: int, ttl_s: float, disk_dir: str = ""):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self.disk_dir = Path(disk_dir).resolve() if disk_dir else None
+        self._lock = threading.Lock()
+        self._mem: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypass": 0, "stores": 0}
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def make_key(self, backend: str, model: Dict[str, Any], params: Dict[str, Any],
+                 messages: List[Dict[str, str]]) -> str:
+        payload = {
+            "backend": backend,
+            "model": model,
+            "params": {k: v for k, v in params.items() if k not in _POSTPROCESS_KEYS},
+            "messages": [[m.get("role"), m.get("content")] for m in messages],
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _expired(self, ts: float) -> bool:
+        return self.ttl_s > 0 and (time.time() - ts) > self.ttl_s
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypass"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            ent = self._mem.get(key)
+            if ent is not None:
+                if not self._expired(ent[0]):
+                    self._mem.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return ent[1]
+                del self._mem[key]
+
+        if self.disk_dir is not None:
+            p = self._disk_path(key)
+            try:
+                data = json.loads(p.read_text(encoding="utf-8"))
+                if not self._expired(float(data["ts"])):
+                    self._put_mem(key, float(data["ts"]), data["answer"])
+                    with self._lock:
+                        self._stats["disk_hits"] += 1
+                    return data["answer"]
+                p.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log.debug("disk cache read failed (%s): %s", p, e)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def _put_mem(self, key: str, ts: float, answer: str) -> None:
+        with self._lock:
+            self._mem[key] = (ts, answer)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def put(self, key: str, answer: str) -> None:
+        ts = time.time()
+        self._put_mem(key, ts, answer)
+        with self._lock:
+            self._stats["stores"] += 1
+        if self.disk_dir is not None:
+            p = self._disk_path(key)
+            try:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                tmp = p.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"ts": ts, "answer": answer}, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, p)
+            except Exception as e:
+                log.warning("disk cache write failed (%s): %s", p, e)
+
+    def clear(self) -> int:
+        with self._lock:
+            n = len(self._mem)
+            self._mem.clear()
+        if self.disk_dir is not None:
+            for p in self.disk_dir.glob("*/*.json"):
+                p.unlink(missing_ok=True)
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._mem),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+                **self._stats,
+            }
+
+
+def response_cache_from_env(env) -> ResponseCache:
+    """.env 로드 이후(라우터 생성 시점)에 호출할 것"""
+    return ResponseCache(
+        max_entries=int(env.get("LLM_RESPONSE_CACHE_SIZE", "256") or 0),
+        ttl_s=float(env.get("LLM_RESPONSE_CACHE_TTL_S", "3600") or 0),
+        disk_dir=(env.get("LLM_RESPONSE_CACHE_DIR") or "").strip(),
+    )
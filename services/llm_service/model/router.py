@@ -1,12 +1,19 @@
 # services/llm_service/model/router.py
-import re
-from typing import List, Dict, Any
+import os
+import logging
+from typing import List, Dict, Any, Tuple
 
 from .prompts import render_messages
 from .backends.gguf_llamacpp import GGUFBackend
 from .backends.hf_transformers import HFBackend
 from .backends.openvino_genai import OVGenAIBackend
 from ..chains.base_chat_chain import build_base_chat_chain  # LCEL 체인
+from ..chains.prompt_budget import PromptAssembler
+from .response_cache import is_deterministic, response_cache_from_env
+from .stream_cut import StreamCutter, cut_text
+from . import cancellation
+
+log = logging.getLogger("model_router")
 
 
 class ModelRouter:
@@ -15,17 +22,19 @@ class ModelRouter:
     - generate(): 문자열 입력 -> 문자열 출력(호환)
     - generate_messages(): 역할 메시지 배열을 직접 전달(LCEL 우회)
     - generate_structured(): LCEL 구조화 응답(dict) 반환
+    - 결정적 샘플링(greedy)일 때 백엔드 호출은 응답 캐시를 거침
     """
     def __init__(self, backend, cfg: dict):
         self._backend = backend
         self._cfg = cfg
         self._backend.warmup()
+        # 프롬프트 토큰 예산(백엔드 토크나이저 우선, 미지원 시 글자 수 근사)
+        self._assembler = PromptAssembler(cfg, getattr(self._backend, "count_tokens", None))
+        self._resp_cache = response_cache_from_env(os.environ)
         self._chain = self._build_chain()
 
     def _build_chain(self):
-        def _backend_generate(messages, gen_params):
-            return self._backend.generate(messages, gen_params or {})
-        return build_base_chat_chain(_backend_generate, self._cfg)
+        return build_base_chat_chain(self._generate_cached, self._cfg, assembler=self._assembler)
 
     @classmethod
     def from_config(cls, cfg: dict, env) -> "ModelRouter":
@@ -48,42 +57,86 @@ class ModelRouter:
     def model_name(self) -> str:
         return self._cfg.get("name", "unknown")
 
-    # ✅ 고정 길이 look-behind만 사용 (영/한 문장부호 뒤 공백)
-    _SENT_SPLIT = re.compile(r'(?<=[.!?。！？])\s+')
+    def backend_stats(self) -> Dict[str, Any]:
+        """백엔드 계측치(tokens/sec, 드래프트 수락률 등). 미지원 백엔드는 빈 dict"""
+        fn = getattr(self._backend, "stats", None)
+        return fn() if callable(fn) else {}
 
-    def _postprocess(self, text: str, overrides: Dict[str, Any] | None = None) -> str:
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._resp_cache.stats()
+
+    def _generate_cached(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any] | None) -> str:
         """
-        요청별 overrides 우선 적용:
-          - enforce_max_lines: 줄 수 컷
-          - enforce_max_sentences: 문장 수 컷
-          - enforce_max_chars: 글자 수 컷
-          - force_suffix: 각 줄 접미사
-        순서: 글자 컷 -> 문장 컷 -> 줄 컷 -> 접미사
+        백엔드 호출 단일 지점
+        - 실효 샘플링(cfg.generation + 요청 override)이 결정적일 때만 캐시 조회/저장
+        - key: backend, model, 샘플링 파라미터, 최종(예산 적용 후) 메시지 배열
+        """
+        gen_params = gen_params or {}
+        cancellation.check()
+        if not self._resp_cache.enabled:
+            return self._backend_call(messages, gen_params)
+        params = {**(self._cfg.get("generation") or {}), **gen_params}
+        if not is_deterministic(params):
+            self._resp_cache.note_bypass()
+            return self._backend_call(messages, gen_params)
+
+        key = self._resp_cache.make_key(self.backend_name, self._cfg.get("model") or {}, params, messages)
+        hit = self._resp_cache.get(key)
+        if hit is not None:
+            log.debug("[CACHE] response hit %s", key[:12])
+            return hit
+        out = self._backend_call(messages, gen_params)
+        if out:
+            self._resp_cache.put(key, out)
+        return out
+
+    def _backend_call(self, messages: List[Dict[str, str]], gen_params: Dict[str, Any]) -> str:
         """
+        컷 정책(글자/문장/줄)이 있으면 스트리밍으로 생성하면서 결과가 확정되는 즉시 디코딩 중단
+        - 중단 시점 텍스트의 _postprocess 결과는 전체 생성 후 _postprocess 결과와 동일
+        - structured(JSON) 응답은 파싱이 필요하므로 컷 제외
+        - 요청 취소 토큰이 있으면 토큰 단위로 확인해 즉시 중단(백엔드 락 반환) 후 RequestCancelled
+        """
+        cutter = None
+        if not gen_params.get("structured"):
+            max_chars, max_sents, max_lines, _ = self._limits(gen_params)
+            cutter = StreamCutter.from_limits(max_chars, max_sents, max_lines)
+        token = cancellation.current_token()
+        if cutter is None and token is None:
+            return self._backend.generate(messages, gen_params)
+
+        def on_piece(piece: str) -> bool:
+            stop = cutter.feed(piece) if cutter is not None else False
+            return stop or (token is not None and token.cancelled)
+
+        text = self._backend.generate_stream(messages, gen_params, on_piece)
+        if token is not None:
+            token.check()  # 취소로 끊긴 부분 결과는 버림
+        return text
+
+    def _limits(self, overrides: Dict[str, Any] | None) -> Tuple[int, int, int, str]:
+        """(max_chars, max_sents, max_lines, suffix) — 요청 overrides 우선, 없으면 policy"""
         policy = self._cfg.get("policy", {}) or {}
         ovr = overrides or {}
-
         max_chars = int(ovr.get("enforce_max_chars", 0) or 0)
         max_sents = int(ovr.get("enforce_max_sentences", 0) or 0)
         max_lines = int(ovr.get("enforce_max_lines", policy.get("enforce_max_lines", 0) or 0))
         suffix = ovr.get("force_suffix", policy.get("force_suffix", "") or "")
+        return max_chars, max_sents, max_lines, suffix
 
-        text = (text or "").strip()
-
-        # 1) 글자 컷
-        if max_chars > 0 and len(text) > max_chars:
-            text = text[:max_chars].rstrip() + "…"
-
-        # 2) 문장 컷
-        if max_sents > 0:
-            parts = self._SENT_SPLIT.split(text)
-            if len(parts) > max_sents:
-                text = " ".join(parts[:max_sents]).strip()
+    def _postprocess(self, text: str, overrides: Dict[str, Any] | None = None) -> str:
+        """
+        요청별 overrides 우선 적용:
+          - enforce_max_lines: 줄 수 컷
+          - enforce_max_sentences: 문장 수 컷
+          - enforce_max_chars: 글자 수 컷
+          - force_suffix: 각 줄 접미사
+        순서: 글자 컷 -> 문장 컷 -> 줄 컷 -> 접미사
+        """
+        max_chars, max_sents, max_lines, suffix = self._limits(overrides)
 
-        # 3) 줄 컷
-        if max_lines > 0:
-            lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-            text = "\n".join(lines[:max_lines])
+        # 1~3) 글자/문장/줄 컷 (스트리밍 조기 중단과 같은 규칙을 공유)
+        text = cut_text(text, max_chars, max_sents, max_lines)
 
         # 4) 접미사
         if suffix:
@@ -99,7 +152,11 @@ class ModelRouter:
         return self._postprocess(out.get("answer", ""), overrides)
 
     def generate_messages(self, messages: List[Dict[str, str]], overrides: Dict[str, Any] | None = None) -> str:
-        result = self._backend.generate(messages, overrides or {})
+        ovr = overrides or {}
+        fitted, report = self._assembler.fit_messages(messages, ovr.get("max_new_tokens"))
+        log.debug("[PROMPT] tokens=%d/%d sections=%s", report["total"], report["budget"],
+                  {k: v["tokens"] for k, v in report["sections"].items()})
+        result = self._generate_cached(fitted, ovr)
         return self._postprocess(result, overrides)
 
     def generate_structured(self, user_text: str, overrides: Dict[str, Any] | None = None) -> Dict[str, Any]:
@@ -0,0 +1,85 @@
+# services/llm_service/model/stream_cut.py
+import re
+from typing import Optional
+
+# ✅ 고정 길이 look-behind만 사용 (영/한 문장부호 뒤 공백)
+SENT_SPLIT = re.compile(r'(?<=[.!?。！？])\s+')
+# SENT_SPLIT 경계 중 다음 문장이 시작된 것 / 비어있지 않은 다음 줄의 시작
+_SENT_BOUNDARY = re.compile(r'(?<=[.!?。！？])\s+(?=\S)')
+_LINE_START = re.compile(r'\n[ \t\r\f\v]*(?=\S)')
+
+
+def cut_text(text: str, max_chars: int = 0, max_sents: int = 0, max_lines: int = 0) -> str:
+    """
+    ModelRouter._postprocess의 컷 단계 (접미사 제외)
+    순서: 글자 컷 -> 문장 컷 -> 줄 컷
+    """
+    text = (text or "").strip()
+
+    # 1) 글자 컷
+    if max_chars > 0 and len(text) > max_chars:
+        text = text[:max_chars].rstrip() + "…"
+
+    # 2) 문장 컷
+    if max_sents > 0:
+        parts = SENT_SPLIT.split(text)
+        if len(parts) > max_sents:
+            text = " ".join(parts[:max_sents]).strip()
+
+    # 3) 줄 컷
+    if max_lines > 0:
+        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+        text = "\n".join(lines[:max_lines])
+
+    return text
+
+
+class StreamCutter:
+    """
+    스트리밍 토큰을 받으며 cut_text(= ModelRouter._postprocess 컷 단계) 결과가 '확정'되는 시점을 감지
+    - feed(piece) → True 면 백엔드 디코딩 중단
+    - 이후 토큰이 무엇이든 cut_text(누적 텍스트) == cut_text(전체 텍스트) 인 경우에만 중단:
+      1) 글자 컷: 공백 제외 누적 길이가 max_chars 초과
+      2) 문장 컷: 다음 문장이 시작된 경계(문장부호+공백+비공백)가 max_sents개 이상
+      3) 줄 컷(문장 컷 미사용 시만): 비어있지 않은 줄이 max_lines+1개째 시작
+         (문장 컷은 경계의 개행을 공백으로 합치므로 줄 수가 바뀔 수 있음)
+    """
+    def __init__(self, max_chars: int = 0, max_sents: int = 0, max_lines: int = 0):
+        self.max_chars = max_chars
+        self.max_sents = max_sents
+        self.max_lines = max_lines if max_sents <= 0 else 0
+        self._buf = ""
+        self.stopped = False
+
+    @classmethod
+    def from_limits(cls, max_chars: int, max_sents: int, max_lines: int) -> Optional["StreamCutter"]:
+        if max_chars <= 0 and max_sents <= 0 and max_lines <= 0:
+            return None
+        return cls(max_chars, max_sents, max_lines)
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+    def feed(self, piece: str) -> bool:
+        if self.stopped:
+            return True
+        self._buf += piece or ""
+        body = self._buf.strip()
+        if self.max_chars > 0 and len(body) > self.max_chars:
+            self.stopped = True
+        elif self.max_sents > 0 and self._count(_SENT_BOUNDARY, body, self.max_sents) >= self.max_sents:
+            self.stopped = True
+        elif self.max_lines > 0 and self._count(_LINE_START, body, self.max_lines) >= self.max_lines:
+            # body 첫 줄 + 경계 max_lines개 = max_lines+1번째 줄 시작
+            self.stopped = True
+        return self.stopped
+
+    @staticmethod
+    def _count(rx: re.Pattern, text: str, upto: int) -> int:
+        n = 0
+        for _ in rx.finditer(text):
+            n += 1
+            if n >= upto:
+                break
+        return n
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import re
@@ -5,6 +6,8 @@ from typing import List, Optional
 
 from .schemas import OrchestratorInput, OrchestratorOutput
 from . import intent_classifier, local_exec, planner, agent_client  # 사용됨 (Pylance OK)
+from ..model import cancellation
+from ..model.cancellation import CancelToken, RequestCancelled
 
 log = logging.getLogger("orchestrator")
 ilog = logging.getLogger("orchestrator.intent")
@@ -375,6 +378,8 @@ def handle(router, cfg: dict, repo, inp: OrchestratorInput) -> OrchestratorOutpu
             log.info("[PATH] complex query detected, skipping override (external=%s, calc=%s, comparison=%s)", 
                      has_external_entity, intent.wants_calculation, has_comparison)
 
+    cancellation.check()
+
     # 2) 그래프 경로 우선 (태스크 수 기반 토큰 스케일링 적용)
     try:
         if AGENT_ENABLED and _should_use_graph(inp.query):
@@ -416,6 +421,7 @@ def handle(router, cfg: dict, repo, inp: OrchestratorInput) -> OrchestratorOutpu
         log.warning("[GRAPH] orchestration failed → fallback. reason=%s", e)
 
     # 3) 단일 경로 폴백
+    cancellation.check()
     if intent.kind == "guest_base_chat":
         log.info("[PATH] route=guest_base_chat")
         body = local_exec.run_guest_base_chat(router, cfg, inp.query, inp.overrides)
@@ -445,6 +451,7 @@ def handle(router, cfg: dict, repo, inp: OrchestratorInput) -> OrchestratorOutpu
         payload = planner.make_agent_payload(intent, inp.query, inp.usr_id, inp.conv_id, inp.meta.get("session", {}))
         log.info("[AGENT_CALL] payload keys: %s", list(payload.keys()))
         res = agent_client.plan_and_run(payload)
+        cancellation.check()
 
         log.info("[AGENT_RES] response keys: %s", list(res.keys()) if isinstance(res, dict) else type(res).__name__)
         
@@ -537,4 +544,50 @@ def handle(router, cfg: dict, repo, inp: OrchestratorInput) -> OrchestratorOutpu
             answer="기능에 문제가 있습니다. 잠시 후 다시 시도해주세요!",
             route="agent_call_failed",
             meta={"intent": intent.dict(), "error": str(e)}
-        )
\ No newline at end of file
+        )
+
+
+# =========================
+# 비동기 진입점 (협조적 취소)
+# =========================
+async def handle_async(router, cfg: dict, repo, inp: OrchestratorInput,
+                       token: Optional[CancelToken] = None,
+                       deadline_s: Optional[float] = None) -> OrchestratorOutput:
+    """
+    handle()을 워커 스레드에서 실행하고 취소 토큰을 전파한다.
+    - 토큰은 contextvar로 바인딩 → 에이전트 HTTP 호출(타임아웃 제한/재시도 전 확인),
+      그래프 태스크 경계, 백엔드 생성(토큰 단위 stop 콜백)에서 확인
+    - await 취소(클라이언트 연결 종료) 또는 deadline 초과 시 토큰 취소
+      → 워커가 멈출 때까지 기다린 뒤 예외 전파 (백엔드 락/입장 슬롯이 바로 반환되도록)
+    """
+    token = token or CancelToken(deadline_s)
+
+    def _run() -> OrchestratorOutput:
+        with cancellation.bind(token):
+            token.check()
+            return handle(router, cfg, repo, inp)
+
+    fut = asyncio.get_running_loop().run_in_executor(None, _run)
+    try:
+        return await asyncio.wait_for(asyncio.shield(fut), timeout=token.remaining())
+    except asyncio.TimeoutError:
+        token.cancel("deadline exceeded")
+        await asyncio.wait([fut])
+        if not fut.cancelled() and fut.exception() is None:
+            return fut.result()  # 경계 직전에 끝난 경우
+        raise RequestCancelled(token.reason or "deadline exceeded")
+    except asyncio.CancelledError:
+        token.cancel("client disconnected")
+        await asyncio.wait([fut])
+        if not fut.cancelled():
+            fut.exception()  # 워커의 RequestCancelled 회수 (미회수 경고 방지)
+        raise
+
+
+def handle_with_deadline(router, cfg: dict, repo, inp: OrchestratorInput, deadline_s: float,
+                         token: Optional[CancelToken] = None) -> OrchestratorOutput:
+    """
+    동기 호출부(Flask)용: 전체 데드라인을 건 handle_async 실행
+    - token을 넘기면 호출부에서 외부 취소(클라이언트 연결 종료 감시 등)를 걸 수 있음
+    """
+    return asyncio.run(handle_async(router, cfg, repo, inp, token=token, deadline_s=deadline_s))
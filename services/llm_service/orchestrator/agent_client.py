@@ -1,29 +1,105 @@
 # services/llm_service/orchestrator/agent_client.py
-import os, logging, requests
-from typing import Dict, Any
+import os, json, logging, threading, contextvars, requests
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, Optional
+
+from ..model import cancellation
 
 log = logging.getLogger("orchestrator.agent_client")
 
 # 에이전트 서버 기본 포트: 5200
 AGENT_URL = os.getenv("AGENT_SERVICE_URL", "http://localhost:5200")
 
-def plan_and_run(payload: Dict[str, Any], timeout_sec: float | None = None) -> Dict[str, Any]:
+# 전송 방식: http(기본) | local(같은 프로세스의 agent_service 툴 직접 호출) | auto(local 가능하면 local, 아니면 http)
+AGENT_TRANSPORT = os.getenv("AGENT_TRANSPORT", "http").strip().lower()
+
+
+class AgentCallError(RuntimeError):
+    """in-process 호출이 HTTP 4xx/5xx에 해당하는 응답을 낸 경우 (HTTP 경로의 raise_for_status와 동일 취급)"""
+
+
+class HttpTransport:
+    name = "http"
+
+    def call(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        resp = requests.post(f"{AGENT_URL}/v1/agent/plan_and_run", json=payload,
+                             timeout=cancellation.bounded_timeout(timeout))
+        resp.raise_for_status()
+        return resp.json()
+
+
+class LocalTransport:
+    """
+    agent_service의 plan_and_run을 같은 프로세스에서 직접 호출
+    - LLM → agent(HTTP) 네트워크 왕복을 생략 (툴 레지스트리는 최초 호출 시 1회 초기화)
+    - HTTP와 같은 의미를 유지:
+      · 페이로드/응답은 JSON 왕복으로 정규화 (공유 객체 없음, 응답 타입도 HTTP 경로와 동일)
+      · 상태코드 >= 400 이면 예외
+      · 타임아웃: 전용 워커 풀(AGENT_LOCAL_WORKERS)에서 실행, 시간 초과 시 requests.Timeout
+        (툴 호출 자체는 중단할 수 없으므로 워커 수로 동시 실행 상한)
+    """
+    name = "local"
+
+    def __init__(self):
+        from services.agent_service.api import server as agent_server  # 공동 배치일 때만 import 가능
+        agent_server.init_local_runtime()
+        self._server = agent_server
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(os.getenv("AGENT_LOCAL_WORKERS", "4") or 4)),
+                                        thread_name_prefix="agent-local")
+
+    def call(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        body = json.loads(json.dumps(payload))
+        fut = self._pool.submit(contextvars.copy_context().run, self._server.plan_and_run, body)
+        try:
+            out, status = fut.result(timeout=cancellation.bounded_timeout(timeout))
+        except FutureTimeout:
+            fut.cancel()  # 아직 대기 중이면 실행하지 않음
+            raise requests.Timeout(f"local agent call exceeded {timeout:g}s")
+        out = json.loads(json.dumps(out, default=str))
+        if status >= 400:
+            raise AgentCallError(f"{status}: {out.get('error') if isinstance(out, dict) else out}")
+        return out
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """AGENT_TRANSPORT에 따라 1회 결정. local 초기화 실패 시 HTTP로 폴백"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                t = None
+                if AGENT_TRANSPORT in ("local", "auto"):
+                    try:
+                        t = LocalTransport()
+                    except Exception as e:
+                        log.warning("local agent transport unavailable → http fallback: %s", e)
+                _transport = t or HttpTransport()
+                log.info("agent transport=%s", _transport.name)
+    return _transport
+
+
+def plan_and_run(payload: Dict[str, Any], timeout_sec: float | None = None,
+                 transport: Optional[Any] = None) -> Dict[str, Any]:
     """
     - 환경변수로 타임아웃/재시도 제어
       AGENT_HTTP_TIMEOUT(기본 8.0초), AGENT_HTTP_RETRIES(기본 2회)
     - 네트워크 예외에 대해서는 재시도 후 최종 예외 전파
+    - 요청이 취소되면 재시도하지 않고, 타임아웃은 남은 데드라인 이하로 제한
     """
-    url = f"{AGENT_URL}/v1/agent/plan_and_run"
+    tr = transport or get_transport()
     timeout = float(os.getenv("AGENT_HTTP_TIMEOUT", "8.0")) if timeout_sec is None else float(timeout_sec)
     tries = max(1, int(os.getenv("AGENT_HTTP_RETRIES", "2")))
     last_err = None
     for i in range(tries):
+        cancellation.check()
         try:
-            resp = requests.post(url, json=payload, timeout=timeout)
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
+            return tr.call(payload, timeout)
+        except (requests.RequestException, AgentCallError) as e:
             last_err = e
-            log.warning("Agent call failed (try %d/%d): %s", i+1, tries, e)
+            log.warning("Agent call failed via %s (try %d/%d): %s", tr.name, i+1, tries, e)
     # 재시도 끝나면 예외 전파 (상위에서 폴백 처리)
     raise last_err if last_err else RuntimeError("Agent call failed without specific error")
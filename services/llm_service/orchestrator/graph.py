@@ -7,6 +7,7 @@ from langgraph.graph import StateGraph
 from . import intent_classifier, local_exec, planner, agent_client
 from . import _synthesize_from_rag, _extract_rag_blob
 from .intent_classifier import extract_slots_light
+from ..model import cancellation
 
 log = logging.getLogger("orchestrator.graph")
 
@@ -163,13 +164,24 @@ def pick_executor(intent: Dict[str, Any], text: str, usr_id: Optional[str], slot
 # =========================
 
 def plan_tasks(query: str, usr_id: Optional[str]) -> List[Task]:
+    """
+    플랜 캐시 경유 — 분해/분류/실행기 선택 규칙은 로그인 '여부'만 보므로 키는 (질문, bool(usr_id))
+    """
+    return planner.plan_cache.get_or_build(
+        ((query or "").strip(), bool(usr_id)),
+        lambda: _plan_tasks_full(query, usr_id),
+    )
+
+
+def _plan_tasks_full(query: str, usr_id: Optional[str]) -> List[Task]:
     reqs = _split_compound(query)
     tasks: List[Task] = []
     for i, r in enumerate(reqs):
         it = intent_classifier.classify(r, usr_id)
         slots = extract_slots_light(r)  # owner/entity/year/grade/metric/mode/ref 등
-        ex = pick_executor(it.dict(), r, usr_id, slots)
-        tasks.append({"id": f"T{i+1}", "text": r, "intent": it.dict(), "executor": ex, "deps": [], "slots": slots})
+        it_d = it.dict()
+        ex = pick_executor(it_d, r, usr_id, slots)
+        tasks.append({"id": f"T{i+1}", "text": r, "intent": it_d, "executor": ex, "deps": [], "slots": slots})
 
     # 간단 의존성: same_year/previous_task → 직전 태스크에 의존
     for idx, t in enumerate(tasks):
@@ -326,7 +338,8 @@ def build_graph():
     g = StateGraph(OrchestratorState)
 
     def n_plan(s: OrchestratorState) -> OrchestratorState:
-        tasks = plan_tasks(s["query"], s["usr_id"])
+        # run_orchestrator_graph가 미리 계산한 플랜이 있으면 재사용
+        tasks = s["tasks"] or plan_tasks(s["query"], s["usr_id"])
         return {**s, "tasks": tasks}
 
     g.add_node("plan", n_plan)
@@ -334,6 +347,7 @@ def build_graph():
     def n_execute(s: OrchestratorState) -> OrchestratorState:
         results: List[TaskResult] = list(s["results"])
         for t in s["tasks"]:
+            cancellation.check()  # 태스크 경계에서 취소 확인 (RequestCancelled는 아래 except에 잡히지 않음)
             ctx = {
                 "task": t,
                 "router": s["router"], "cfg": s["cfg"], "repo": s["repo"],
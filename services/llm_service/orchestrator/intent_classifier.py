@@ -1,10 +1,25 @@
+import os
 import re
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 from .schemas import Intent, UserDataSlot
 from . import tool_hints
 
 UNIV_NAME_RE = re.compile(r'([가-힣A-Za-z]+대학교)')
 
+# 분류 결과 캐시 크기 (기본 0 = 비활성)
+# - 정규식 규칙만으로 분류 1회가 수 µs라, 캐시 적중 시 Intent 깊은 복사 비용이 더 큼
+#   (tests/bench/bench_intent_classifier.py 기준). 규칙이 무거워질 때만 켤 것
+INTENT_CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "0"))
+
+def _compile_any(keywords) -> "re.Pattern[str]":
+    """
+    키워드 목록 → 단일 alternation 정규식 (import 시 1회 컴파일)
+    - 긴 키워드 우선 정렬: 결과는 '하나라도 포함되는가'만 보므로 any(k in q)와 동일
+    """
+    uniq = sorted({k for k in keywords if k}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in uniq))
+
 def _extract_entity(text: str) -> str | None:
     # "서울대학교의" 같은 소유격/조사 제거
     m = UNIV_NAME_RE.search(text or "")
@@ -28,45 +43,58 @@ def extract_slots_light(query: str) -> dict:
     - ref: same_year|previous_task|none
     """
     q = (query or "").strip()
+    if INTENT_CACHE_SIZE <= 0:
+        return _extract_slots_light_uncached(q)
+    # 캐시된 dict는 공유 객체이므로 호출자에게는 사본을 넘긴다
+    return dict(_extract_slots_light_cached(q))
+
+_YEAR_RE = re.compile(r'(\d{4})\s*년')
+_SLOT_SELF_RE = _compile_any(["내 ", "나의 ", "내의 ", "우리 "])
+_SLOT_GUIDE_RE = _compile_any(["수정", "변경", "방법", "하는 법", "어디서", "페이지", "경로", "버튼", "탭"])
+# if/elif 순서 그대로 평가 (먼저 맞는 지표 우선)
+_SLOT_METRIC_RULES: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("affiliation", _compile_any(["소속대학", "소속 대학", "내 대학", "내 대학교"])),
+    ("cps",         _compile_any(["CPS", "자료구입비", "자료 구입비", "구입비"])),
+    ("lps",         _compile_any(["LPS", "대출", "대출건수", "대출 건수"])),
+    ("vps",         _compile_any(["VPS", "방문", "방문자", "방문 수", "방문수"])),
+    ("score",       _compile_any(["점수", "예측점수", "score", "SCR"])),
+    ("budget",      _compile_any(["예산", "budget", "BGT"])),
+]
+_SLOT_SAME_YEAR_RE = _compile_any(["동일연도", "같은 해", "그 해", "동일 년도"])
+_SLOT_PREV_TASK_RE = _compile_any(["앞의", "이전", "첫번째", "첫 번째"])
+
+def _extract_slots_light_uncached(q: str) -> dict:
     year = None
-    m_y = re.search(r'(\d{4})\s*년', q)
+    m_y = _YEAR_RE.search(q)
     if m_y:
         year = int(m_y.group(1))
 
     grade = None
-    m_g = re.search(r'([1-4])\s*학년', q)
+    m_g = GRADE_RE.search(q)
     if m_g:
         grade = int(m_g.group(1))
 
     # owner/entity
-    explicit_self = any(tok in q for tok in ["내 ", "나의 ", "내의 ", "우리 "])
+    explicit_self = bool(_SLOT_SELF_RE.search(q))
     entity = _extract_entity(q)
     owner = "self" if explicit_self else ("other" if entity else "none")
 
     # mode
-    is_guide = any(k in q for k in ["수정", "변경", "방법", "하는 법", "어디서", "페이지", "경로", "버튼", "탭"])
+    is_guide = bool(_SLOT_GUIDE_RE.search(q))
     mode = "guide" if is_guide else "data"
 
     # metric (얕은 규칙)
     metric = None
-    if any(k in q for k in ["소속대학","소속 대학","내 대학","내 대학교"]):
-        metric = "affiliation"
-    elif any(k in q for k in ["CPS","자료구입비","자료 구입비","구입비"]):
-        metric = "cps"
-    elif any(k in q for k in ["LPS","대출","대출건수","대출 건수"]):
-        metric = "lps"
-    elif any(k in q for k in ["VPS","방문","방문자","방문 수","방문수"]):
-        metric = "vps"
-    elif any(k in q for k in ["점수","예측점수","score","SCR"]):
-        metric = "score"
-    elif any(k in q for k in ["예산","budget","BGT"]):
-        metric = "budget"
+    for name, pat in _SLOT_METRIC_RULES:
+        if pat.search(q):
+            metric = name
+            break
 
     # ref (동일연도/앞의)
     ref = "none"
-    if any(k in q for k in ["동일연도", "같은 해", "그 해", "동일 년도"]):
+    if _SLOT_SAME_YEAR_RE.search(q):
         ref = "same_year"
-    elif any(k in q for k in ["앞의", "이전", "첫번째", "첫 번째"]):
+    elif _SLOT_PREV_TASK_RE.search(q):
         ref = "previous_task"
 
     return {
@@ -79,6 +107,8 @@ def extract_slots_light(query: str) -> dict:
         "ref": ref
     }
 
+_extract_slots_light_cached = lru_cache(maxsize=max(1, INTENT_CACHE_SIZE))(_extract_slots_light_uncached)
+
 # 지표 시소너리(동의어 → 정규화)
 METRIC_ALIASES = {
     "purchase_cost": ["자료구입비", "구입비", "구입 비용", "cps", "CPS"],
@@ -119,14 +149,28 @@ PERSONAL_DATA_PATTERNS = [
 
 AFFILIATION_TOKENS = ["소속대학", "소속 대학", "내 대학", "내 대학교", "나의 대학", "나의 대학교"]
 
+# ---- import 시 1회 컴파일되는 규칙 오토마톤 ----
+_PERSONAL_DATA_RES = [re.compile(p) for p in PERSONAL_DATA_PATTERNS]
+_AFFILIATION_RE = _compile_any(AFFILIATION_TOKENS)
+_AFFILIATION_LOOSE_RE = re.compile(r"(내|나의).*(대학|대학교)")
+_SELF_RE = _compile_any(SELF_TOKENS)
+_PERSONAL_METRIC_RE = _compile_any(["점수", "예측점수", "자료구입비", "대출", "방문"])
+_COMPLEX_CONJ_RE = _compile_any(CONJ_TOKENS + [",", " 과 ", " 와 "])
+_COMPLEX_CALC_RE = _compile_any(["비교", "차이", "동일", "같은", "vs", "대비"])
+_CALC_TRIGGERS_RE = _compile_any(CALC_TRIGGERS)
+_CONJ_RE = _compile_any(CONJ_TOKENS)
+_METRIC_ALIAS_RES = [(canon, _compile_any(aliases)) for canon, aliases in METRIC_ALIASES.items()]
+# 복수 지표 판단용: 별칭 문자열 각각(중복 제거)의 포함 여부를 센다
+_ALL_METRIC_ALIASES = list(dict.fromkeys(a for aliases in METRIC_ALIASES.values() for a in aliases))
+
 def _is_affiliation_query(q: str) -> bool:
     qn = (q or "").strip()
     if not qn:
         return False
-    if any(tok in qn for tok in AFFILIATION_TOKENS):
+    if _AFFILIATION_RE.search(qn):
         return True
     # "내 + (대학|대학교)?" 패턴도 허용
-    return bool(re.search(r"(내|나의).*(대학|대학교)", qn))
+    return bool(_AFFILIATION_LOOSE_RE.search(qn))
 
 def _is_personal_data_query(q: str) -> bool:
     """확장된 개인 데이터 패턴 인식"""
@@ -138,14 +182,13 @@ def _is_personal_data_query(q: str) -> bool:
         return True
     
     # 새로운 패턴들
-    for pattern in PERSONAL_DATA_PATTERNS:
-        if re.search(pattern, q):
+    for pattern in _PERSONAL_DATA_RES:
+        if pattern.search(q):
             return True
     
     # "내/나의" + 지표 조합
-    if any(self_word in q for self_word in SELF_TOKENS):
-        metrics = ["점수", "예측점수", "자료구입비", "대출", "방문"]
-        if any(metric in q for metric in metrics):
+    if _SELF_RE.search(q):
+        if _PERSONAL_METRIC_RE.search(q):
             return True
     
     return False
@@ -156,38 +199,40 @@ def _has_complex_structure(q: str) -> bool:
         return False
     
     # 연결사 존재
-    if any(conj in q for conj in CONJ_TOKENS + [",", " 과 ", " 와 "]):
+    if _COMPLEX_CONJ_RE.search(q):
         return True
     
     # 비교/계산 키워드
-    if any(calc in q for calc in ["비교", "차이", "동일", "같은", "vs", "대비"]):
+    if _COMPLEX_CALC_RE.search(q):
         return True
     
     # 복수 엔티티 (내 것 + 타 대학)
-    has_self = any(tok in q for tok in SELF_TOKENS)
-    has_other = bool(_extract_entity(q))
-    if has_self and has_other:
+    has_self = bool(_SELF_RE.search(q))
+    if has_self and _extract_entity(q):
         return True
     
-    # 여러 지표/학년 언급
-    grade_count = len(re.findall(r'([1-4])\s*학년', q))
-    metric_count = sum(1 for metric_list in METRIC_ALIASES.values() 
-                      for metric in metric_list if metric in q)
-    
-    if grade_count > 1 or metric_count > 1:
+    # 여러 지표/학년 언급 (2개 이상이면 충분하므로 조기 종료)
+    if _count_upto(GRADE_RE.finditer(q), 2) > 1:
+        return True
+    if _count_upto((a for a in _ALL_METRIC_ALIASES if a in q), 2) > 1:
         return True
     
     return False
 
+def _count_upto(it, limit: int) -> int:
+    n = 0
+    for _ in it:
+        n += 1
+        if n >= limit:
+            break
+    return n
+
 def _contains_any(text: str, keywords: List[str]) -> bool:
     return any(k in text for k in keywords)
 
 def _normalize_metrics(text: str) -> List[str]:
-    hits = []
-    for canon, aliases in METRIC_ALIASES.items():
-        if _contains_any(text, aliases):
-            hits.append(canon)
-    return list(dict.fromkeys(hits))  # 중복 제거/순서 유지
+    # canon 순서 유지, 지표별 1회 정규식 스캔
+    return [canon for canon, pat in _METRIC_ALIAS_RES if pat.search(text)]
 
 def _extract_grades(text: str) -> List[int]:
     return [int(m.group(1)) for m in GRADE_RE.finditer(text)]
@@ -207,8 +252,24 @@ def _extract_universities(text: str) -> List[str]:
     return list(dict.fromkeys(cleaned))
 
 def classify(query: str, usr_id: str | None) -> Intent:
+    """
+    의도 분류 (정규화된 질의 + 로그인 여부 기준 LRU 캐시)
+    - 분류 규칙은 usr_id의 '유무'만 보므로 캐시 키에는 bool(usr_id)만 사용
+    - 캐시된 Intent는 공유 객체이므로 깊은 복사본을 반환
+    """
     q = (query or "").strip()
+    if INTENT_CACHE_SIZE <= 0:
+        return _classify_uncached(q, bool(usr_id))
+    return _classify_cached(q, bool(usr_id)).copy(deep=True)
 
+def classify_cache_info():
+    """캐시 적중/미스 통계 (functools.lru_cache CacheInfo)"""
+    return {
+        "classify": _classify_cached.cache_info()._asdict(),
+        "slots": _extract_slots_light_cached.cache_info()._asdict(),
+    }
+
+def _classify_uncached(q: str, usr_id: bool) -> Intent:
     # 서비스 이용/네비 → RAG
     if tool_hints.detect_usage_guide(q):
         return Intent(
@@ -275,13 +336,13 @@ def classify(query: str, usr_id: str | None) -> Intent:
     grades  = _extract_grades(q)
     univs   = _extract_universities(q)
 
-    wants_calc = _contains_any(q, CALC_TRIGGERS)
-    has_conj   = _contains_any(q, CONJ_TOKENS)
+    wants_calc = bool(_CALC_TRIGGERS_RE.search(q))
+    has_conj   = bool(_CONJ_RE.search(q))
 
     if not usr_id:
         return Intent(kind="guest_base_chat", reason="no_user_session")
 
-    explicit_self = _contains_any(q, SELF_TOKENS)
+    explicit_self = bool(_SELF_RE.search(q))
     implied_self  = (not explicit_self) and (not univs) and (metrics != []) and (grades != [])
 
     slots: List[UserDataSlot] = []
@@ -328,4 +389,6 @@ def classify(query: str, usr_id: str | None) -> Intent:
         return Intent(kind="base_chat", reason="metric mentioned but self unclear",
                       user_slots=slots, wants_calculation=wants_calc)
 
-    return Intent(kind="base_chat", reason="general chat")
\ No newline at end of file
+    return Intent(kind="base_chat", reason="general chat")
+
+_classify_cached = lru_cache(maxsize=max(1, INTENT_CACHE_SIZE))(_classify_uncached)
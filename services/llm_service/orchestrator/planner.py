@@ -1,7 +1,81 @@
 # services/llm_service/orchestrator/planner.py
-from typing import Dict, Any
+import os
+import copy
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
 from .schemas import Intent
 
+log = logging.getLogger("orchestrator.planner")
+
+
+class PlanCache:
+    """
+    그래프 플랜 캐시
+    - 플랜(분해 → 분류 → 슬롯 → 실행기)은 (질문 텍스트, 로그인 여부)만의 순수 함수
+      → 같은 키면 휴리스틱 플래너를 다시 돌리지 않고 저장된 플랜을 복사해 반환
+    - 새로운 형태의 질문만 build_fn(전체 플래너)으로 계산
+    - (의도, 개체) → 플랜 템플릿 매핑이 아닌 질문 텍스트 키: 의도/슬롯을 얻으려면 분해·분류·슬롯 추출을
+      먼저 돌려야 하고 그게 플랜 비용의 대부분이라 템플릿 조회로는 남는 절감이 실행기 선택뿐
+    - stats: hits/misses/hit_ratio, 미스 시 평균 계획 시간
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = max(0, int(maxsize))
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "plan_ms_total": 0.0}
+
+    def get_or_build(self, key: Hashable, build_fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        if self.maxsize:
+            with self._lock:
+                plan = self._plans.get(key)
+                if plan is not None:
+                    self._plans.move_to_end(key)
+                    self._stats["hits"] += 1
+            if plan is not None:
+                out = copy.deepcopy(plan)
+                log.info("[PLAN] cache=hit time=%.2fms hit_ratio=%.2f",
+                         (time.perf_counter() - t0) * 1000, self.hit_ratio())
+                return out
+
+        plan = build_fn()
+        ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["plan_ms_total"] += ms
+            if self.maxsize:
+                self._plans[key] = copy.deepcopy(plan)
+                while len(self._plans) > self.maxsize:
+                    self._plans.popitem(last=False)
+        log.info("[PLAN] cache=miss time=%.2fms hit_ratio=%.2f", ms, self.hit_ratio())
+        return plan
+
+    def hit_ratio(self) -> float:
+        with self._lock:
+            total = self._stats["hits"] + self._stats["misses"]
+            return self._stats["hits"] / total if total else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            st = dict(self._stats)
+            st["entries"] = len(self._plans)
+        total = st["hits"] + st["misses"]
+        st["hit_ratio"] = round(st["hits"] / total, 3) if total else None
+        st["avg_plan_ms"] = round(st["plan_ms_total"] / st["misses"], 3) if st["misses"] else None
+        st["plan_ms_total"] = round(st["plan_ms_total"], 3)
+        return st
+
+
+plan_cache = PlanCache(int(os.getenv("PLAN_CACHE_SIZE", "1024") or 0))
+
+
 def make_agent_payload(intent: Intent, query: str, usr_id: str, conv_id: int | None, session_meta: dict) -> Dict[str, Any]:
     payload: Dict[str, Any] = {
         "query": query,
@@ -11,6 +11,9 @@ GUIDE_KEYWORDS = [
     "예측점수", "예측 점수", "대출", "방문수", "자료구입비"
 ]
 
+# 키워드 포함 여부를 한 번의 스캔으로 판정 (import 시 1회 컴파일)
+_GUIDE_RE = re.compile("|".join(re.escape(k) for k in sorted(set(GUIDE_KEYWORDS), key=len, reverse=True)))
+
 # 특정 가이드 문서 그룹 힌트(파일명/컬렉션명 기준)
 DEFAULT_GUIDE_GROUP = "서비스이용가이드"
 
@@ -19,7 +22,7 @@ def detect_usage_guide(query: str) -> bool:
     if not q:
         return False
     # 간단: 위 키워드가 하나라도 포함되면 가이드성으로 간주
-    return any(k in q for k in GUIDE_KEYWORDS)
+    return bool(_GUIDE_RE.search(q))
 
 def group_hint_for_usage(query: str) -> str:
     # 필요 시 질문에서 더 구체화 가능. 지금은 단일 컬렉션으로 고정.
@@ -15,12 +15,14 @@ from ModelCreator.Fetcher import DataFetcher
 from ModelCreator.Cleaner import DataCleaner
 from ModelCreator.Handler import DataHandler
 from ModelCreator.Trainer import ModelTrainer
-from ModelCreator.Utiles.Exporter import save_model
-from ModelCreator.Utiles.Evaluator import evaluate_metrics
+from ModelCreator.Utiles.Exporter import save_model, write_manifest, manifest_path
+from ModelCreator.Utiles.Evaluator import evaluate_metrics, predict_by_cluster
 from ModelCreator.Logger import PipelineLogger
+from ModelCreator.Tuner import HyperparamTuner, write_tuned_config
 
 class PipelineController:
     def __init__(self, config_path: str):
+        self.config_path = config_path
         self.config = self.load_config(config_path)
         self.conn = None
 
@@ -38,6 +40,55 @@ class PipelineController:
             )
             print("[INFO] Oracle DB 연결 완료")
 
+    def prepare_data(self):
+        """수집 → 전처리 → 스케일링 (학습/탐색 공용)"""
+        input_cols = self.config["INPUT_COLUMNS"]
+        target_col = self.config["TARGET_COLUMN"]
+
+        if self.config["TABLE_TYPE"] == "DB" and self.conn is None:
+            self.setup_db_connection()
+
+        fetcher = DataFetcher(config=self.config, conn=self.conn)
+        df_raw = fetcher.fetch()
+
+        cleaner = DataCleaner(config=self.config)
+        df_cleaned = cleaner.clean_numeric(df_raw, input_cols + [target_col])
+        df_cleaned = cleaner.handle_missing(df_cleaned, input_cols + [target_col])
+        df_cleaned = cleaner.handle_outliers(df_cleaned, input_cols)
+        cleaner.profile_report()
+
+        handler = DataHandler(
+            scaler_config=self.config["SCALER_CONFIG"],
+            cluster_config=self.config["CLUSTER_CONFIG"]
+        )
+        df_scaled = handler.scale_features(df_cleaned, input_cols)
+        return df_scaled, handler
+
+    def search(self):
+        """
+        Successive Halving 하이퍼파라미터 탐색 → 튜닝된 컨피그 JSON 저장
+        - PARAMS["full"]은 전체 행으로 탐색
+        - 클러스터링 사용 시 run()과 같은 방식으로 클러스터를 나눠 PARAMS[클러스터 id]도 각각 탐색
+        """
+        print("[START] 하이퍼파라미터 탐색 시작")
+        input_cols = self.config["INPUT_COLUMNS"]
+        target_col = self.config["TARGET_COLUMN"]
+        df_scaled, handler = self.prepare_data()
+
+        results = {}
+        tuner = HyperparamTuner(self.config, df_scaled[input_cols], df_scaled[target_col])
+        results["full"] = {**tuner.search(), "history": tuner.history}
+
+        if self.config["CLUSTER_CONFIG"].get("enabled", False):
+            df_clustered = handler.assign_clusters(df_scaled, input_cols)
+            for cluster_id in sorted(df_clustered["cluster_id"].unique()):
+                sub_df = df_clustered[df_clustered["cluster_id"] == cluster_id]
+                tuner = HyperparamTuner(self.config, sub_df[input_cols], sub_df[target_col], params_key=str(cluster_id))
+                results[str(cluster_id)] = {**tuner.search(), "history": tuner.history}
+
+        results["config_path"] = write_tuned_config(self.config, results, self.config_path)
+        return results
+
     def run(self):
         print("[START] 모델 생성 파이프라인 시작")
 
@@ -57,26 +108,8 @@ class PipelineController:
         os.makedirs(model_dir, exist_ok=True)
         os.makedirs(log_dir, exist_ok=True)
 
-        # DB 연결
-        if self.config["TABLE_TYPE"] == "DB":
-            self.setup_db_connection()
-
-        # 1. 데이터 수집
-        fetcher = DataFetcher(config=self.config, conn=self.conn)
-        df_raw = fetcher.fetch()
-
-        # 2. 전처리
-        cleaner = DataCleaner(config=self.config)
-        df_cleaned = cleaner.clean_numeric(df_raw, input_cols + [target_col])
-        df_cleaned = cleaner.handle_missing(df_cleaned, input_cols + [target_col])
-        df_cleaned = cleaner.handle_outliers(df_cleaned, input_cols)
-
-        # 3. 스케일링 & 클러스터링
-        handler = DataHandler(
-            scaler_config=self.config["SCALER_CONFIG"],
-            cluster_config=self.config["CLUSTER_CONFIG"]
-        )
-        df_scaled = handler.scale_features(df_cleaned, input_cols)
+        # 1~3. 데이터 수집 / 전처리 / 스케일링 & 클러스터링
+        df_scaled, handler = self.prepare_data()
         df_clustered = handler.assign_clusters(df_scaled, input_cols)
 
         # 4. 모델 학습
@@ -103,24 +136,27 @@ class PipelineController:
                 for key, value in metric.items():
                     print(f"    - {key}: {value:.4f}")
 
-        # 5. 모델 저장
+        # 5. 모델 저장 (모든 파일 저장 후 매니페스트 기록 → 예측 서버 교체 시점)
+        saved = []
         for cid, model in trainer.models_by_cluster.items():
             if cid == "full":
                 filename = f"{model_num}_{model_name}_full_{save_rules['version']}{save_rules['suffix']}"
             else:
                 filename = f"{model_num}_{model_name}_cluster_{cid}_{save_rules['version']}{save_rules['suffix']}"
             path = os.path.join(model_dir, filename)
-            save_model(model, path)
+            saved.append(save_model(model, path))
 
         # 5-1. 스케일러 저장
         if handler.scaler:
             scaler_path = os.path.join(model_dir, f"{model_num}_{model_name}_{save_rules['prefix_model_scaler']}_{save_rules['version']}.pkl")
-            save_model(handler.scaler, scaler_path)
+            saved.append(save_model(handler.scaler, scaler_path))
 
         # 5-2. 클러스터 모델 저장
         if cluster_enabled and handler.cluster_model:
             cluster_path = os.path.join(model_dir, f"{model_num}_{model_name}_{save_rules['prefix_model_cluster']}_{save_rules['version']}.pkl")
-            save_model(handler.cluster_model, cluster_path)
+            saved.append(save_model(handler.cluster_model, cluster_path))
+
+        write_manifest(saved, manifest_path(model_dir, model_num, model_name, save_rules["version"]))
 
         # 6. 클러스터링 기반 예측 성능 평가
         clustered_metrics = None
@@ -131,13 +167,8 @@ class PipelineController:
                 X_test_scaled = X_test
             cluster_ids = handler.cluster_model.predict(X_test_scaled)
 
-            y_pred_all = []
-            for i, cluster_id in enumerate(cluster_ids):
-                model = trainer.models_by_cluster.get(cluster_id)
-                if model is None:
-                    raise ValueError(f"[ERROR] 클러스터 '{cluster_id}'에 해당하는 모델이 없습니다.")
-                x_sample = X_test.iloc[i:i+1]
-                y_pred_all.append(model.predict(x_sample)[0])
+            # 클러스터별 일괄 예측 (행 순서 유지)
+            y_pred_all = predict_by_cluster(trainer.models_by_cluster, cluster_ids, X_test)
 
             clustered_metrics = evaluate_metrics(y_test, y_pred_all)
 
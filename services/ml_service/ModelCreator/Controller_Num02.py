@@ -2,7 +2,6 @@ import os
 import json
 import oracledb
 import pandas as pd
-import numpy as np
 import sys
 
 # 루트 경로 추가
@@ -16,9 +15,11 @@ from core_utiles.config_loader import (
 
 from ModelCreator.Fetcher import DataFetcher
 from ModelCreator.Cleaner import DataCleaner
+from ModelCreator.Handler import build_sliding_windows
 from ModelCreator.Trainer import ModelTrainer
-from ModelCreator.Utiles.Exporter import save_model
+from ModelCreator.Utiles.Exporter import save_model, write_manifest, manifest_path
 from ModelCreator.Logger import PipelineLogger
+from ModelCreator.Tuner import HyperparamTuner
 
 class PipelineController:
     def __init__(self, config_path: str):
@@ -27,6 +28,7 @@ class PipelineController:
         abs_config_path = os.path.join(base_dir, config_path)
         abs_config_path = os.path.normpath(abs_config_path)
 
+        self.config_path = abs_config_path
         with open(abs_config_path, "r", encoding="utf-8") as f:
             self.config = json.load(f)
         self.conn = None
@@ -41,66 +43,64 @@ class PipelineController:
             )
             print("[INFO] Oracle DB 연결 완료")
 
-    def run(self):
-        print("[START] Num02 (XGB 통합모델) 학습 컨트롤러 시작")
-
+    def build_dataset(self):
+        """수집 → 전처리 → 슬라이딩 윈도우 통합 학습셋 (없으면 None)"""
         window_cfg = self.config.get("WINDOW_CONFIG", {})
         window_size = window_cfg.get("window_size", 5)
-        test_size = self.config.get("TEST_SIZE", 0.2)
-        model_type = self.config["MODEL_TYPE"]
-        model_num = self.config["MODEL_NUM"]
-        model_name = self.config["MODEL_NAME"]
-        save_rules = self.config["SAVE_NAME_RULES"]
+        window_stride = max(1, int(window_cfg.get("stride", 1)))
 
         raw_years = get_raw_years()
         if len(raw_years) < window_size + 1:
             print(f"[ERROR] 연도 범위 부족 ➜ RAW_DATA_RANGE={raw_years}")
-            return
-
-        min_year = raw_years[0]
-        max_year = raw_years[-1]
+            return None
 
         # DB 연결
         if self.config["TABLE_TYPE"] == "DB":
             self.setup_db_connection()
 
-        # 데이터 수집 및 전처리
-        fetcher = DataFetcher(config=self.config, conn=self.conn)
+        # 데이터 수집 및 전처리 (윈도우에 쓰이는 SCR_EST_{연도} + 정렬 컬럼만 조회)
+        fetch_cols = [f"SCR_EST_{y}" for y in raw_years] + list(self.config.get("SORT_COLUMNS", {}).keys())
+        fetcher = DataFetcher(config=self.config, conn=self.conn, columns=fetch_cols)
         df_raw = fetcher.fetch()
 
         cleaner = DataCleaner(config=self.config)
         df_cleaned = cleaner.clean_numeric(df_raw, df_raw.columns.tolist())
         df_cleaned = cleaner.handle_missing(df_cleaned, df_raw.columns.tolist())
         df_cleaned = cleaner.handle_outliers(df_cleaned, df_raw.columns.tolist())
+        cleaner.profile_report()
 
-        # 전체 학습셋 구성
-        X_total, y_total = [], []
+        # 전체 학습셋 구성 (윈도우 길이/간격: WINDOW_CONFIG.window_size / stride)
+        samples = build_sliding_windows(df_cleaned, raw_years, window_size, stride=window_stride)
+        if samples is None:
+            print("[ERROR] 유효한 학습셋이 생성되지 않았습니다.")
+            return None
 
-        for start_year in range(min_year, max_year - window_size + 1):
-            input_cols = [f"SCR_EST_{y}" for y in range(start_year, start_year + window_size)]
-            target_col = f"SCR_EST_{start_year + window_size}"
+        return pd.DataFrame(samples, columns=[f"F{i}" for i in range(window_size)] + ["Target"])
 
-            expected_cols = input_cols + [target_col]
-            if not all(col in df_cleaned.columns for col in expected_cols):
-                print(f"[SKIP] 누락된 컬럼: {expected_cols}")
-                continue
+    def search(self):
+        """Successive Halving 하이퍼파라미터 탐색 → 튜닝된 컨피그 JSON 저장"""
+        print("[START] Num02 하이퍼파라미터 탐색 시작")
+        df_all = self.build_dataset()
+        if df_all is None:
+            return None
 
-            df_sub = df_cleaned[expected_cols].dropna()
-            print(f"[DEBUG] 입력: {input_cols} -> 타겟: {target_col} -> 샘플 수: {len(df_sub)}")
-            if df_sub.empty:
-                continue
+        tuner = HyperparamTuner(self.config, df_all.drop(columns=["Target"]), df_all["Target"])
+        result = tuner.search()
+        result["config_path"] = tuner.write_config(result, self.config_path)
+        return result
 
-            X_total.append(df_sub[input_cols].values)
-            y_total.append(df_sub[target_col].values)
+    def run(self):
+        print("[START] Num02 (XGB 통합모델) 학습 컨트롤러 시작")
 
-        if not X_total or not y_total:
-            print("[ERROR] 유효한 학습셋이 생성되지 않았습니다.")
-            return
+        test_size = self.config.get("TEST_SIZE", 0.2)
+        model_type = self.config["MODEL_TYPE"]
+        model_num = self.config["MODEL_NUM"]
+        model_name = self.config["MODEL_NAME"]
+        save_rules = self.config["SAVE_NAME_RULES"]
 
-        # 통합 학습셋 구성
-        X_all = np.vstack(X_total)
-        y_all = np.concatenate(y_total)
-        df_all = pd.DataFrame(np.column_stack([X_all, y_all]), columns=[f"F{i}" for i in range(X_all.shape[1])] + ["Target"])
+        df_all = self.build_dataset()
+        if df_all is None:
+            return
 
         # 모델 학습
         trainer = ModelTrainer(
@@ -122,6 +122,7 @@ class PipelineController:
         filename = f"{model_num}_{model_name}_full_{version}{suffix}"
         save_path = os.path.join(MODEL_SAVE_PATH, filename)
         save_model(trainer.models_by_cluster["full"], save_path)
+        write_manifest([save_path], manifest_path(MODEL_SAVE_PATH, model_num, model_name, version))
 
         log_filename = f"{model_num}_{model_name}_{version}_Log.json"
         logger = PipelineLogger(LOG_SAVE_PATH)
@@ -1,8 +1,49 @@
 import pandas as pd
+import numpy as np
 import os
+import json
+import time
+import hashlib
+
+# 수집 설정 (환경변수로 조정)
+FETCH_CHUNKSIZE = int(os.getenv("FETCH_CHUNKSIZE", "20000") or 20000)
+# Parquet 캐시는 기본 끔 (FETCH_CACHE=1로 사용) — 같은 데이터를 반복 학습/탐색할 때만 켤 것
+FETCH_CACHE_ENABLED = os.getenv("FETCH_CACHE", "0").strip().lower() in ("1", "true", "yes")
+# 기본 위치는 실행 위치와 무관하게 ml_service/_FetchCache (.gitignore 등록)
+FETCH_CACHE_DIR = os.getenv("FETCH_CACHE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "_FetchCache")
+
+# FETCH_CONFIG.filters 연산자 → SQL 조건
+_FILTER_OPS = ("eq", "in", "between", "not_null")
+
+
+def required_columns(config: dict) -> list:
+    """
+    학습에 필요한 컬럼 목록 (순서 유지, 중복 제거)
+    - FETCH_CONFIG.columns가 있으면 그대로 사용
+    - 없으면 INPUT_COLUMNS + TARGET_COLUMN + SORT_COLUMNS
+    """
+    fetch_cfg = config.get("FETCH_CONFIG", {})
+    cols = fetch_cfg.get("columns") or (
+        list(config.get("INPUT_COLUMNS", []))
+        + [config.get("TARGET_COLUMN")]
+        + list(config.get("SORT_COLUMNS", {}).keys())
+    )
+    return list(dict.fromkeys(c for c in cols if c))
+
 
 class DataFetcher:
-    def __init__(self, config: dict, conn=None):
+    """
+    학습 데이터 수집
+    - DB: 필요한 컬럼만 SELECT, 필터/정렬은 SQL로 내려보냄
+      → COUNT로 행 수 확인 후 float 배열 1회 할당, chunk 단위 fetch로 채움 (SELECT * 단일 fetch 대비 피크 메모리 감소)
+    - FETCH_CACHE=1이면 결과를 로컬 Parquet 캐시
+      (키: 쿼리 + 바인드 + 테이블 버전(LAST_DDL_TIME) + 행 수 + MAX(ORA_ROWSCN) 해시)
+      → 행 수가 같은 UPDATE도 ORA_ROWSCN이 바뀌므로 캐시 무효화, ORA_ROWSCN 조회 불가(뷰 등)면 캐시 사용 안 함
+    - CSV: usecols로 같은 컬럼만 읽음
+    - columns 미지정 시 required_columns(config), 테이블에 없는 컬럼은 제외 후 경고
+    """
+    def __init__(self, config: dict, conn=None, columns: list = None):
         self.config = config
         self.table_type = config.get("TABLE_TYPE", "DB")
         self.sort_config = config.get("SORT_COLUMNS", {})
@@ -11,34 +52,229 @@ class DataFetcher:
         self.csv_file_name = config.get("SCV_DATA_NAME") + ".csv"
         self.conn = conn  # DB 연결 객체는 외부에서 주입
 
-    def fetch(self) -> pd.DataFrame:
-        if self.table_type == "DB":
-            if self.conn is None:
-                raise ValueError("[ERROR] DB 연결 객체가 없습니다.")
+        fetch_cfg = config.get("FETCH_CONFIG", {})
+        self.label_cols = list(fetch_cfg.get("label_columns", []))  # 숫자 변환하지 않는 컬럼 (예: SNM)
+        self.columns = list(dict.fromkeys((columns or required_columns(config)) + self.label_cols))
+        self.filters = fetch_cfg.get("filters", {})
+        self.dtype = np.dtype(fetch_cfg.get("dtype", "float32"))
+        self.chunksize = int(fetch_cfg.get("chunksize", FETCH_CHUNKSIZE))
+
+    # === SQL 구성 ===
+    def _where_clause(self):
+        conds, binds = [], {}
+        for col, spec in self.filters.items():
+            op, value = next(iter(spec.items())) if isinstance(spec, dict) else ("eq", spec)
+            if op not in _FILTER_OPS:
+                raise ValueError(f"[ERROR] 지원하지 않는 필터 연산자: {col} → {op}")
+            if op == "not_null":
+                conds.append(f"{col} IS NOT NULL")
+            elif op == "eq":
+                key = f"b{len(binds)}"
+                binds[key] = value
+                conds.append(f"{col} = :{key}")
+            elif op == "between":
+                lo, hi = f"b{len(binds)}", f"b{len(binds) + 1}"
+                binds[lo], binds[hi] = value[0], value[1]
+                conds.append(f"{col} BETWEEN :{lo} AND :{hi}")
+            elif op == "in":
+                keys = []
+                for v in value:
+                    key = f"b{len(binds)}"
+                    binds[key] = v
+                    keys.append(f":{key}")
+                conds.append(f"{col} IN ({', '.join(keys)})" if keys else "1 = 0")
+        return (" WHERE " + " AND ".join(conds)) if conds else "", binds
+
+    def _order_clause(self):
+        if not self.sort_config:
+            return ""
+        return " ORDER BY " + ", ".join(
+            f"{col} {direction.upper()}" for col, direction in self.sort_config.items()
+        )
+
+    def _table_columns(self, cur) -> list:
+        cur.execute(f"SELECT * FROM {self.db_table_name} WHERE 1 = 0")
+        return [d[0] for d in cur.description]
 
-            order_clause = ""
-            if self.sort_config:
-                order_clause = " ORDER BY " + ", ".join(
-                    f"{col} {direction.upper()}" for col, direction in self.sort_config.items()
+    def _table_version(self, cur):
+        owner, _, name = self.db_table_name.upper().rpartition(".")
+        try:
+            if owner:
+                cur.execute(
+                    "SELECT LAST_DDL_TIME FROM ALL_OBJECTS "
+                    "WHERE OWNER = :o AND OBJECT_NAME = :n AND OBJECT_TYPE = 'TABLE'",
+                    {"o": owner, "n": name},
                 )
+            else:
+                cur.execute(
+                    "SELECT LAST_DDL_TIME FROM USER_OBJECTS WHERE OBJECT_NAME = :n AND OBJECT_TYPE = 'TABLE'",
+                    {"n": name},
+                )
+            r = cur.fetchone()
+            return str(r[0]) if r else None
+        except Exception as e:
+            print(f"[WARN] 테이블 버전 조회 실패 → 행 수만으로 캐시 검증: {e}")
+            return None
 
-            query = f"SELECT * FROM {self.db_table_name}{order_clause}"
-            df = pd.read_sql(query, con=self.conn)
-            return df
+    def _count_rows(self, cur, where_clause, binds):
+        """(행 수, 내용 지문) — 지문은 캐시 사용 시에만 MAX(ORA_ROWSCN)으로 조회, 불가하면 None"""
+        if FETCH_CACHE_ENABLED:
+            try:
+                cur.execute(f"SELECT COUNT(*), MAX(ORA_ROWSCN) FROM {self.db_table_name}{where_clause}", binds)
+                n_rows, scn = cur.fetchone()
+                return int(n_rows), scn
+            except Exception as e:
+                print(f"[WARN] ORA_ROWSCN 조회 실패 → 캐시 사용 안 함: {str(e).splitlines()[0]}")
+        cur.execute(f"SELECT COUNT(*) FROM {self.db_table_name}{where_clause}", binds)
+        return int(cur.fetchone()[0]), None
 
-        elif self.table_type == "CSV":
-            csv_path = os.path.join(self.csv_dir, self.csv_file_name)
-            if not os.path.exists(csv_path):
-                raise FileNotFoundError(f"[ERROR] CSV 파일을 찾을 수 없습니다 → {csv_path}")
+    # === Parquet 캐시 ===
+    def _cache_path(self, query, binds, version, n_rows, scn):
+        if scn is None:
+            return None
+        key = json.dumps({
+            "query": query, "binds": binds, "dtype": self.dtype.name,
+            "labels": self.label_cols, "version": version, "rows": n_rows, "scn": scn,
+        }, sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:20]
+        table = self.db_table_name.replace(".", "_")
+        return os.path.join(FETCH_CACHE_DIR, f"{table}_{digest}.parquet")
+
+    def _read_cache(self, path):
+        if not (FETCH_CACHE_ENABLED and path and os.path.exists(path)):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:  # pyarrow 미설치/손상 파일 → DB에서 다시 읽음
+            print(f"[WARN] Parquet 캐시 읽기 실패 → DB 조회: {str(e).splitlines()[0]}")
+            return None
+
+    def _write_cache(self, df, path):
+        if not (FETCH_CACHE_ENABLED and path):
+            return
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(FETCH_CACHE_DIR, exist_ok=True)
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            print(f"[INFO] Parquet 캐시 저장 → {path}")
+        except Exception as e:
+            print(f"[WARN] Parquet 캐시 저장 실패 (수집 결과는 그대로 사용): {str(e).splitlines()[0]}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
-            df = pd.read_csv(csv_path)
+    # === DB 수집 ===
+    def _fetch_db(self) -> pd.DataFrame:
+        cur = self.conn.cursor()
+        try:
+            available = set(self._table_columns(cur))
+            missing = [c for c in self.columns if c not in available]
+            if missing:
+                print(f"[WARN] 테이블에 없는 컬럼 제외 → {missing}")
+            cols = [c for c in self.columns if c in available]
+            if not cols:
+                raise ValueError(f"[ERROR] 조회할 컬럼이 없습니다 → {self.db_table_name}")
+            num_cols = [c for c in cols if c not in self.label_cols]
+            label_cols = [c for c in cols if c in self.label_cols]
 
-            if self.sort_config:
-                sort_cols = list(self.sort_config.keys())
-                ascending_flags = [self.sort_config[col].upper() != "DESC" for col in sort_cols]
-                df = df.sort_values(by=sort_cols, ascending=ascending_flags).reset_index(drop=True)
+            where_clause, binds = self._where_clause()
+            query = f"SELECT {', '.join(cols)} FROM {self.db_table_name}{where_clause}{self._order_clause()}"
 
-            return df
+            n_rows, scn = self._count_rows(cur, where_clause, binds)
+            cache_path = self._cache_path(query, binds, self._table_version(cur), n_rows, scn) \
+                if FETCH_CACHE_ENABLED else None
+            df = self._read_cache(cache_path)
+            if df is not None:
+                print(f"[INFO] Parquet 캐시 사용 → {cache_path} ({len(df)}행)")
+                return df
+
+            # 행 수만큼 1회 할당 후 chunk 단위로 채움 (COUNT 이후 행이 늘면 확장, 줄면 잘라냄)
+            t0 = time.perf_counter()
+            values = np.empty((n_rows, len(num_cols)), dtype=self.dtype)
+            labels = {c: np.empty(n_rows, dtype=object) for c in label_cols}
+            num_pos = [cols.index(c) for c in num_cols]
+            label_pos = {c: cols.index(c) for c in label_cols}
+
+            cur.arraysize = self.chunksize
+            cur.prefetchrows = self.chunksize + 1
+            cur.execute(query, binds)
+            filled = 0
+            while True:
+                rows = cur.fetchmany(self.chunksize)
+                if not rows:
+                    break
+                chunk = pd.DataFrame.from_records(rows, columns=cols)
+                end = filled + len(chunk)
+                if end > len(values):
+                    values = np.resize(values, (end, len(num_cols)))
+                    labels = {c: np.resize(v, end) for c, v in labels.items()}
+                if num_cols:
+                    values[filled:end] = chunk.iloc[:, num_pos].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=self.dtype)
+                for c, pos in label_pos.items():
+                    labels[c][filled:end] = chunk.iloc[:, pos].to_numpy()
+                filled = end
+        finally:
+            cur.close()
+
+        df = pd.DataFrame(values[:filled], columns=num_cols)
+        for c in label_cols:
+            df[c] = labels[c][:filled]
+        df = df[cols]
+        print(f"[INFO] DB 수집 완료 → {filled}행 × {len(cols)}열 ({self.dtype.name}), "
+              f"{(time.perf_counter() - t0) * 1000:.0f}ms, {values[:filled].nbytes / 1024 ** 2:.1f}MB")
+        self._write_cache(df, cache_path)
+        return df
+
+    # === CSV 수집 ===
+    def _apply_filters(self, df: pd.DataFrame) -> pd.DataFrame:
+        """CSV 경로용: FETCH_CONFIG.filters를 DataFrame에 동일하게 적용"""
+        mask = np.ones(len(df), dtype=bool)
+        for col, spec in self.filters.items():
+            op, value = next(iter(spec.items())) if isinstance(spec, dict) else ("eq", spec)
+            if op not in _FILTER_OPS:
+                raise ValueError(f"[ERROR] 지원하지 않는 필터 연산자: {col} → {op}")
+            s = df[col]
+            if op == "not_null":
+                mask &= s.notna().to_numpy()
+            elif op == "eq":
+                mask &= (s == value).to_numpy()
+            elif op == "between":
+                mask &= s.between(value[0], value[1]).to_numpy()
+            elif op == "in":
+                mask &= s.isin(value).to_numpy()
+        return df[mask] if not mask.all() else df
+
+    def _fetch_csv(self) -> pd.DataFrame:
+        csv_path = os.path.join(self.csv_dir, self.csv_file_name)
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"[ERROR] CSV 파일을 찾을 수 없습니다 → {csv_path}")
+
+        header = pd.read_csv(csv_path, nrows=0).columns
+        missing = [c for c in self.columns if c not in header]
+        if missing:
+            print(f"[WARN] CSV에 없는 컬럼 제외 → {missing}")
+        usecols = [c for c in self.columns if c in header]
+        extra_cols = [c for c in dict.fromkeys(list(self.filters) + list(self.sort_config))
+                      if c in header and c not in usecols]
+
+        df = pd.read_csv(csv_path, usecols=usecols + extra_cols)
+        df = self._apply_filters(df)
+
+        if self.sort_config:
+            sort_cols = list(self.sort_config.keys())
+            ascending_flags = [self.sort_config[col].upper() != "DESC" for col in sort_cols]
+            df = df.sort_values(by=sort_cols, ascending=ascending_flags).reset_index(drop=True)
+
+        return df[usecols]
+
+    def fetch(self) -> pd.DataFrame:
+        if self.table_type == "DB":
+            if self.conn is None:
+                raise ValueError("[ERROR] DB 연결 객체가 없습니다.")
+            return self._fetch_db()
+
+        elif self.table_type == "CSV":
+            return self._fetch_csv()
 
         else:
-            raise ValueError(f"[ERROR] 지원하지 않는 TABLE_TYPE: {self.table_type}")
\ No newline at end of file
+            raise ValueError(f"[ERROR] 지원하지 않는 TABLE_TYPE: {self.table_type}")
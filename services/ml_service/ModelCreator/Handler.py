@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
 from sklearn.cluster import KMeans, DBSCAN, AgglomerativeClustering
 
@@ -53,4 +55,55 @@ class DataHandler:
         cluster_ids = self.cluster_model.fit_predict(df[feature_cols])
         df["cluster_id"] = cluster_ids
         print(f"[INFO] '{cluster_type}' 클러스터링 적용 완료 → 클러스터 수: {len(set(cluster_ids))}")
-        return df
\ No newline at end of file
+        return df
+
+
+def build_sliding_windows(df: pd.DataFrame, years: list, window_size: int, stride: int = 1,
+                          prefix: str = "SCR_EST_"):
+    """
+    연도 순 점수 행렬 → 슬라이딩 윈도우 학습셋 (앞 window_size년 입력, 다음 해 타겟)
+    - sliding_window_view로 복사 없이 (행, 윈도우, window_size+1) 뷰 구성, stride만큼 건너뜀
+    - 윈도우별 dropna와 같은 기준으로 유효 샘플 수를 먼저 세어 출력 배열 1회 할당
+      → 윈도우 순서대로 채움 (기존 vstack 누적과 행 순서 동일)
+    - 컬럼이 하나라도 없는 윈도우는 [SKIP]
+    반환: (샘플 수, window_size+1) 배열 (마지막 열 = 타겟), 유효 샘플이 없으면 None
+    """
+    cols = [f"{prefix}{y}" for y in years]
+    span = window_size + 1
+    if len(cols) < span:
+        return None
+
+    present = np.array([c in df.columns for c in cols])
+    present_cols = [c for c, ok in zip(cols, present) if ok]
+    dtype = np.result_type(*df[present_cols].dtypes) if present_cols else np.float64
+    if not np.issubdtype(dtype, np.floating):
+        dtype = np.float64
+
+    scores = np.full((len(df), len(cols)), np.nan, dtype=dtype)
+    scores[:, present] = df[present_cols].to_numpy(dtype=dtype)
+
+    starts = list(range(len(cols) - span + 1))[::stride]
+    windows = sliding_window_view(scores, span, axis=1)[:, ::stride]            # (행, 윈도우, span)
+    col_ok = sliding_window_view(present, span).all(axis=1)[::stride]           # (윈도우,)
+    row_ok = ~sliding_window_view(np.isnan(scores), span, axis=1)[:, ::stride].any(axis=2) & col_ok
+    counts = row_ok.sum(axis=0)
+
+    for w, s in enumerate(starts):
+        input_cols = cols[s:s + window_size]
+        target_col = cols[s + window_size]
+        if not col_ok[w]:
+            print(f"[SKIP] 누락된 컬럼: {input_cols + [target_col]}")
+            continue
+        print(f"[DEBUG] 입력: {input_cols} -> 타겟: {target_col} -> 샘플 수: {counts[w]}")
+
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    out = np.empty((total, span), dtype=dtype)
+    pos = 0
+    for w in np.flatnonzero(counts):
+        k = int(counts[w])
+        np.compress(row_ok[:, w], windows[:, w], axis=0, out=out[pos:pos + k])
+        pos += k
+    return out
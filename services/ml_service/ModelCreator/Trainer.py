@@ -1,16 +1,60 @@
+import os
+import time
+import numpy as np
+import pandas as pd
 from sklearn.model_selection import train_test_split
 from ModelCreator.Utiles.Validator import validate_columns
 from ModelCreator.Utiles.Evaluator import evaluate_metrics
 from ModelCreator.ModelLoader import ModelFactory
 
+# 클러스터 모델 동시 학습 프로세스 수 (0/미설정: min(클러스터 수, CPU 수), 1: 순차 학습)
+TRAIN_CLUSTER_WORKERS = int(os.getenv("TRAIN_CLUSTER_WORKERS", "0") or 0)
+
+
+def _uses_all_cores(model_type, params: dict) -> bool:
+    """
+    모델이 CPU 전체 스레드를 쓰는 설정인지 (병렬 학습 시 스레드 수를 줄일 대상)
+    - n_jobs=-1 명시
+    - XGBRegressor는 n_jobs 미지정(None)도 전체 스레드 사용
+    - 그 외(RandomForest n_jobs 미지정 = 1스레드, 양수 지정)는 그대로 둠
+    """
+    n_jobs = params.get("n_jobs")
+    return n_jobs == -1 or (n_jobs is None and model_type == "XGBRegressor")
+
+
+def _fit_cluster(model_type, cluster_id, params_dict, X, y, rows, input_cols, test_size, n_jobs):
+    """
+    (워커 프로세스) 클러스터 하나 학습
+    - X/y는 joblib이 memmap으로 넘긴 전체 행렬 → rows로 해당 클러스터만 슬라이스
+    - 순차 학습과 같은 모델이 나오도록 DataFrame(원래 인덱스/컬럼)으로 복원 후 동일하게 분할
+    """
+    t0 = time.time()
+    X_sub = pd.DataFrame(np.asarray(X[rows]), columns=input_cols, index=rows)
+    y_sub = pd.Series(np.asarray(y[rows]), index=rows)
+
+    X_train, X_test, y_train, y_test = train_test_split(X_sub, y_sub, test_size=test_size, random_state=42)
+
+    params = params_dict.get(str(cluster_id))
+    if params is not None and n_jobs is not None and _uses_all_cores(model_type, params):
+        # 프로세스 수 × 모델 스레드 수 ≤ CPU 수
+        params_dict = {**params_dict, str(cluster_id): {**params, "n_jobs": n_jobs}}
+    model = ModelFactory.get_model(model_type, cluster_id=cluster_id, params_dict=params_dict)
+    model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+    return cluster_id, model, evaluate_metrics(y_test, y_pred), time.time() - t0
+
+
 class ModelTrainer:
-    def __init__(self, model_type, params_by_cluster, input_cols, test_size, target_col, cluster_enabled):
+    def __init__(self, model_type, params_by_cluster, input_cols, test_size, target_col, cluster_enabled,
+                 n_workers=None):
         self.model_type = model_type
         self.params_by_cluster = params_by_cluster
         self.input_cols = input_cols
         self.test_size = test_size
         self.target_col = target_col
         self.cluster_enabled = cluster_enabled
+        self.n_workers = TRAIN_CLUSTER_WORKERS if n_workers is None else n_workers
 
         self.models_by_cluster = {}
 
@@ -38,9 +82,15 @@ class ModelTrainer:
 
         validate_columns(df, self.input_cols + [self.target_col, cluster_col])
 
+        cluster_ids = sorted(df[cluster_col].unique())
+        cpus = os.cpu_count() or 1
+        workers = min(len(cluster_ids), self.n_workers or cpus, cpus)
+        if workers > 1:
+            return self._train_by_cluster_parallel(df, cluster_col, cluster_ids, workers, cpus)
+
         metrics_dict = {}
 
-        for cluster_id in sorted(df[cluster_col].unique()):
+        for cluster_id in cluster_ids:
             sub_df = df[df[cluster_col] == cluster_id]
             X = sub_df[self.input_cols]
             y = sub_df[self.target_col]
@@ -54,4 +104,41 @@ class ModelTrainer:
             self.models_by_cluster[cluster_id] = model
             metrics_dict[cluster_id] = evaluate_metrics(y_test, y_pred)
 
-        return metrics_dict
\ No newline at end of file
+        return metrics_dict
+
+    def _train_by_cluster_parallel(self, df, cluster_col, cluster_ids, workers, cpus):
+        """
+        클러스터별 모델을 프로세스 풀에서 동시 학습
+        - 특성 행렬은 1회만 numpy로 만들고 joblib memmapping으로 공유 (작업마다 pickle 복사 X)
+        - 모델 내부 스레드 = CPU 수 // 프로세스 수 (전체 스레드 설정인 경우만 조정, _uses_all_cores)
+        - 큰 클러스터부터 투입 → 전체 시간 ≈ 가장 큰 클러스터 학습 시간
+        """
+        from joblib import Parallel, delayed
+
+        X = df[self.input_cols].to_numpy()
+        y = df[self.target_col].to_numpy()
+        labels = df[cluster_col].to_numpy()
+        positions = {cid: np.flatnonzero(labels == cid) for cid in cluster_ids}
+        threads = max(1, cpus // workers)
+
+        order = sorted(cluster_ids, key=lambda cid: len(positions[cid]), reverse=True)
+        print(f"[INFO] 클러스터 병렬 학습 → 프로세스 {workers}개 × 모델 스레드 {threads}개, 클러스터 {len(order)}개")
+
+        t0 = time.time()
+        results = Parallel(n_jobs=workers, backend="loky", max_nbytes="1M", mmap_mode="r")(
+            delayed(_fit_cluster)(
+                self.model_type, cid, self.params_by_cluster, X, y, positions[cid],
+                self.input_cols, self.test_size, threads,
+            )
+            for cid in order
+        )
+        by_id = {cid: (model, metrics, sec) for cid, model, metrics, sec in results}
+        longest = max(sec for _, _, sec in by_id.values())
+        print(f"[INFO] 클러스터 병렬 학습 완료 → 전체 {time.time() - t0:.2f}초 (최장 클러스터 {longest:.2f}초)")
+
+        metrics_dict = {}
+        for cluster_id in cluster_ids:
+            model, metrics, _ = by_id[cluster_id]
+            self.models_by_cluster[cluster_id] = model
+            metrics_dict[cluster_id] = metrics
+        return metrics_dict
@@ -0,0 +1,191 @@
+import os
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+from sklearn.model_selection import KFold
+from ModelCreator.ModelLoader import ModelFactory
+from ModelCreator.Utiles.Evaluator import evaluate_metrics
+
+# 탐색 설정 (환경변수로 조정)
+TUNING_N_CANDIDATES = int(os.getenv("TUNING_N_CANDIDATES", "27") or 27)
+TUNING_ETA = int(os.getenv("TUNING_ETA", "3") or 3)
+TUNING_CV_FOLDS = int(os.getenv("TUNING_CV_FOLDS", "3") or 3)
+TUNING_EARLY_STOPPING = int(os.getenv("TUNING_EARLY_STOPPING", "30") or 0)
+TUNING_ES_FRACTION = float(os.getenv("TUNING_ES_FRACTION", "0.2") or 0.2)  # 학습 fold 중 early stopping 전용 비율
+TUNING_SEED = int(os.getenv("TUNING_SEED", "42") or 42)
+
+
+class HyperparamTuner:
+    """
+    Successive Halving 하이퍼파라미터 탐색
+    - 후보: TUNING_PARAMS(range/choices/fixed)에서 무작위 샘플 + 현재 PARAMS[params_key]
+    - params_key: "full"(통합 모델) 또는 클러스터 id — 클러스터 모델은 해당 클러스터 행만 넘겨 따로 탐색
+    - 자원: 트리 개수(n_estimators). rung마다 자원을 eta배로 늘리고 상위 1/eta만 생존
+    - XGB: 학습 fold에서 TUNING_ES_FRACTION만큼 떼어낸 별도 분할로 early stopping
+      (점수용 검증 fold와 분리 → 점수가 낙관적으로 치우치지 않음), 마지막 rung의 best_iteration으로 n_estimators 확정
+    - fold 분할/배열은 1회만 만들어 모든 후보·rung에서 재사용
+    - 모델 파라미터가 아닌 항목(n_clusters, window_size)은 데이터 구성을 바꾸므로 탐색 제외
+    """
+    STRUCTURAL_KEYS = ("n_clusters", "window_size")
+
+    def __init__(self, config: dict, X, y, params_key: str = "full"):
+        self.config = config
+        self.model_type = config["MODEL_TYPE"]
+        self.space = config.get("TUNING_PARAMS", {})
+        self.params_key = str(params_key)
+        params = config.get("PARAMS", {})
+        self.base_params = dict(params.get(self.params_key) or params.get("full", {}))
+        self.rng = np.random.default_rng(TUNING_SEED)
+        self.early_stopping = self.model_type == "XGBRegressor" and TUNING_EARLY_STOPPING > 0
+
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        kf = KFold(n_splits=TUNING_CV_FOLDS, shuffle=True, random_state=TUNING_SEED)
+        split_rng = np.random.default_rng(TUNING_SEED)
+        self.folds = []  # (X_fit, y_fit, X_va, y_va, X_es, y_es)
+        for tr, va in kf.split(X):
+            if self.early_stopping:
+                perm = split_rng.permutation(tr)
+                n_es = min(len(tr) - 1, max(1, int(len(tr) * TUNING_ES_FRACTION)))
+                es, fit = np.sort(perm[:n_es]), np.sort(perm[n_es:])
+                self.folds.append((X[fit], y[fit], X[va], y[va], X[es], y[es]))
+            else:
+                self.folds.append((X[tr], y[tr], X[va], y[va], None, None))
+
+        self.allowed = set(ModelFactory.get_model(self.model_type, "full", {"full": {}}).get_params().keys())
+        self.cost_trees = 0
+        self.history = []
+
+    # === 후보 생성 ===
+    def _sample(self) -> dict:
+        params = {}
+        for name, spec in self.space.items():
+            if name in self.STRUCTURAL_KEYS or name not in self.allowed:
+                continue
+            kind = spec.get("type")
+            if kind == "fixed":
+                params[name] = spec.get("fixed")
+            elif kind == "categorical":
+                choices = spec.get("choices", [])
+                params[name] = choices[int(self.rng.integers(len(choices)))] if choices else None
+            elif kind == "int":
+                lo, hi = spec["range"]
+                params[name] = int(self.rng.integers(lo, hi + 1))
+            elif kind == "float":
+                lo, hi = spec["range"]
+                params[name] = round(float(self.rng.uniform(lo, hi)), 4)
+        return params
+
+    def candidates(self, n: int) -> list:
+        base = {k: v for k, v in self.base_params.items() if k in self.allowed}
+        out = [base] if base else []
+        seen = {json.dumps(base, sort_keys=True)}
+        tries = 0
+        while len(out) < n and tries < n * 20:
+            tries += 1
+            p = {**base, **self._sample()}
+            key = json.dumps(p, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                out.append(p)
+        return out
+
+    # === 평가 ===
+    def _evaluate(self, params: dict, n_trees: int) -> dict:
+        """fold 평균 RMSE (XGB는 별도 분할 기준 early stopping 반영)"""
+        p = {**params, "n_estimators": n_trees}
+        if self.early_stopping:
+            p["early_stopping_rounds"] = TUNING_EARLY_STOPPING
+        rmses, best_iters = [], []
+        for X_tr, y_tr, X_va, y_va, X_es, y_es in self.folds:
+            model = ModelFactory.get_model(self.model_type, "full", {"full": p})
+            if self.early_stopping:
+                model.fit(X_tr, y_tr, eval_set=[(X_es, y_es)], verbose=False)
+                best = getattr(model, "best_iteration", None)
+                used = (best + 1) if best is not None else n_trees
+                best_iters.append(used)
+            else:
+                model.fit(X_tr, y_tr)
+                used = n_trees
+            self.cost_trees += used
+            rmses.append(evaluate_metrics(y_va, model.predict(X_va))["RMSE"])
+        return {
+            "rmse": float(np.mean(rmses)),
+            "best_n_estimators": int(np.mean(best_iters)) if best_iters else n_trees,
+        }
+
+    # === Successive Halving ===
+    def search(self, n_candidates: int = None, eta: int = None) -> dict:
+        n_candidates = n_candidates or TUNING_N_CANDIDATES
+        eta = max(2, eta or TUNING_ETA)
+        cands = self.candidates(n_candidates)
+        max_trees = max(int(c.get("n_estimators", 100)) for c in cands)
+        # rung 수 = floor(log_eta(후보 수)) + 1 — 부동소수 log 오차(예: log(27, 3) = 3.0000000000000004) 없이 정수로 계산
+        rungs = 1
+        while eta ** rungs <= len(cands):
+            rungs += 1
+
+        t0 = time.time()
+        alive = list(range(len(cands)))
+        scores = {}
+        for r in range(rungs):
+            frac = eta ** (r - rungs + 1)  # 마지막 rung = 1.0
+            for i in alive:
+                n_trees = max(10, int(int(cands[i].get("n_estimators", max_trees)) * frac))
+                scores[i] = self._evaluate(cands[i], n_trees)
+                self.history.append({"rung": r, "candidate": i, "n_estimators": n_trees, **scores[i]})
+            alive.sort(key=lambda i: scores[i]["rmse"])
+            print(f"[TUNING] ({self.params_key}) rung {r + 1}/{rungs} → 후보 {len(alive)}개, 자원 {frac:.3f}, "
+                  f"최고 RMSE {scores[alive[0]]['rmse']:.4f}")
+            if r < rungs - 1:
+                alive = alive[:max(1, len(alive) // eta)]
+
+        best_i = alive[0]
+        best = dict(cands[best_i])
+        if self.early_stopping:
+            best["n_estimators"] = scores[best_i]["best_n_estimators"]
+
+        grid_cost = sum(int(c.get("n_estimators", max_trees)) for c in cands) * len(self.folds)
+        result = {
+            "params_key": self.params_key,
+            "best_params": best,
+            "best_rmse": scores[best_i]["rmse"],
+            "n_candidates": len(cands),
+            "eta": eta,
+            "rungs": rungs,
+            "cv_folds": len(self.folds),
+            "trees_trained": self.cost_trees,
+            "full_search_trees": grid_cost,
+            "compute_ratio": round(self.cost_trees / grid_cost, 3) if grid_cost else None,
+            "elapsed_sec": round(time.time() - t0, 2),
+        }
+        print(f"[TUNING] ({self.params_key}) 완료 → best RMSE {result['best_rmse']:.4f}, "
+              f"연산량 {result['compute_ratio']} (전체 후보 완전 학습 대비)")
+        return result
+
+    def write_config(self, result: dict, config_path: str) -> str:
+        """최적 파라미터를 반영한 새 컨피그 JSON 저장 (원본은 유지)"""
+        return write_tuned_config(self.config, {self.params_key: {**result, "history": self.history}}, config_path)
+
+
+def write_tuned_config(config: dict, results: dict, config_path: str) -> str:
+    """
+    탐색 결과 여러 개(PARAMS 키별: "full", 클러스터 id)를 한 컨피그에 반영해 새 JSON 저장 (원본은 유지)
+    - results: {params_key: search() 결과 + "history"}
+    """
+    tuned = json.loads(json.dumps(config))
+    params = tuned.setdefault("PARAMS", {})
+    for key, result in results.items():
+        params[key] = {**params.get(key, {}), **result["best_params"]}
+    tuned["TUNING_RESULT"] = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "by_params": {key: {k: v for k, v in result.items() if k != "best_params"} for key, result in results.items()},
+    }
+    stem, ext = os.path.splitext(config_path)
+    out_path = f"{stem}_Tuned_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext or '.json'}"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(tuned, f, indent=2, ensure_ascii=False)
+    print(f"[완료] 튜닝 컨피그 저장 → {out_path}")
+    return out_path
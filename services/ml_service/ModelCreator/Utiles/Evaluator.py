@@ -10,4 +10,27 @@ def evaluate_metrics(y_true, y_pred):
         "RMSE": rmse,
         "MAE": mae,
         "R2": r2
-    }
\ No newline at end of file
+    }
+
+def predict_by_cluster(models_by_cluster: dict, cluster_ids, X):
+    """
+    클러스터별 모델로 일괄 예측 후 원래 행 순서로 재조립
+    - 행 단위 반복 대신 클러스터마다 불리언 마스크로 묶어 model.predict 1회
+    - 결과는 행 단위 반복(model.predict(X.iloc[i:i+1])[0])과 동일
+    """
+    cluster_ids = np.asarray(cluster_ids)
+    parts = []
+    for cluster_id in np.unique(cluster_ids):
+        model = models_by_cluster.get(cluster_id)
+        if model is None:
+            raise ValueError(f"[ERROR] 클러스터 '{cluster_id}'에 해당하는 모델이 없습니다.")
+        mask = cluster_ids == cluster_id
+        parts.append((mask, np.asarray(model.predict(X[mask]))))
+    if not parts:
+        return np.empty(0)
+
+    # 결과 dtype은 모든 클러스터 예측값 기준 (첫 클러스터 dtype으로 잘리는 것 방지)
+    y_pred = np.empty(len(cluster_ids), dtype=np.result_type(*(preds for _, preds in parts)))
+    for mask, preds in parts:
+        y_pred[mask] = preds
+    return y_pred
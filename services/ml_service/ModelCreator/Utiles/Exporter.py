@@ -1,8 +1,63 @@
+import os
+import json
+import time
 import joblib
 
-def save_model(model, path: str):
+# Windows: 다른 프로세스가 잠깐 열고 있는 파일은 os.replace가 PermissionError → 짧게 재시도
+_REPLACE_RETRIES = 10
+_REPLACE_WAIT_S = 0.2
+
+
+def _replace(tmp_path: str, path: str):
+    for i in range(_REPLACE_RETRIES):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if i == _REPLACE_RETRIES - 1:
+                raise
+            time.sleep(_REPLACE_WAIT_S)
+
+
+def save_model(model, path: str) -> str:
+    """
+    임시 파일에 저장 후 os.replace로 교체 (원자적)
+    - 예측 서버는 기본적으로 mmap 없이 로드(파일 핸들을 잡고 있지 않음) → 서비스 중에도 교체 가능
+    - 여러 파일로 된 모델 묶음은 마지막에 write_manifest로 완료 표시
+    """
+    tmp_path = f"{path}.tmp"
     try:
-        joblib.dump(model, path)
+        joblib.dump(model, tmp_path)
+        _replace(tmp_path, path)
         print(f"[저장 완료] 모델 → {path}")
+        return path
     except Exception as e:
-        raise RuntimeError(f"[ERROR] 모델 저장 실패 → {e}")
\ No newline at end of file
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except OSError:
+            pass
+        raise RuntimeError(f"[ERROR] 모델 저장 실패 → {e}")
+
+
+def manifest_path(model_dir: str, model_num: str, model_name: str, version: str) -> str:
+    """모델 묶음 완료 표시 파일 경로 (예측 서버 PickleLoader.manifest_path와 같은 규칙)"""
+    return os.path.join(model_dir, f"{model_num}_{model_name}_{version}.manifest.json")
+
+
+def write_manifest(paths: list, path: str) -> str:
+    """
+    모델 파일을 모두 저장한 뒤 마지막에 기록하는 완료 표시
+    - 파일별 (mtime_ns, size)를 담음 → 예측 서버는 이 파일이 바뀌고 목록과 실제 파일이 일치할 때만 교체
+    """
+    files = {}
+    for p in paths:
+        st = os.stat(p)
+        files[os.path.basename(p)] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    body = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "files": files}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(body, f, ensure_ascii=False, indent=2)
+    _replace(tmp_path, path)
+    print(f"[저장 완료] 매니페스트 → {path} ({len(files)}개 파일)")
+    return path
@@ -15,12 +15,18 @@ elif "Num02" in config_name:
 else:
     raise ValueError(f"[ERROR] 지원하지 않는 MODEL_NUM 또는 컨피그 이름: {config_name}")
 
+# 실행 모드: train(기본) | search(하이퍼파라미터 탐색 → _Tuned_ 컨피그 저장)
+run_mode = os.getenv("RUN_MODE", "train").strip().lower()
+
 def main():
-    print(f"[RUNNING] ModelCreator 파이프라인 시작 -> {config_name}")
+    print(f"[RUNNING] ModelCreator 파이프라인 시작 -> {config_name} (mode={run_mode})")
     start_time = time.time()
 
     controller = PipelineController(config_path=config_path)
-    controller.run()
+    if run_mode == "search":
+        controller.search()
+    else:
+        controller.run()
 
     print(f"[COMPLETE] 소요 시간: {time.time() - start_time:.2f}초")
 
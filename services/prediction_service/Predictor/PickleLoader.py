@@ -1,53 +1,182 @@
 import os
+import json
+import time
+import threading
 import joblib
 from core_utiles.config_loader import MODEL_SAVE_PATH
 
+# numpy 배열 기반 모델을 mmap으로 로드 → 페이지 캐시를 워커 프로세스끼리 공유 (기본 끔, "r"로 사용)
+# Windows에서는 mmap 중인 파일을 os.replace로 교체할 수 없어 재학습 내보내기가 실패 → 리눅스 배포에서만 켤 것
+MODEL_MMAP_MODE = (os.getenv("PREDICT_MODEL_MMAP", "") or "").strip().lower()
+MODEL_MMAP_MODE = None if MODEL_MMAP_MODE in ("", "none", "off") else MODEL_MMAP_MODE
+
+
+def _rss_bytes():
+    """현재 프로세스 RSS (psutil → /proc 순으로 시도, 불가하면 None)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def file_signature(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ModelRegistry:
+    """
+    프로세스 공용 모델 레지스트리
+    - 캐시 키: 경로 + (mtime, size) → 파일이 바뀌면 다음 get()에서 새로 로드 후 교체
+    - 교체는 dict 항목 단위 대입(원자적) — 기존 모델을 쓰는 요청은 끝까지 이전 객체 사용
+    - 경로별 락으로 동시 요청 시 중복 로드 방지
+    - 로드 시간 / RSS 증가량 / 파일 크기 기록
+    """
+    def __init__(self, mmap_mode=MODEL_MMAP_MODE):
+        self.mmap_mode = mmap_mode
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._entries = {}  # path -> {"sig", "model", "label", "load_ms", "rss_delta", "loads", "hits"}
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def get(self, path: str, label: str = ""):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"파일 없음: {path}")
+        sig = file_signature(path)
+        ent = self._entries.get(path)
+        if ent is not None and ent["sig"] == sig:
+            ent["hits"] += 1
+            return ent["model"]
+
+        with self._path_lock(path):
+            ent = self._entries.get(path)
+            sig = file_signature(path)
+            if ent is not None and ent["sig"] == sig:
+                return ent["model"]
+
+            print(f"[로딩] {label} -> {path}")
+            rss0 = _rss_bytes()
+            t0 = time.perf_counter()
+            model = joblib.load(path, mmap_mode=self.mmap_mode)
+            load_ms = (time.perf_counter() - t0) * 1000
+            rss1 = _rss_bytes()
+
+            self._entries[path] = {
+                "sig": sig,
+                "model": model,
+                "label": label,
+                "load_ms": round(load_ms, 1),
+                "rss_delta": (rss1 - rss0) if (rss0 is not None and rss1 is not None) else None,
+                "loads": (ent["loads"] + 1) if ent else 1,
+                "hits": 0,
+            }
+            if ent is not None:
+                print(f"[교체] {label} -> {path} (load_ms={load_ms:.1f})")
+            return model
+
+    def stats(self):
+        out = []
+        for path, ent in list(self._entries.items()):
+            rss = ent["rss_delta"]
+            out.append({
+                "label": ent["label"],
+                "path": path,
+                "mtime_ns": ent["sig"][0],
+                "file_mb": round(ent["sig"][1] / 2**20, 2),
+                "load_ms": ent["load_ms"],
+                "rss_delta_mb": round(rss / 2**20, 2) if rss is not None else None,
+                "mmap_mode": self.mmap_mode,
+                "loads": ent["loads"],
+                "hits": ent["hits"],
+            })
+        return out
+
+
+model_registry = ModelRegistry()
+
+
 class PickleLoader:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, registry: ModelRegistry = None):
         self.config = config
         self.models = {}
+        self.registry = registry or model_registry
 
         # __file__ 기준으로 경로 보정
         self.base_dir = os.path.normpath(
             os.path.join(os.path.dirname(__file__), MODEL_SAVE_PATH)
         )
 
-    def load(self):
+    def artifacts(self) -> list:
+        """설정이 요구하는 모델 파일 목록 [(키, 라벨, 경로)] — 키가 rfr_clusters 이면 리스트 항목"""
         model_num = self.config["MODEL_NUM"]
         model_name = self.config["MODEL_NAME"]
         version = self.config["SAVE_NAME_RULES"]["version"]
         suffix = self.config["SAVE_NAME_RULES"]["suffix"]
 
-        def build_filename(type_str: str) -> str:
-            return f"{model_num}_{model_name}_{type_str}_{version}{suffix}"
-
-        def safe_load(label: str, filename: str):
-            path = os.path.join(self.base_dir, filename)
-            print(f"[로딩] {label} -> {path}")
-            if not os.path.exists(path):
-                raise FileNotFoundError(f"파일 없음: {path}")
-            return joblib.load(path)
+        def path_of(type_str: str) -> str:
+            return os.path.join(self.base_dir, f"{model_num}_{model_name}_{type_str}_{version}{suffix}")
 
-        # 1. 스케일러 로딩
+        out = []
+        # 1. 스케일러
         if self.config.get("SCALER_CONFIG", {}).get("enabled", False):
-            scaler_filename = build_filename("ScalerModel")
-            self.models["scaler"] = safe_load("스케일러", scaler_filename)
+            out.append(("scaler", "스케일러", path_of("ScalerModel")))
 
-        # 2. 클러스터링 모델 로딩
+        # 2. 클러스터링 모델
         cluster_cfg = self.config.get("CLUSTER_CONFIG", {})
         if cluster_cfg.get("enabled", False):
-            cluster_filename = build_filename("ClusterModel")
-            self.models["cluster_model"] = safe_load("클러스터링 모델", cluster_filename)
-
+            out.append(("cluster_model", "클러스터링 모델", path_of("ClusterModel")))
             n_clusters = cluster_cfg["params"]["KMeans"]["n_clusters"]
-            self.models["rfr_clusters"] = []
-
             for i in range(n_clusters):
-                filename = build_filename(f"cluster_{i}")
-                self.models["rfr_clusters"].append(safe_load(f"클러스터 RFR({i})", filename))
+                out.append(("rfr_clusters", f"클러스터 RFR({i})", path_of(f"cluster_{i}")))
         else:
-            # 3. Full 모델 로딩
-            filename = build_filename("Full")
-            self.models["rfr_full"] = safe_load("Full RFR", filename)
+            # 3. Full 모델
+            out.append(("rfr_full", "Full RFR", path_of("Full")))
+        return out
+
+    def manifest_path(self) -> str:
+        """내보내기 완료 표시 파일 (ml_service Exporter.manifest_path와 같은 규칙)"""
+        rules = self.config["SAVE_NAME_RULES"]
+        return os.path.join(self.base_dir,
+                            f'{self.config["MODEL_NUM"]}_{self.config["MODEL_NAME"]}_{rules["version"]}.manifest.json')
 
+    def manifest_consistent(self) -> bool:
+        """매니페스트에 적힌 파일이 모두 기록된 (mtime, size) 그대로인지 — 다음 내보내기 진행 중이면 False"""
+        try:
+            with open(self.manifest_path(), "r", encoding="utf-8") as f:
+                files = json.load(f).get("files") or {}
+            for name, meta in files.items():
+                if file_signature(os.path.join(self.base_dir, name)) != (meta["mtime_ns"], meta["size"]):
+                    return False
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def signature(self) -> tuple:
+        """
+        재학습/내보내기 감지용 서명
+        - 매니페스트가 있으면 매니페스트 파일의 (경로, mtime, size) — 모든 모델 파일 저장 후 마지막에 기록되므로
+          이 값이 바뀌었을 때만 교체
+        - 없으면(이전 방식 내보내기) 모델 파일 (경로, mtime, size) 묶음
+        """
+        mpath = self.manifest_path()
+        if os.path.exists(mpath):
+            return ((mpath,) + file_signature(mpath),)
+        return tuple((path,) + file_signature(path) for _, _, path in self.artifacts())
+
+    def load(self):
+        for key, label, path in self.artifacts():
+            model = self.registry.get(path, label)
+            if key == "rfr_clusters":
+                self.models.setdefault("rfr_clusters", []).append(model)
+            else:
+                self.models[key] = model
         return self.models
@@ -0,0 +1,54 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class PredictionMemo:
+    """
+    예측 결과 메모 캐시 (LRU)
+    - key = sha256(모델 버전 + 입력 피처 벡터) → 모델이 바뀌면 키가 달라져 자연 무효화
+    - 같은 유저/학년을 다시 예측할 때 model.predict 생략
+    """
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _norm(v):
+        try:
+            return float(v)
+        except (TypeError, ValueError):
+            return str(v)
+
+    def key(self, model_version: str, features: list) -> str:
+        raw = json.dumps([model_version, [self._norm(v) for v in features]], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._data[key]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: float):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "max_entries": self.max_entries, **self._stats}
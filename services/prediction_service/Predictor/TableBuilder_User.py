@@ -5,11 +5,15 @@ from core_utiles.config_loader import OUTPUT_DIR
 import pandas as pd
 
 class TableBuilderUser:
-    def __init__(self, config: dict, conn=None, engine=None, models=None):
+    GRADES = ["1ST", "2ND", "3RD", "4TH"]
+
+    def __init__(self, config: dict, conn=None, engine=None, models=None, memo=None, model_version: str = ""):
         self.config = config
         self.conn = conn
         self.engine = engine
         self.models = models or PickleLoader(config=self.config).load()
+        self.memo = memo                    # PredictionMemo (선택)
+        self.model_version = model_version  # 메모 키에 포함
 
         self.csv_path = os.path.join(OUTPUT_DIR, "유저데이터.csv")
         icfg = self.config["PREDICTOR_CONFIG"]["IMPORT_CONFIG"]
@@ -57,9 +61,8 @@ class TableBuilderUser:
     def _load_library_data_db(self, snm: str, yr: int) -> dict:
         if self.conn is None:
             raise RuntimeError("DB 연결이 없습니다. conn=None")
-        prefix = self.import_cfg["DB_CONFIG"]["TABLE_PREFIX"]  # 예: ESTIMATIONFUTURE_YYYY or VIEW명 등
-        # 연도별 테이블 명 만들 필요가 있으면 여기서 조정
-        table_name = f"{prefix}_{yr}" if "{yr}" not in prefix else prefix.format(yr=yr)
+        # 예: ESTIMATIONFUTURE_YYYY or VIEW명 등 (연도별 테이블 명 규칙은 _lib_table_name)
+        table_name = self._lib_table_name(yr)
         query = f"SELECT * FROM {table_name} WHERE SNM = :1"
         df = pd.read_sql(query, con=self.conn, params=[snm])
         if df.empty:
@@ -67,6 +70,35 @@ class TableBuilderUser:
         row = df.iloc[0].to_dict()
         return {col: row.get(col, 0) for col in self.input_cols if col not in ["YR"] + self.user_features}
 
+    def _lib_table_name(self, yr: int) -> str:
+        prefix = self.import_cfg["DB_CONFIG"]["TABLE_PREFIX"]
+        return f"{prefix}_{yr}" if "{yr}" not in prefix else prefix.format(yr=yr)
+
+    def _lib_feats(self, row: dict) -> dict:
+        return {col: row.get(col, 0) for col in self.input_cols if col not in ["YR"] + self.user_features}
+
+    def _load_library_data_many(self, snms: list, yr: int) -> dict:
+        """한 연도의 여러 대학 피처를 1회 조회 → {snm: feats} (없는 대학은 빠짐)"""
+        ttype = self.import_cfg["TABLE_TYPE"]
+        if ttype == "CSV":
+            filename = f"{self.library_prefix}_종합데이터_{yr}.csv"
+            base_dir = os.path.dirname(__file__)
+            rel_path = os.path.normpath(os.path.join(base_dir, "..", "..", "..", self.data_dir))
+            df = pd.read_csv(os.path.join(rel_path, filename))
+        elif ttype == "DB":
+            if self.conn is None:
+                raise RuntimeError("DB 연결이 없습니다. conn=None")
+            binds = ", ".join(f":{i + 1}" for i in range(len(snms)))
+            query = f"SELECT * FROM {self._lib_table_name(yr)} WHERE SNM IN ({binds})"
+            df = pd.read_sql(query, con=self.conn, params=list(snms))
+        else:
+            raise ValueError(f"[ERROR] 지원되지 않는 TABLE_TYPE: {ttype}")
+
+        if df.empty:
+            return {}
+        df = df[df["SNM"].isin(snms)].drop_duplicates("SNM", keep="first")
+        return {row["SNM"]: self._lib_feats(row) for row in df.to_dict("records")}
+
     def _load_library_data(self, snm: str, yr: int) -> dict:
         ttype = self.import_cfg["TABLE_TYPE"]
         if ttype == "CSV":
@@ -91,6 +123,43 @@ class TableBuilderUser:
 
         return model.predict(X)
 
+    def _predict_rows(self, rows: list) -> list:
+        """여러 행 일괄 예측 (클러스터 사용 시 행별 클러스터로 묶어서 예측)"""
+        X = pd.DataFrame(rows, columns=self.input_cols)
+
+        if self.config["SCALER_CONFIG"].get("enabled", False):
+            X = pd.DataFrame(self.models["scaler"].transform(X), columns=self.input_cols)
+
+        if not self.config["CLUSTER_CONFIG"].get("enabled", False):
+            return [float(p) for p in self.models["rfr_full"].predict(X)]
+
+        cluster_ids = self.models["cluster_model"].predict(X)
+        out = [None] * len(rows)
+        for cid in sorted(set(cluster_ids)):
+            idx = [i for i, c in enumerate(cluster_ids) if c == cid]
+            preds = self.models["rfr_clusters"][cid].predict(X.iloc[idx])
+            for i, p in zip(idx, preds):
+                out[i] = float(p)
+        return out
+
+    def _predict_rows_safe(self, rows: list) -> list:
+        """
+        일괄 예측, 실패 시 행 단위로 재시도 → 실패한 행만 None
+        (잘못된 입력 1건 때문에 같은 배치의 다른 유저 결과까지 None이 되지 않도록)
+        """
+        try:
+            return self._predict_rows(rows)
+        except Exception as e:
+            print(f"[WARN] 일괄 예측 실패 → 행 단위 재시도 ({len(rows)}행) ➜ {e}")
+        preds = []
+        for row in rows:
+            try:
+                preds.append(self._predict_rows([row])[0])
+            except Exception as e:
+                print(f"[ERROR] 예측 실패 ➜ {e}")
+                preds.append(None)
+        return preds
+
     # === 배치 실행 ===
     def run(self):
         df = self.predict()
@@ -142,41 +211,80 @@ class TableBuilderUser:
           ...
         }
         """
-        required_base = ["USR_SNM"]
-        for k in required_base:
-            if k not in payload or str(payload[k]).strip() == "":
-                raise ValueError(f"필수 항목 누락: {k}")
-
-        snm = payload["USR_SNM"]
-        results = {}
+        result = self.predict_from_payloads([payload])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-        for nth in ["1ST", "2ND", "3RD", "4TH"]:
-            yr_key = f"{nth}_YR"
-            cps_key = f"{nth}_USR_CPS"
-            lps_key = f"{nth}_USR_LPS"
-            vps_key = f"{nth}_USR_VPS"
-
-            if yr_key not in payload:
-                continue  # 해당 학년 미입력시 스킵
+    def predict_from_payloads(self, payloads: list) -> list:
+        """
+        여러 유저 payload 일괄 예측 → payload 순서대로 {SCR_EST_*: 값|None} 또는 Exception
+        - 대학 피처: 연도별 1회 조회 (WHERE SNM IN ...)
+        - 메모 캐시(모델 버전 + 피처 벡터) 적중분은 예측 생략, 나머지는 model.predict 1회
+        - 학년 단위 실패는 기존과 같이 해당 SCR_EST_* = None (일괄 예측 실패 시 행 단위로 재시도)
+        """
+        results = []
+        records = []  # (결과 인덱스, 라벨, 연도, 유저 피처)
+        for i, payload in enumerate(payloads):
+            payload = payload if isinstance(payload, dict) else {}
+            if "USR_SNM" not in payload or str(payload["USR_SNM"]).strip() == "":
+                results.append(ValueError("필수 항목 누락: USR_SNM"))
+                continue
+            results.append({})
+            for nth in self.GRADES:
+                yr_key = f"{nth}_YR"
+                if yr_key not in payload:
+                    continue  # 해당 학년 미입력시 스킵
+                label = f"SCR_EST_{nth}"
+                try:
+                    yr = int(payload[yr_key])
+                    feats = {
+                        "CPSS_CPS": float(payload.get(f"{nth}_USR_CPS", 0) or 0),
+                        "LPS_LPS": float(payload.get(f"{nth}_USR_LPS", 0) or 0),
+                        "VPS_VPS": float(payload.get(f"{nth}_USR_VPS", 0) or 0),
+                    }
+                    records.append((i, label, yr, payload["USR_SNM"], feats))
+                except Exception:
+                    results[i][label] = None
 
+        # 대학 피처: 연도별 1회
+        by_year = {}
+        for _, _, yr, snm, _ in records:
+            by_year.setdefault(yr, set()).add(snm)
+        lib = {}
+        for yr, snms in by_year.items():
             try:
-                yr = int(payload[yr_key])
-                cps = float(payload.get(cps_key, 0) or 0)
-                lps = float(payload.get(lps_key, 0) or 0)
-                vps = float(payload.get(vps_key, 0) or 0)
-
-                lib_feats = self._load_library_data(snm, yr)
-                merged = {
-                    "YR": yr,
-                    "CPSS_CPS": cps,
-                    "LPS_LPS": lps,
-                    "VPS_VPS": vps,
-                    **lib_feats
-                }
-                df_input = pd.DataFrame([merged])
-                pred = float(self._predict_df(df_input)[0])
-                results[f"SCR_EST_{nth}"] = pred
+                lib[yr] = self._load_library_data_many(sorted(snms), yr)
             except Exception as e:
-                results[f"SCR_EST_{nth}"] = None
+                print(f"[ERROR] 대학 피처 조회 실패 ({yr}) ➜ {e}")
+                lib[yr] = {}
+
+        # 메모 조회 → 미스만 일괄 예측
+        pending = []  # (결과 인덱스, 라벨, 메모 키, 피처 벡터)
+        for i, label, yr, snm, feats in records:
+            lib_feats = lib[yr].get(snm)
+            if lib_feats is None:
+                results[i][label] = None
+                continue
+            merged = {"YR": yr, **feats, **lib_feats}
+            row = [merged[c] for c in self.input_cols]
+            key = self.memo.key(self.model_version, row) if self.memo is not None else None
+            hit = self.memo.get(key) if key is not None else None
+            if hit is not None:
+                results[i][label] = hit
+            else:
+                pending.append((i, label, key, row))
+
+        if pending:
+            preds = self._predict_rows_safe([row for _, _, _, row in pending])
+            for (i, label, key, _), pred in zip(pending, preds):
+                results[i][label] = pred
+                if key is not None and pred is not None:
+                    self.memo.put(key, pred)
 
-        return results
+        # 학년 순서 유지
+        return [
+            r if isinstance(r, Exception)
+            else {f"SCR_EST_{n}": r[f"SCR_EST_{n}"] for n in self.GRADES if f"SCR_EST_{n}" in r}
+            for r in results
+        ]
@@ -1,5 +1,5 @@
 import os, time, json, sys
-import logging, uuid
+import logging, uuid, threading, hashlib
 from flask import Flask, request, jsonify, g
 from dotenv import load_dotenv
 
@@ -15,8 +15,9 @@ for p in [PROJECT_ROOT, BASE_DIR]:
         sys.path.insert(0, p)
 
 from core_utiles.OracleDBConnection import OracleDBConnection
-from Predictor.PickleLoader import PickleLoader
+from Predictor.PickleLoader import PickleLoader, model_registry
 from Predictor.TableBuilder_User import TableBuilderUser
+from Predictor.PredictionCache import PredictionMemo
 
 # === 로깅 설정 ===
 logging.basicConfig(
@@ -29,22 +30,107 @@ werklog.setLevel(logging.INFO)
 
 app = Flask(__name__)
 
-# 전역 모델 캐시 (읽기 전용 사용)
+# 전역 모델 캐시 (읽기 전용 사용, 교체 시 dict 통째로 재대입)
 _MODEL_BUNDLE = {}
+_BUNDLE_LOCK = threading.Lock()
+_BUNDLE_CHECKED_AT = 0.0
+# 모델 파일 변경 확인 주기 / 마지막 변경 후 안정화 대기(매니페스트 없는 이전 방식 내보내기에서만 사용)
+MODEL_CHECK_INTERVAL_S = float(os.getenv("PREDICT_MODEL_CHECK_S", "5") or 0)
+MODEL_SETTLE_S = float(os.getenv("PREDICT_MODEL_SETTLE_S", "2") or 0)
+
+# 프로세스 공용 DB 엔진(커넥션 풀) / 예측 메모 캐시
+_DB_ENGINE = None
+_DB_LOCK = threading.Lock()
+_PREDICT_MEMO = PredictionMemo(int(os.getenv("PREDICT_MEMO_SIZE", "4096") or 0))
+PREDICT_BATCH_MAX = int(os.getenv("PREDICT_BATCH_MAX", "500") or 500)
+
+def get_db_engine():
+    """SQLAlchemy 엔진(풀)을 1회 생성 후 재사용."""
+    global _DB_ENGINE
+    if _DB_ENGINE is None:
+        with _DB_LOCK:
+            if _DB_ENGINE is None:
+                db = OracleDBConnection()  # Instant Client 초기화 포함
+                _DB_ENGINE = db.create_pooled_engine(
+                    pool_size=int(os.getenv("PREDICT_DB_POOL_SIZE", "4") or 4),
+                    max_overflow=int(os.getenv("PREDICT_DB_POOL_OVERFLOW", "4") or 0),
+                )
+                log.info("DB engine pool created")
+    return _DB_ENGINE
+
+def _run_predictions(payloads):
+    """풀에서 연결을 빌려 일괄 예측 (단건/배치 공용)"""
+    bundle = get_model_bundle()
+    engine = get_db_engine()
+    raw = engine.raw_connection()
+    try:
+        tb = TableBuilderUser(
+            config=bundle["config"],
+            conn=raw.driver_connection,
+            engine=engine,
+            models=bundle["models"],
+            memo=_PREDICT_MEMO,
+            model_version=bundle["version"],
+        )
+        return tb.predict_from_payloads(payloads)
+    finally:
+        raw.close()  # 풀에 반납
+
+def _load_bundle(cfg, cfg_name):
+    loader = PickleLoader(cfg)
+    sig = loader.signature()
+    models = loader.load()
+    rules = cfg.get("SAVE_NAME_RULES", {})
+    sig_hash = hashlib.sha1(repr(sig).encode()).hexdigest()[:12]
+    version = f'{cfg.get("MODEL_NUM")}_{cfg.get("MODEL_NAME")}_{rules.get("version")}@{sig_hash}'
+    log.info(f"Model bundle loaded: {cfg_name} version={version}")
+    return {"config": cfg, "models": models, "version": version, "signature": sig, "loader": loader}
 
 def get_model_bundle():
-    """모델/설정 번들을 1회 로드 후 캐시."""
-    global _MODEL_BUNDLE
-    if _MODEL_BUNDLE:
+    """
+    모델/설정 번들을 1회 로드 후 캐시.
+    - MODEL_CHECK_INTERVAL_S마다 매니페스트(없으면 모델 파일 mtime/size)를 확인, 바뀌었으면 새 번들로 교체(핫 스왑)
+    - 진행 중인 요청은 이전 번들을 그대로 사용
+    """
+    global _MODEL_BUNDLE, _BUNDLE_CHECKED_AT
+    bundle = _MODEL_BUNDLE
+    now = time.monotonic()
+    if bundle and now - _BUNDLE_CHECKED_AT < MODEL_CHECK_INTERVAL_S:
+        return bundle
+
+    with _BUNDLE_LOCK:
+        bundle = _MODEL_BUNDLE
+        if bundle and time.monotonic() - _BUNDLE_CHECKED_AT < MODEL_CHECK_INTERVAL_S:
+            return bundle
+        if not bundle:
+            cfg_name = os.getenv("MODEL_CONFIG_NAME", "Num01_Config_XGB.json")
+            cfg_path = os.path.join(PROJECT_ROOT, "ml_service", "_Configs", cfg_name)
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                cfg = json.load(f)
+            _MODEL_BUNDLE = _load_bundle(cfg, cfg_name)
+        else:
+            try:
+                sig = bundle["loader"].signature()
+            except FileNotFoundError as e:
+                log.warning(f"model artifact missing, keep current bundle: {e}")
+                sig = bundle["signature"]
+            loader = bundle["loader"]
+            if os.path.exists(loader.manifest_path()):
+                # 매니페스트(내보내기 완료 표시)가 바뀌었고 적힌 파일과 실제 파일이 일치할 때만 교체
+                settled = loader.manifest_consistent()
+            else:
+                newest_ns = max((s[1] for s in sig), default=0)
+                settled = time.time() - newest_ns / 1e9 >= MODEL_SETTLE_S
+            if sig != bundle["signature"] and settled:
+                try:
+                    _MODEL_BUNDLE = _load_bundle(bundle["config"], "hot-swap")
+                except Exception as e:
+                    log.exception(f"model hot swap failed, keep current bundle: {e}")
+            elif sig != bundle["signature"]:
+                # 아직 내보내는 중일 수 있음 → 다음 요청에서 재확인
+                return bundle
+        _BUNDLE_CHECKED_AT = time.monotonic()
         return _MODEL_BUNDLE
-    cfg_name = os.getenv("MODEL_CONFIG_NAME", "Num01_Config_XGB.json")
-    cfg_path = os.path.join(PROJECT_ROOT, "ml_service", "_Configs", cfg_name)
-    with open(cfg_path, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
-    models = PickleLoader(cfg).load()
-    _MODEL_BUNDLE = {"config": cfg, "models": models}
-    log.info(f"Model bundle loaded: {cfg_name}")
-    return _MODEL_BUNDLE
 
 # === 요청 로깅 훅 ===
 @app.before_request
@@ -100,20 +186,9 @@ def predict_user():
     log.info(f"[{rid}] predict start payload_keys={list(payload.keys())}")
 
     try:
-        bundle = get_model_bundle()
-
-        db = OracleDBConnection()
-        db.connect()
-        try:
-            tb = TableBuilderUser(
-                config=bundle["config"],
-                conn=db.conn,
-                engine=db.engine,
-                models=bundle["models"]
-            )
-            preds = tb.predict_from_payload(payload)
-        finally:
-            db.close()
+        preds = _run_predictions([payload])[0]
+        if isinstance(preds, Exception):
+            raise preds
 
         ms = int((time.time() - t0) * 1000)
         log.info(f"[{rid}] predict ok elapsed_ms={ms}")
@@ -124,6 +199,46 @@ def predict_user():
         log.exception(f"[{rid}] predict failed: {e}")
         return jsonify(success=False, error=str(e), request_id=rid), 400
 
+@app.post("/predict/batch")
+def predict_batch():
+    """
+    요청 JSON: {"items": [payload, ...]} 또는 [payload, ...] (payload 형식은 /predict/user 와 동일)
+    응답 JSON: results[i] = {success, predictions} | {success: false, error} (요청 순서 유지)
+    """
+    rid = getattr(g, "request_id", "-")
+    t0 = time.time()
+    body = request.get_json(silent=True)
+    items = body if isinstance(body, list) else (body or {}).get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify(success=False, error="items(list)가 필요합니다.", request_id=rid), 400
+    if len(items) > PREDICT_BATCH_MAX:
+        return jsonify(success=False, error=f"최대 {PREDICT_BATCH_MAX}건까지 요청할 수 있습니다.", request_id=rid), 400
+
+    log.info(f"[{rid}] predict batch start items={len(items)}")
+    try:
+        outs = _run_predictions(items)
+    except Exception as e:
+        log.exception(f"[{rid}] predict batch failed: {e}")
+        return jsonify(success=False, error=str(e), request_id=rid), 400
+
+    results = [
+        {"success": False, "error": str(o)} if isinstance(o, Exception) else {"success": True, "predictions": o}
+        for o in outs
+    ]
+    ms = int((time.time() - t0) * 1000)
+    log.info(f"[{rid}] predict batch ok items={len(items)} elapsed_ms={ms}")
+    return jsonify(success=True, results=results, count=len(results), elapsed_ms=ms)
+
+@app.get("/predict/stats")
+def predict_stats():
+    pool = _DB_ENGINE.pool.status() if _DB_ENGINE is not None else None
+    return jsonify(
+        model_version=_MODEL_BUNDLE.get("version"),
+        memo=_PREDICT_MEMO.stats(),
+        db_pool=pool,
+        models=model_registry.stats(),
+    )
+
 # === 개발 실행 ===
 if __name__ == "__main__":
     port = int(os.getenv("PREDICT_API_PORT", "5100"))
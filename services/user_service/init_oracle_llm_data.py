@@ -137,7 +137,7 @@ END;
 
 create_seq_msg_sql = """
 BEGIN
-  EXECUTE IMMEDIATE 'CREATE SEQUENCE SEQ_LLM_MSG START WITH 1 INCREMENT BY 1 NOCACHE';
+  EXECUTE IMMEDIATE 'CREATE SEQUENCE SEQ_LLM_MSG START WITH 1 INCREMENT BY 1 CACHE 100';
 EXCEPTION
   WHEN OTHERS THEN
     IF SQLCODE != -955 THEN
@@ -146,6 +146,9 @@ EXCEPTION
 END;
 """
 
+# 기존 NOCACHE 시퀀스 보정: 메시지 INSERT마다 딕셔너리 갱신이 일어나지 않도록 CACHE 적용
+alter_seq_msg_cache_sql = "ALTER SEQUENCE SEQ_LLM_MSG CACHE 100"
+
 try:
     cur.execute(create_table_sql)
     print("✅ LLM_DATA 테이블 준비 완료(있으면 스킵).")
@@ -161,7 +164,8 @@ try:
     # 시퀀스
     cur.execute(create_seq_conv_sql)
     cur.execute(create_seq_msg_sql)
-    print("✅ 시퀀스 SEQ_LLM_CONV / SEQ_LLM_MSG 준비 완료(있으면 스킵).")
+    cur.execute(alter_seq_msg_cache_sql)
+    print("✅ 시퀀스 SEQ_LLM_CONV / SEQ_LLM_MSG 준비 완료(있으면 스킵, MSG는 CACHE 100).")
 
     conn.commit()
     print("🎉 멀티턴용 LLM_DATA 초기화 완료.")
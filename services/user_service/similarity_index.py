@@ -0,0 +1,178 @@
+# services/user_service/similarity_index.py
+import os
+import re
+import time
+import threading
+
+import numpy as np
+
+# 테이블 버전(LAST_DDL_TIME) 재확인 주기(초). sync 경로는 invalidate()로 즉시 무효화
+VERSION_TTL_S = float(os.getenv("USER_ANALYSIS_INDEX_TTL_S", "30") or 0)
+
+_SCORE_COL = re.compile(r"^SCR_EST_(\d{4})$")
+
+
+class _Snapshot:
+    """
+    ESTIMATIONFUTURE 1회 적재본 (불변)
+    - scores: (대학 수 × 연도 수) 행렬, 값 없음 = NaN
+    - 연도별 내림차순 정렬 인덱스 → 유저 점수 주변 순위 창(window) 조회
+    - 연도 축 z-정규화 + L2 정규화 벡터 → 코사인 최근접 대학 조회
+    """
+    def __init__(self, version, names, years, scores):
+        self.version = version
+        self.names = list(names)
+        self.years = list(years)
+        self.scores = scores
+        self._row = {n: i for i, n in enumerate(self.names)}
+        self._col = {y: j for j, y in enumerate(self.years)}
+
+        # 연도별 정렬 (안정 정렬: 동점은 원래 순서 유지 — 프런트 Array.sort와 동일)
+        self._order = {}
+        for y, j in self._col.items():
+            col = scores[:, j]
+            idx = np.flatnonzero(~np.isnan(col))
+            self._order[y] = idx[np.argsort(-col[idx], kind="stable")]
+
+        # 코사인용 정규화 행렬 (결측은 연도 평균 = z 0)
+        if scores.size:
+            present = ~np.isnan(scores)
+            cnt = np.maximum(present.sum(axis=0), 1)
+            filled = np.where(present, scores, 0.0)
+            mean = filled.sum(axis=0) / cnt
+            std = np.sqrt((np.where(present, scores - mean, 0.0) ** 2).sum(axis=0) / cnt)
+            std[std == 0] = 1.0
+            z = np.where(present, (filled - mean) / std, 0.0)
+            norm = np.linalg.norm(z, axis=1, keepdims=True)
+            norm[norm == 0] = 1.0
+            self._unit = z / norm
+        else:
+            self._unit = np.zeros((0, 0))
+
+    def score_of(self, snm, year):
+        i, j = self._row.get(snm), self._col.get(year)
+        if i is None or j is None:
+            return None
+        v = self.scores[i, j]
+        return None if np.isnan(v) else float(v)
+
+    def all_scores(self, year):
+        order = self._order.get(year)
+        if order is None:
+            return []
+        col = self.scores[:, self._col[year]]
+        return [{'SNM': self.names[i], 'score': float(col[i])} for i in order]
+
+    def rank_window(self, year, score, k):
+        """
+        유저 점수 기준 순위 주변 k개 (위 k//2, 아래 나머지)
+        - 프런트 findSimilar(±2)가 전체 목록과 같은 결과를 내도록 위 2개·아래 3개 이상 보장
+        """
+        order = self._order.get(year)
+        if order is None or score is None:
+            return []
+        col = self.scores[:, self._col[year]]
+        desc = col[order]
+        rank = int(np.searchsorted(-desc, -float(score), side="left"))  # 유저보다 높은 점수 개수
+        above = max(2, k // 2)
+        below = max(3, k - above)
+        lo, hi = max(0, rank - above), min(len(order), rank + below)
+        return [{'SNM': self.names[i], 'score': float(col[i])} for i in order[lo:hi]]
+
+    def nearest(self, snm, k):
+        """SCR_EST_* 벡터 코사인 유사도 상위 k개 대학 (자기 자신 제외)"""
+        i = self._row.get(snm)
+        if i is None or not len(self.names):
+            return []
+        sims = self._unit @ self._unit[i]
+        sims[i] = -np.inf
+        k = min(k, len(self.names) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return [{'SNM': self.names[t], 'similarity': round(float(sims[t]), 4)} for t in top]
+
+
+class UnivSimilarityIndex:
+    """
+    유사대학 인덱스 (테이블 버전별 1회 적재)
+    - get(conn): 버전(LAST_DDL_TIME)이 바뀌었거나 invalidate() 이후면 재적재
+    - 요청마다 전체 테이블을 읽지 않고 메모리 행렬에서 조회
+    """
+    def __init__(self, table="ESTIMATIONFUTURE"):
+        self.table = table
+        self._lock = threading.Lock()
+        self._snap = None
+        self._checked_at = 0.0
+        self._stats = {"builds": 0, "hits": 0, "version_checks": 0}
+
+    def invalidate(self):
+        with self._lock:
+            self._snap = None
+            self._checked_at = 0.0
+
+    def _version(self, cur):
+        cur.execute(
+            "SELECT LAST_DDL_TIME FROM USER_OBJECTS WHERE OBJECT_NAME = :t AND OBJECT_TYPE = 'TABLE'",
+            {'t': self.table},
+        )
+        r = cur.fetchone()
+        return r[0] if r else None
+
+    def _build(self, cur, version):
+        cur.execute(
+            "SELECT COLUMN_NAME FROM USER_TAB_COLUMNS WHERE TABLE_NAME = :t ORDER BY COLUMN_ID",
+            {'t': self.table},
+        )
+        cols = [(c, int(m.group(1))) for (c,) in cur.fetchall() for m in [_SCORE_COL.match(c)] if m]
+        cols.sort(key=lambda x: x[1])
+        if not cols:
+            return _Snapshot(version, [], [], np.zeros((0, 0)))
+        cur.arraysize = 1000
+        cur.execute(f"SELECT SNM, {', '.join(c for c, _ in cols)} FROM {self.table}")
+        names, rows = [], []
+        for r in cur:
+            names.append(r[0])
+            rows.append([np.nan if v is None else v for v in r[1:]])
+        scores = np.array(rows, dtype=float).reshape(len(rows), len(cols))
+        print(f'[analysis] similarity index built => univs={len(names)} years={[y for _, y in cols]}')
+        return _Snapshot(version, names, [y for _, y in cols], scores)
+
+    def get(self, conn):
+        now = time.monotonic()
+        with self._lock:
+            snap = self._snap
+            if snap is not None and now - self._checked_at < VERSION_TTL_S:
+                self._stats["hits"] += 1
+                return snap
+
+        cur = conn.cursor()
+        try:
+            version = self._version(cur)
+            with self._lock:
+                self._stats["version_checks"] += 1
+            if snap is None or snap.version != version:
+                snap = self._build(cur, version)
+                with self._lock:
+                    self._stats["builds"] += 1
+            with self._lock:
+                self._snap = snap
+                self._checked_at = now
+            return snap
+        finally:
+            cur.close()
+
+    def stats(self):
+        with self._lock:
+            snap = self._snap
+            return {
+                "loaded": snap is not None,
+                "version": str(snap.version) if snap else None,
+                "univs": len(snap.names) if snap else 0,
+                "years": snap.years if snap else [],
+                **self._stats,
+            }
+
+
+similarity_index = UnivSimilarityIndex()
@@ -1,13 +1,18 @@
 # services/user_service/user_analysis.py
 import os, requests
 import cx_Oracle
-from flask import Blueprint, jsonify, session
+from flask import Blueprint, jsonify, session, request
 from services.web_frontend.api.oracle_utils import get_connection
+from services.user_service.similarity_index import similarity_index
 
 bp_user_analysis = Blueprint('bp_user_analysis', __name__, url_prefix='/api/user')
 
 DATA_SERVICE_BASE = os.getenv('DATA_SERVICE_URL', 'http://localhost:5050')
 
+# 유사대학 개수 (?k=)
+SIMILAR_K_DEFAULT = 10
+SIMILAR_K_MAX = 200
+
 
 def _q(col: str) -> str:
     """숫자로 시작하거나 identifier가 아니면 쿼트."""
@@ -53,6 +58,41 @@ def fetch_univ_metrics(snm: str, year: int):
     return {'CPS': f(data.get('CPS')), 'LPS': f(data.get('LPS')), 'VPS': f(data.get('VPS'))}
 
 
+def fetch_univ_metrics_batch(snm: str, years):
+    """
+    연도별 대학 3종을 배치 엔드포인트 1회로 조회 → {year: {'CPS','LPS','VPS'}}
+    - 배치 호출이 실패하면 기존 연도별 호출로 폴백
+    """
+    years = sorted({int(y) for y in years})
+    if not years:
+        return {}
+    url = f"{DATA_SERVICE_BASE}/api/num06-metrics/batch"
+    try:
+        r = requests.get(url, params={"snm": snm, "years": ",".join(map(str, years))}, timeout=5)
+        body = r.json() if r.ok else {}
+    except (requests.RequestException, ValueError) as e:
+        print('[analysis][WARN] 5050 배치 연결 실패:', e)
+        body = {}
+
+    if not body.get('success'):
+        print('[analysis][WARN] 5050 배치 실패 → 연도별 조회로 폴백')
+        return {y: fetch_univ_metrics(snm, y) for y in years}
+
+    def f(x):
+        try: return float(x)
+        except: return 0.0
+    per_year = (body.get('data') or {}).get(snm) or {}
+    out = {}
+    for y in years:
+        d = per_year.get(str(y))
+        if d:
+            out[y] = {'CPS': f(d.get('CPS')), 'LPS': f(d.get('LPS')), 'VPS': f(d.get('VPS'))}
+        else:
+            # 단건 API의 404(행/테이블 없음)와 동일 취급
+            out[y] = {'CPS': 0, 'LPS': 0, 'VPS': 0, '_err': 'api-failed'}
+    return out
+
+
 def fetch_all_univ_scores(year: int, conn):
     """유사대학 비교용: 특정 연도의 모든 대학 점수(SNM, score)"""
     score_col = f"SCR_EST_{year}"
@@ -76,6 +116,25 @@ def fetch_all_univ_scores(year: int, conn):
             cur.close()
 
 
+def _grade_payload(year, cps, lps, vps, user_scr, univ_metrics, univ_scr, by_scores):
+    return {
+        'year': year,
+        'userData': {
+            'CPS': _to_float_or_none(cps) or 0,
+            'LPS': _to_float_or_none(lps) or 0,
+            'VPS': _to_float_or_none(vps) or 0
+        },
+        'universityData': {
+            'CPS': _to_float_or_none(univ_metrics.get('CPS')) or 0,
+            'LPS': _to_float_or_none(univ_metrics.get('LPS')) or 0,
+            'VPS': _to_float_or_none(univ_metrics.get('VPS')) or 0
+        },
+        'userScore': _to_float_or_none(user_scr),
+        'universityScore': univ_scr,
+        'byYearScores': by_scores
+    }
+
+
 @bp_user_analysis.get('/analysis')
 def analysis():
     usr_id = session.get('user')
@@ -84,6 +143,12 @@ def analysis():
 
     print('[analysis] user =>', usr_id)
 
+    try:
+        k = int(request.args.get('k', SIMILAR_K_DEFAULT))
+    except ValueError:
+        return jsonify(success=False, error='k 는 정수여야 합니다.'), 400
+    k = max(1, min(k, SIMILAR_K_MAX))
+
     conn = None
     cur = None
     try:
@@ -136,6 +201,27 @@ def analysis():
 
         print('[analysis] basics =>', {'usr_name': usr_name, 'usr_snm': usr_snm, 'y1': y1, 'y2': y2, 'y3': y3, 'y4': y4})
 
+        # 대학 3종(5050 자리): 학년별 연도를 모아 배치 1회 조회
+        valid_years = []
+        for y in (y1, y2, y3, y4):
+            try:
+                if y:
+                    valid_years.append(int(y))
+            except Exception:
+                pass
+        try:
+            univ_metrics_by_year = fetch_univ_metrics_batch(usr_snm, valid_years)
+        except Exception as e:
+            print('[analysis][WARN] fetch_univ_metrics_batch 실패:', e)
+            univ_metrics_by_year = {}
+
+        # 유사대학 인덱스 (테이블 버전별 1회 적재) — 실패 시 기존 테이블 스캔으로 폴백
+        try:
+            index = similarity_index.get(conn)
+        except Exception as e:
+            print('[analysis][WARN] similarity index 실패 → 테이블 스캔:', e)
+            index = None
+
         def build_grade(year, cps, lps, vps, user_scr):
             if not year:
                 return None
@@ -148,11 +234,15 @@ def analysis():
             print(f'[analysis] build grade {year}')
 
             # 대학 3종(5050 자리)
-            try:
-                univ_metrics = fetch_univ_metrics(usr_snm, year)
-            except Exception as e:
-                print('[analysis][WARN] fetch_univ_metrics 실패:', e)
-                univ_metrics = {'CPS': 0, 'LPS': 0, 'VPS': 0}
+            univ_metrics = univ_metrics_by_year.get(year) or {'CPS': 0, 'LPS': 0, 'VPS': 0}
+
+            if index is not None:
+                # 유사대학 풀: 유저 점수 순위 주변 k개 / 소속대학 점수
+                return _grade_payload(
+                    year, cps, lps, vps, user_scr, univ_metrics,
+                    index.score_of(usr_snm, year),
+                    index.rank_window(year, _to_float_or_none(user_scr), k),
+                )
 
             # 유사대학 풀
             try:
@@ -178,22 +268,7 @@ def analysis():
                 if c2:
                     c2.close()
 
-            return {
-                'year': year,
-                'userData': {
-                    'CPS': _to_float_or_none(cps) or 0,
-                    'LPS': _to_float_or_none(lps) or 0,
-                    'VPS': _to_float_or_none(vps) or 0
-                },
-                'universityData': {
-                    'CPS': _to_float_or_none(univ_metrics.get('CPS')) or 0,
-                    'LPS': _to_float_or_none(univ_metrics.get('LPS')) or 0,
-                    'VPS': _to_float_or_none(univ_metrics.get('VPS')) or 0
-                },
-                'userScore': _to_float_or_none(user_scr),
-                'universityScore': univ_scr,
-                'byYearScores': by_scores
-            }
+            return _grade_payload(year, cps, lps, vps, user_scr, univ_metrics, univ_scr, by_scores)
 
         grades = {
             1: build_grade(y1, cps1, lps1, vps1, scr1),
@@ -203,8 +278,12 @@ def analysis():
         }
         grades = {k: v for k, v in grades.items() if v}
 
+        # 연도 점수 벡터(SCR_EST_*)가 비슷한 대학
+        similar = index.nearest(usr_snm, k) if index is not None else []
+
         print('[analysis] grades keys =>', list(grades.keys()))
-        return jsonify(success=True, user={'name': usr_name, 'snm': usr_snm}, grades=grades)
+        return jsonify(success=True, user={'name': usr_name, 'snm': usr_snm}, grades=grades,
+                       similarUniversities=similar)
 
     except cx_Oracle.DatabaseError as e:
         print('[analysis][ERR] DB 오류:', e)
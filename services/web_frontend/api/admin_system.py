@@ -104,11 +104,21 @@ def clear_llm_data():
 
         conn.commit()
 
+        # LLM 서버의 대화 tail 캐시 무효화 (실패해도 삭제 결과는 유지)
+        cache_cleared = None
+        try:
+            r = requests.post("http://127.0.0.1:5150/dev/history-cache/clear", timeout=3)
+            if r.ok:
+                cache_cleared = (r.json() or {}).get("cleared")
+        except requests.exceptions.RequestException:
+            pass
+
         return jsonify({
             "success": True,
             "message": f"{deleted_count}건의 LLM 대화 데이터가 삭제되었습니다.",
             "deleted": deleted_count,
-            "count_before": count_before
+            "count_before": count_before,
+            "cache_cleared": cache_cleared
         })
     except Exception as e:
         if conn:
@@ -1,5 +1,6 @@
 import os
 import re
+import json
 import requests
 import pandas as pd
 import cx_Oracle
@@ -43,10 +44,19 @@ def sync_estimation():
     """libra_data → libra_web 스키마 동기화"""
     
     try:
-        # 1. API에서 데이터 수신
-        response = requests.get("http://localhost:5050/api/get-estimationfuture", timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        # 1. API에서 데이터 수신 (NDJSON 스트림 → 도착하는 대로 행 단위 파싱)
+        with requests.get(
+            "http://localhost:5050/api/get-estimationfuture",
+            params={"format": "ndjson"},
+            timeout=30,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            if response.headers.get("Content-Type", "").startswith("application/json"):
+                # 스트림 시작 전 오류는 기존처럼 {'error': ...} JSON
+                data = response.json()
+            else:
+                data = [json.loads(line) for line in response.iter_lines() if line]
         
         if isinstance(data, dict) and 'error' in data:
             return jsonify({'message': f'data_service 에러: {data["error"]}'})
@@ -129,6 +139,13 @@ def sync_estimation():
         
         cursor.execute("SELECT USER FROM DUAL")
         actual_user = cursor.fetchone()[0]
+
+        # 유사대학 인덱스 즉시 재적재 대상으로 표시
+        try:
+            from services.user_service.similarity_index import similarity_index
+            similarity_index.invalidate()
+        except Exception as e:
+            print(f'[sync] similarity index invalidate 실패: {e}')
         
         return jsonify({
             'message': f'동기화 완료: {insert_count}행 처리',
@@ -0,0 +1,105 @@
+# tests/bench/bench_agent_transport.py
+"""
+에이전트 전송 방식 벤치마크: HTTP(로컬 werkzeug 서버) vs in-process(LocalTransport)
+실행: python tests/bench/bench_agent_transport.py [요청 수]
+- agent_service REGISTRY에 같은 가짜 툴(오라클 점수 조회 / RAG 검색)을 등록 → 두 전송 모두 같은 plan_and_run 경로
+- HTTP는 127.0.0.1 임의 포트의 threaded werkzeug 서버로 /v1/agent/plan_and_run 호출
+- 동시성 1 / 4 에서 요청별 지연(mean/p50/p99, ms)과 처리량 출력, 두 전송의 응답 일치 여부 확인
+- agent_service 서버 모듈 import에 필요한 패키지(chromadb, sentence-transformers)가 설치된 환경에서 실행
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, jsonify, request  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from services.agent_service.api import server as agent_server  # noqa: E402
+from services.llm_service.orchestrator import agent_client  # noqa: E402
+
+PAYLOADS = [
+    {"query": "2024년 서울대 예측 점수 알려줘", "slots": ["CPS"], "intent": {"kind": "estimation"}},
+    {"query": "마이페이지 설정 방법 알려줘", "hints": ["rag"], "intent": {"kind": "usage_guide"}},
+]
+
+
+def _fake_estimation(args):
+    rows = [{"YEAR": args.get("year") or 2024, "UNIV": args.get("university") or "", "SCORE": 80 + i / 10}
+            for i in range(20)]
+    return {"ok": True, "result": rows}
+
+
+def _fake_rag(args):
+    return {"rag": {"query": args.get("query"),
+                    "matches": [{"doc": f"guide_{i}.pdf", "score": 1 - i / 10, "text": "설정 > 마이페이지 " * 8}
+                                for i in range(5)]}}
+
+
+def register_fake_tools():
+    agent_server.REGISTRY.clear()
+    agent_server.REGISTRY.update({
+        "oracle_agent_tool.query_estimation_score": _fake_estimation,
+        "rag_agent_tool.query": _fake_rag,
+    })
+
+
+def start_http_server():
+    app = Flask("bench-agent")
+
+    @app.post("/v1/agent/plan_and_run")
+    def compat_plan_and_run():
+        out, status = agent_server.plan_and_run(request.get_json(silent=True) or {})
+        return jsonify(out), status
+
+    srv = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def measure(transport, n: int, concurrency: int):
+    lat = []
+
+    def one(i):
+        t0 = time.perf_counter()
+        out = transport.call(PAYLOADS[i % len(PAYLOADS)], timeout=10)
+        lat.append((time.perf_counter() - t0) * 1000)
+        return out
+
+    for i in range(10):  # 연결/워커 준비 제외
+        one(i)
+    lat.clear()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, range(n)))
+    wall = time.perf_counter() - t0
+    lat.sort()
+    return {"mean": sum(lat) / len(lat), "p50": lat[len(lat) // 2],
+            "p99": lat[min(len(lat) - 1, int(0.99 * len(lat)))], "rps": n / wall}
+
+
+def main(n: int = 500):
+    logging.disable(logging.INFO)  # 툴 호출 로그는 두 경로 공통 → 측정에서 제외
+    register_fake_tools()
+    srv = start_http_server()
+    agent_client.AGENT_URL = f"http://127.0.0.1:{srv.server_port}"
+    transports = {"http": agent_client.HttpTransport(), "local": agent_client.LocalTransport()}
+    try:
+        same = all(transports["http"].call(p, 10) == transports["local"].call(p, 10) for p in PAYLOADS)
+        print(f"responses identical across transports: {same}")
+        for concurrency in (1, 4):
+            for name, tr in transports.items():
+                r = measure(tr, n, concurrency)
+                print(f"{name:5s} conc={concurrency}: mean={r['mean']:.3f}ms p50={r['p50']:.3f}ms "
+                      f"p99={r['p99']:.3f}ms ({r['rps']:.0f} req/s)")
+    finally:
+        srv.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
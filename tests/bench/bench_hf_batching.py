@@ -0,0 +1,95 @@
+# tests/bench/bench_hf_batching.py
+"""
+HF 연속 배칭(batch_max_size) on/off 벤치마크 — 무작위 초기화 소형 모델 사용 (다운로드 없음)
+실행: python tests/bench/bench_hf_batching.py [요청 수/스레드]
+- config로 만든 작은 LlamaForCausalLM + 코드로 학습한 BPE 토크나이저를 임시 디렉터리에 저장 → HFBackend로 로드
+- 동시성 1/4/8 스레드가 같은 greedy 파라미터로 generate 호출
+- 배칭 off(batch_max_size=1) / on(batch_max_size=8) 별 req/s, tokens/s, 평균 배치 크기 출력
+- torch + transformers 필요 (CPU로 실행)
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+import torch  # noqa: E402
+from tokenizers import Tokenizer, models, pre_tokenizers, decoders, trainers  # noqa: E402
+from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast  # noqa: E402
+
+from services.llm_service.model.backends.hf_transformers import HFBackend  # noqa: E402
+
+MAX_NEW_TOKENS = 32
+GEN = {"do_sample": False, "temperature": 1.0, "top_p": 1.0, "max_new_tokens": MAX_NEW_TOKENS}
+CHAT_TEMPLATE = "{% for m in messages %}<|{{ m['role'] }}|>{{ m['content'] }}\n{% endfor %}<|assistant|>"
+PROMPTS = [f"{i}번 학생의 2024년 점수 추이를 한 문장으로 요약해줘." for i in range(16)]
+
+
+def build_tiny_model(path: str) -> None:
+    """무작위 가중치 소형 모델 + 토크나이저를 path에 저장"""
+    tk = Tokenizer(models.BPE(unk_token="<unk>"))
+    tk.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tk.decoder = decoders.ByteLevel()
+    corpus = PROMPTS + ["<|user|> <|assistant|> 점수 요약 학생 추이 문장"] * 4
+    tk.train_from_iterator(corpus, trainers.BpeTrainer(
+        vocab_size=512, special_tokens=["<unk>", "<s>", "</s>", "<pad>"],
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet()))
+    tok = PreTrainedTokenizerFast(tokenizer_object=tk, bos_token="<s>", eos_token="</s>",
+                                  unk_token="<unk>", pad_token="<pad>")
+    tok.chat_template = CHAT_TEMPLATE
+    tok.save_pretrained(path)
+
+    torch.manual_seed(0)
+    cfg = LlamaConfig(vocab_size=len(tok), hidden_size=128, intermediate_size=256, num_hidden_layers=2,
+                      num_attention_heads=4, num_key_value_heads=4, max_position_embeddings=256,
+                      bos_token_id=tok.bos_token_id, eos_token_id=tok.eos_token_id, pad_token_id=tok.pad_token_id)
+    LlamaForCausalLM(cfg).eval().save_pretrained(path)
+
+
+def run(model_dir: str, max_batch: int, concurrency: int, per_thread: int):
+    cfg = {"model": {"repo_id": model_dir},
+           "load_params": {"device": "cpu", "dtype": "fp32", "batch_max_size": max_batch, "batch_wait_ms": 10},
+           "generation": dict(GEN)}
+    backend = HFBackend(cfg, {})
+    backend.warmup()
+    backend.generate([{"role": "user", "content": PROMPTS[0]}], GEN)  # 첫 호출 제외
+
+    outputs, lock = [], threading.Lock()
+
+    def worker(tid: int):
+        for j in range(per_thread):
+            text = backend.generate([{"role": "user", "content": PROMPTS[(tid * per_thread + j) % len(PROMPTS)]}], GEN)
+            with lock:
+                outputs.append(text)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    stats = backend.stats().get("batching", {})
+    tokens = sum(len(backend.pipe.tokenizer.encode(o, add_special_tokens=False)) for o in outputs)
+    backend.close()
+    return len(outputs), tokens, wall, stats
+
+
+def main(per_thread: int = 8):
+    torch.set_num_threads(max(1, os.cpu_count() or 1))
+    with tempfile.TemporaryDirectory() as model_dir:
+        build_tiny_model(model_dir)
+        print(f"{'batching':9s} {'conc':>4s} {'reqs':>5s} {'wall(s)':>8s} {'req/s':>7s} {'tok/s':>8s} {'avg_batch':>9s}")
+        for max_batch in (1, 8):
+            for concurrency in (1, 4, 8):
+                n, tokens, wall, st = run(model_dir, max_batch, concurrency, per_thread)
+                label = "off" if max_batch == 1 else f"on({max_batch})"
+                print(f"{label:9s} {concurrency:4d} {n:5d} {wall:8.2f} {n / wall:7.1f} {tokens / wall:8.1f} "
+                      f"{st.get('avg_batch_size') or 1:>9}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8)
@@ -0,0 +1,44 @@
+# tests/bench/bench_intent_classifier.py
+"""
+의도 분류 처리량 벤치마크 (10만 메시지)
+실행: python tests/bench/bench_intent_classifier.py [메시지 수]
+- 골든 픽스처 질의를 섞어 반복 (실서비스처럼 같은 질문이 재등장)
+- 캐시 미사용(_classify_uncached) vs LRU 캐시(classify) 처리량 비교
+"""
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("INTENT_CACHE_SIZE", "2048")  # 캐시 경로 측정용 (기본값은 0)
+
+from services.llm_service.orchestrator import intent_classifier  # noqa: E402
+
+
+def main(n: int = 100_000):
+    with open(os.path.join(ROOT, "tests", "fixtures", "intent_golden.jsonl"), encoding="utf-8") as f:
+        pool = [json.loads(line)["query"] for line in f if line.strip()]
+    rng = random.Random(0)
+    msgs = [(rng.choice(pool), "u01" if rng.random() < 0.6 else None) for _ in range(n)]
+
+    t0 = time.perf_counter()
+    for q, u in msgs:
+        intent_classifier._classify_uncached(q.strip(), bool(u))
+    uncached = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for q, u in msgs:
+        intent_classifier.classify(q, u)
+    cached = time.perf_counter() - t0
+
+    print(f"messages={n}")
+    print(f"uncached: {uncached:.2f}s ({n / uncached:,.0f} msg/s)")
+    print(f"cached  : {cached:.2f}s ({n / cached:,.0f} msg/s)")
+    print(f"cache   : {intent_classifier.classify_cache_info()['classify']}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
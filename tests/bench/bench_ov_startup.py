@@ -0,0 +1,96 @@
+# tests/bench/bench_ov_startup.py
+"""
+OpenVINO GenAI 기동 시간(컴파일 캐시) / 파이프라인 풀 동시 처리량 벤치마크
+실행: MODEL_PARAMS_CONFIG=.../ov_params.json MODEL_PROMPTS_CONFIG=... python tests/bench/bench_ov_startup.py [풀 크기...]
+- 기동: 프로세스를 새로 띄워(재시작과 동일) warmup 2회 — 1회차는 컴파일 캐시를 비운 상태(cold), 2회차는 캐시 재사용(warm)
+  → startup_seconds / compile_seconds / cache_warm 및 재시작 시 절감 시간 출력
+- 처리량: 풀 크기별(기본 1, 4)로 동시성 1/2/4 스레드가 같은 greedy 요청 → req/s, busy_waits 출력
+- openvino-genai + 로컬(또는 다운로드 가능한) OV 모델이 있는 환경에서만 실행
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from services.llm_service.model.config_loader import load_config  # noqa: E402
+from services.llm_service.model.backends.openvino_genai import OVGenAIBackend  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "OpenVINO 컴파일 캐시가 무엇인지 두 문장으로 설명해줘."}]
+GEN = {"temperature": 0.0, "top_k": 1, "max_new_tokens": 64}
+
+
+def _backend(pool_size: int) -> OVGenAIBackend:
+    env = dict(os.environ, OV_PIPELINE_POOL=str(pool_size))
+    os.environ["OV_PIPELINE_POOL"] = str(pool_size)  # _build_pipeline은 os.getenv로 읽음
+    return OVGenAIBackend(load_config(env), env)
+
+
+def startup_child() -> None:
+    """자식 프로세스: warmup 1회 후 startup 통계를 JSON으로 출력"""
+    backend = _backend(1)
+    backend.warmup()
+    print(json.dumps(backend.stats()["startup"]))
+    backend.close()
+
+
+def measure_startup() -> None:
+    runs = []
+    for i in range(2):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--startup-child"],
+                             capture_output=True, text=True, check=True, env=os.environ)
+        st = json.loads(out.stdout.strip().splitlines()[-1])
+        if i == 0:
+            # 1회차가 cold가 되도록 이 모델/디바이스의 컴파일 캐시를 비우고 다시 측정
+            if st.get("cache_warm"):
+                shutil.rmtree(st["cache_dir"], ignore_errors=True)
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), "--startup-child"],
+                                     capture_output=True, text=True, check=True, env=os.environ)
+                st = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append(st)
+        print(f"run {i + 1}: startup={st['startup_seconds']}s compile={st['compile_seconds']} "
+              f"cache_warm={st['cache_warm']} device={st['device']}")
+    print(f"restart saving: {runs[0]['startup_seconds'] - runs[1]['startup_seconds']:.2f}s "
+          f"({runs[1]['startup_seconds'] / runs[0]['startup_seconds']:.0%} of cold startup)")
+
+
+def measure_throughput(pool_size: int, per_thread: int = 4) -> None:
+    backend = _backend(pool_size)
+    backend.warmup()
+    backend.generate(MESSAGES, dict(GEN, max_new_tokens=8))  # 첫 호출 제외
+    for concurrency in (1, 2, 4):
+        before = backend.stats()["busy_waits"]
+
+        def worker():
+            for _ in range(per_thread):
+                backend.generate(MESSAGES, GEN)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+        n = concurrency * per_thread
+        print(f"pool={pool_size} conc={concurrency}: {n} reqs / {wall:.2f}s ({n / wall:.2f} req/s), "
+              f"busy_waits={backend.stats()['busy_waits'] - before}")
+    backend.close()
+
+
+def main(pool_sizes) -> None:
+    measure_startup()
+    for pool_size in pool_sizes:
+        measure_throughput(pool_size)
+
+
+if __name__ == "__main__":
+    if "--startup-child" in sys.argv:
+        startup_child()
+    else:
+        main([int(a) for a in sys.argv[1:]] or [1, 4])
@@ -0,0 +1,63 @@
+# tests/bench/bench_predict_by_cluster.py
+"""
+클러스터별 평가 예측: 행 단위 반복(이전 Controller_Num01) vs predict_by_cluster 벤치마크
+실행: python tests/bench/bench_predict_by_cluster.py [행 수] [반복 비교 행 수]
+- 합성 데이터 100k행 × 20피처, KMeans k=4, 클러스터마다 DecisionTreeRegressor
+- 행 단위 반복은 앞쪽 N행(기본 2000)만 실행 후 전체 행 수로 환산
+- 같은 행에 대한 두 결과가 비트 단위로 같은지 확인
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.tree import DecisionTreeRegressor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "services", "ml_service"))
+
+from ModelCreator.Utiles.Evaluator import predict_by_cluster  # noqa: E402
+
+
+def per_row(models_by_cluster, cluster_ids, X):
+    out = []
+    for i, cluster_id in enumerate(cluster_ids):
+        model = models_by_cluster.get(cluster_id)
+        if model is None:
+            raise ValueError(f"[ERROR] 클러스터 '{cluster_id}'에 해당하는 모델이 없습니다.")
+        out.append(model.predict(X.iloc[i:i + 1])[0])
+    return np.asarray(out)
+
+
+def main(n_rows: int = 100_000, n_loop: int = 2000):
+    rng = np.random.default_rng(45)
+    X = pd.DataFrame(rng.random((n_rows, 20)), columns=[f"F{i}" for i in range(20)])
+    y = X.to_numpy() @ rng.random(20) + rng.normal(0, 0.1, n_rows)
+    km = KMeans(n_clusters=4, n_init=3, random_state=0).fit(X)
+    models = {c: DecisionTreeRegressor(max_depth=12, random_state=0).fit(X[km.labels_ == c], y[km.labels_ == c])
+              for c in range(4)}
+    cluster_ids = km.predict(X)
+
+    t0 = time.perf_counter()
+    vec = predict_by_cluster(models, cluster_ids, X)
+    t_vec = time.perf_counter() - t0
+
+    n_loop = min(n_loop, n_rows)
+    t0 = time.perf_counter()
+    loop = per_row(models, cluster_ids[:n_loop], X.iloc[:n_loop])
+    t_loop = time.perf_counter() - t0
+    per_row_ms = t_loop / n_loop * 1000
+
+    print(f"rows={n_rows}, features=20, clusters=4")
+    print(f"per-row loop     : {per_row_ms:.3f} ms/row → ~{per_row_ms * n_rows / 1000:.1f}s for {n_rows} rows "
+          f"(measured on {n_loop})")
+    print(f"predict_by_cluster: {t_vec * 1000:.1f} ms for {n_rows} rows "
+          f"(~{per_row_ms * n_rows / 1000 / t_vec:.0f}x)")
+    print(f"identical on first {n_loop} rows: {np.array_equal(vec[:n_loop], loop)} (dtype {vec.dtype})")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,56 @@
+# tests/bench/bench_speculative.py
+"""
+GGUF 추측 디코딩(prompt_lookup) on/off 벤치마크
+실행: MODEL_PARAMS_CONFIG=... MODEL_PROMPTS_CONFIG=... python tests/bench/bench_speculative.py [반복 수]
+- 같은 프롬프트 세트를 LLM_SPECULATIVE=off / prompt_lookup 으로 각각 greedy 생성
+- 모드별 tokens/sec, 드래프트 수락률(추정), 출력 일치 여부 출력
+- 모델 로드가 필요하므로 llama-cpp-python + GGUF 파일이 있는 환경에서만 실행
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from services.llm_service.model.config_loader import load_config  # noqa: E402
+from services.llm_service.model.backends.gguf_llamacpp import GGUFBackend  # noqa: E402
+
+# 데이터 인용형 답변(프롬프트 n-gram 재사용이 많은 경우) + 일반 대화
+_TABLE = "\n".join(f"- 2024년 {m}월 점수: {70 + m}.{m}점, 전월 대비 {m % 3 - 1:+d}점" for m in range(1, 13))
+PROMPTS = [
+    [{"role": "user", "content": f"다음 표를 그대로 요약해줘.\n{_TABLE}"}],
+    [{"role": "user", "content": f"다음 자료에서 6월~9월 점수를 그대로 옮겨 적어줘.\n{_TABLE}"}],
+    [{"role": "user", "content": "추측 디코딩이 무엇인지 세 문장으로 설명해줘."}],
+]
+GEN = {"temperature": 0.0, "top_k": 1, "max_new_tokens": 192}
+
+
+def run(mode: str, rounds: int):
+    env = dict(os.environ, LLM_SPECULATIVE=mode)
+    backend = GGUFBackend(load_config(env), env)
+    backend.warmup()
+    backend.generate(PROMPTS[0], dict(GEN, max_new_tokens=8))  # 첫 호출(그래프 준비) 제외
+    backend._totals.update(requests=0, completion_tokens=0, seconds=0.0, draft_proposed=0, draft_accepted=0)
+
+    outputs = []
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        outputs = [backend.generate(m, GEN) for m in PROMPTS]
+    wall = time.perf_counter() - t0
+    totals = backend.stats()["totals"]
+    backend.close()
+    return outputs, wall, totals
+
+
+def main(rounds: int = 3):
+    results = {mode: run(mode, rounds) for mode in ("off", "prompt_lookup")}
+    for mode, (_, wall, t) in results.items():
+        print(f"{mode:13s}: {t['completion_tokens']} tokens / {wall:.2f}s "
+              f"({t['tokens_per_sec']} tok/s), acceptance={t['acceptance_rate']}")
+    same = sum(a == b for a, b in zip(results["off"][0], results["prompt_lookup"][0]))
+    print(f"greedy outputs identical: {same}/{len(PROMPTS)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
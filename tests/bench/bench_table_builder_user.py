@@ -0,0 +1,69 @@
+# tests/bench/bench_table_builder_user.py
+"""
+유저 예측 단건 vs 일괄 벤치마크
+실행: python tests/bench/bench_table_builder_user.py [유저 수]
+- 합성 RFR(클러스터 2개, 트리 100개) + 대학 피처 조회는 메모리 dict로 대체 (DB 왕복 제외, 모델 예측 비용만 비교)
+- 단건: predict_from_payload를 유저 수만큼 / 일괄: predict_from_payloads 1회
+- 일괄 결과가 단건 결과와 같은지 확인
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path[:0] = [os.path.join(ROOT, "services", "prediction_service"), os.path.join(ROOT, "services")]
+
+from sklearn.cluster import KMeans  # noqa: E402
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from Predictor.TableBuilder_User import TableBuilderUser  # noqa: E402
+
+INPUT_COLS = ["YR", "CPSS_CPS", "LPS_LPS", "VPS_VPS"] + [f"LIB_{i}" for i in range(12)]
+
+
+def build(n_univ: int = 50) -> TableBuilderUser:
+    rng = np.random.default_rng(0)
+    X = rng.random((5000, len(INPUT_COLS))) * 100
+    y = X @ rng.random(len(INPUT_COLS))
+    km = KMeans(n_clusters=2, n_init=3, random_state=0).fit(X)
+    tb = TableBuilderUser.__new__(TableBuilderUser)
+    tb.config = {"SCALER_CONFIG": {"enabled": False}, "CLUSTER_CONFIG": {"enabled": True}}
+    tb.input_cols = INPUT_COLS
+    tb.user_features = ["CPSS_CPS", "LPS_LPS", "VPS_VPS"]
+    tb.memo = None
+    tb.model_version = "bench"
+    tb.models = {"cluster_model": km, "rfr_clusters": {
+        c: RandomForestRegressor(n_estimators=100, random_state=0, n_jobs=1).fit(X[km.labels_ == c], y[km.labels_ == c])
+        for c in (0, 1)}}
+    lib = {f"U{i}": {c: float(rng.random() * 100) for c in INPUT_COLS[4:]} for i in range(n_univ)}
+    tb._load_library_data_many = lambda snms, yr: {s: lib[s] for s in snms if s in lib}
+    return tb
+
+
+def main(n: int = 500):
+    tb = build()
+    rng = np.random.default_rng(1)
+    payloads = [{
+        "USR_SNM": f"U{rng.integers(50)}",
+        **{f"{g}_YR": 2021 + k for k, g in enumerate(TableBuilderUser.GRADES)},
+        **{f"{g}_USR_{m}": float(rng.random() * 100) for g in TableBuilderUser.GRADES for m in ("CPS", "LPS", "VPS")},
+    } for _ in range(n)]
+
+    t0 = time.perf_counter()
+    single = [tb.predict_from_payload(p) for p in payloads]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = tb.predict_from_payloads(payloads)
+    t_batch = time.perf_counter() - t0
+
+    rows = n * len(TableBuilderUser.GRADES)
+    print(f"users={n} rows={rows}")
+    print(f"single: {t_single:.2f}s ({rows / t_single:,.0f} rows/s)")
+    print(f"batch : {t_batch:.2f}s ({rows / t_batch:,.0f} rows/s), x{t_single / t_batch:.1f}")
+    print(f"identical: {single == batch}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
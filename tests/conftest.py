@@ -0,0 +1,21 @@
+# tests/conftest.py
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# services.* 패키지 import (llm/data/prediction 서비스)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# ml_service는 ModelCreator.* 최상위 import 사용 (__main__.py와 동일한 경로 구성)
+ML_SERVICE = os.path.join(ROOT, "services", "ml_service")
+if ML_SERVICE not in sys.path:
+    sys.path.insert(0, ML_SERVICE)
+
+# prediction_service는 Predictor.* / core_utiles.* 최상위 import 사용
+for _p in (os.path.join(ROOT, "services", "prediction_service"), os.path.join(ROOT, "services")):
+    if _p not in sys.path:
+        sys.path.append(_p)
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
@@ -0,0 +1,197 @@
+"""LLM 입장 제어: 대기열 가득 참 429, 대기 마감 503, Retry-After, 우선순위 순서, 과부하 시 대기 p99 상한"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.llm_service.api.admission import AdmissionController, AdmissionRejected
+
+
+def _wait_depth(ctrl, depth, timeout=2.0):
+    end = time.monotonic() + timeout
+    while ctrl.stats()["queue_depth"] != depth:
+        assert time.monotonic() < end, f"queue depth {ctrl.stats()['queue_depth']} != {depth}"
+        time.sleep(0.005)
+
+
+class _Holder:
+    """슬롯 하나를 잡고 release 전까지 놓지 않는 요청"""
+    def __init__(self, ctrl, priority="interactive"):
+        self.release = threading.Event()
+        self.entered = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ctrl, priority), daemon=True)
+        self.thread.start()
+        assert self.entered.wait(2)
+
+    def _run(self, ctrl, priority):
+        with ctrl.slot(priority):
+            self.entered.set()
+            self.release.wait(5)
+
+
+def _submit(ctrl, priority, results, order=None, work_s=0.0):
+    def run():
+        try:
+            with ctrl.slot(priority):
+                if order is not None:
+                    order.append(priority)
+                time.sleep(work_s)
+            results.append((priority, 200))
+        except AdmissionRejected as e:
+            results.append((priority, e.status))
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t
+
+
+def test_queue_full_rejects_429_with_retry_after():
+    ctrl = AdmissionController(max_concurrent=1, max_queue=2, max_wait_s=5)
+    holder = _Holder(ctrl)
+    results = []
+    threads = [_submit(ctrl, "interactive", results) for _ in range(2)]
+    _wait_depth(ctrl, 2)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        with ctrl.slot("interactive"):
+            pass
+    assert exc.value.status == 429 and exc.value.retry_after >= 1
+    # 같은/낮은 우선순위는 자리를 뺏지 못함
+    with pytest.raises(AdmissionRejected):
+        with ctrl.slot("background"):
+            pass
+
+    holder.release.set()
+    for t in threads:
+        t.join(2)
+    assert results == [("interactive", 200)] * 2
+    assert ctrl.stats()["per_class"]["interactive"]["rejected_full"] == 1
+
+
+def test_wait_deadline_rejects_503():
+    ctrl = AdmissionController(max_concurrent=1, max_queue=4, max_wait_s=0.1)
+    holder = _Holder(ctrl)
+    t0 = time.monotonic()
+    with pytest.raises(AdmissionRejected) as exc:
+        with ctrl.slot("admin"):
+            pass
+    waited = time.monotonic() - t0
+    holder.release.set()
+    assert exc.value.status == 503 and exc.value.retry_after >= 1
+    assert 0.1 <= waited < 1.0
+    assert ctrl.stats()["queue_depth"] == 0  # 만료된 대기자는 큐에서 제거
+
+
+def test_priority_order_interactive_admin_background():
+    ctrl = AdmissionController(max_concurrent=1, max_queue=8, max_wait_s=5)
+    holder = _Holder(ctrl)
+    results, order = [], []
+    threads = []
+    # 도착 순서는 우선순위의 역순
+    for depth, priority in enumerate(["background", "background", "admin", "interactive", "admin"], start=1):
+        threads.append(_submit(ctrl, priority, results, order))
+        _wait_depth(ctrl, depth)
+    holder.release.set()
+    for t in threads:
+        t.join(2)
+    assert order == ["interactive", "admin", "admin", "background", "background"]
+
+
+def test_higher_priority_sheds_lowest_waiter():
+    ctrl = AdmissionController(max_concurrent=1, max_queue=2, max_wait_s=5)
+    holder = _Holder(ctrl)
+    results, order = [], []
+    bg = [_submit(ctrl, "background", results, order) for _ in range(2)]
+    _wait_depth(ctrl, 2)
+    inter = _submit(ctrl, "interactive", results, order)
+    time.sleep(0.1)
+    holder.release.set()
+    for t in bg + [inter]:
+        t.join(2)
+    assert sorted(results) == [("background", 200), ("background", 429), ("interactive", 200)]
+    assert order[0] == "interactive"
+    assert ctrl.stats()["per_class"]["background"]["shed"] == 1
+
+
+def test_overload_keeps_p99_wait_bounded():
+    """느린 가짜 백엔드에 처리 용량의 수 배 요청 → 대기 시간은 max_wait_s로 상한, 초과분은 빠르게 거절"""
+    max_wait_s, work_s = 0.3, 0.03
+    ctrl = AdmissionController(max_concurrent=2, max_queue=6, max_wait_s=max_wait_s)
+    lock = threading.Lock()
+    admitted_waits, reject_lat, statuses = [], [], []
+    stop_at = time.monotonic() + 1.5
+
+    def client(i):
+        priority = ("interactive", "admin", "background")[i % 3]
+        while time.monotonic() < stop_at:
+            t0 = time.monotonic()
+            try:
+                with ctrl.slot(priority):
+                    waited = time.monotonic() - t0
+                    time.sleep(work_s)  # 가짜 백엔드
+                with lock:
+                    admitted_waits.append(waited)
+                    statuses.append(200)
+            except AdmissionRejected as e:
+                with lock:
+                    reject_lat.append(time.monotonic() - t0)
+                    statuses.append(e.status)
+                time.sleep(0.01)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(24)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    def p99(xs):
+        xs = sorted(xs)
+        return xs[min(len(xs) - 1, int(0.99 * len(xs)))]
+
+    assert statuses.count(429) > 0  # 실제로 과부하 상태였음
+    assert admitted_waits and p99(admitted_waits) <= max_wait_s + 0.1
+    assert p99(reject_lat) <= max_wait_s + 0.1
+    st = ctrl.stats()
+    assert st["wait_p99_s"] <= max_wait_s + 0.1
+    assert st["in_flight"] == 0 and st["queue_depth"] == 0
+
+
+def test_http_reject_sets_retry_after(monkeypatch):
+    from flask import Flask
+    from services.llm_service.api import llm_api
+
+    ctrl = AdmissionController(max_concurrent=1, max_queue=1, max_wait_s=2)
+    release = threading.Event()
+
+    def slow_orchestrate(router, cfg, repo, inp):
+        release.wait(5)
+        return SimpleNamespace(answer="답변", route="llm", meta={})
+
+    monkeypatch.setattr(llm_api, "admission", ctrl)
+    monkeypatch.setattr(llm_api, "orchestrate", slow_orchestrate)
+    app = Flask(__name__)
+    router = SimpleNamespace(backend_name="fake", model_name="fake")
+    app.add_url_rule("/api/chat", "api_chat", llm_api.build_handlers(app, router=router, cfg={})["api_chat"],
+                     methods=["POST"])
+
+    statuses = []
+
+    def post():
+        statuses.append(app.test_client().post("/api/chat", json={"message": "q"}).status_code)
+
+    threads = [threading.Thread(target=post, daemon=True) for _ in range(2)]
+    threads[0].start()
+    while ctrl.stats()["in_flight"] == 0:
+        time.sleep(0.005)
+    threads[1].start()
+    _wait_depth(ctrl, 1)
+
+    resp = app.test_client().post("/api/chat", json={"message": "q"}, headers={"X-Priority": "background"})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert resp.get_json()["retry_after"] == int(resp.headers["Retry-After"])
+
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert statuses == [200, 200]
@@ -0,0 +1,65 @@
+"""in-process 에이전트 전송: HTTP 경로와 같은 의미(타임아웃/정규화/오류)"""
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from services.llm_service.orchestrator import agent_client
+
+
+class _FakeServer:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def plan_and_run(self, payload):
+        return self.fn(payload)
+
+
+def _local(fn, workers=2):
+    tr = agent_client.LocalTransport.__new__(agent_client.LocalTransport)
+    tr._server = _FakeServer(fn)
+    tr._pool = ThreadPoolExecutor(max_workers=workers)
+    return tr
+
+
+def test_payload_and_result_are_json_normalized():
+    seen = {}
+
+    def run(payload):
+        seen["payload"] = payload
+        payload["slots"].append("mutated")
+        return {"ok": True, "final_data": {"year": (2024,), "at": datetime.date(2024, 1, 2)}}, 200
+
+    payload = {"query": "q", "slots": [], "year": (2023, 2024)}
+    out = _local(run).call(payload, timeout=2)
+    assert payload == {"query": "q", "slots": [], "year": (2023, 2024)}  # 호출부 객체는 그대로
+    assert seen["payload"]["year"] == [2023, 2024]
+    assert out == {"ok": True, "final_data": {"year": [2024], "at": "2024-01-02"}}
+
+
+def test_error_status_raises():
+    tr = _local(lambda p: ({"ok": False, "error": "could not infer tool"}, 400))
+    with pytest.raises(agent_client.AgentCallError, match="400"):
+        tr.call({"query": "q"}, timeout=2)
+
+
+def test_timeout_is_bounded_and_retried(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def hang(payload):
+        calls.append(1)
+        release.wait(5)
+        return {"ok": True}, 200
+
+    tr = _local(hang)
+    monkeypatch.setenv("AGENT_HTTP_RETRIES", "2")
+    try:
+        with pytest.raises(requests.Timeout):
+            agent_client.plan_and_run({"query": "q"}, timeout_sec=0.2, transport=tr)
+        assert len(calls) == 2
+    finally:
+        release.set()
+        tr._pool.shutdown(wait=True)
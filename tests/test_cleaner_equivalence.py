@@ -0,0 +1,133 @@
+"""DataCleaner 벡터화: 무작위 프레임에서 이전 구현(행별 apply/컬럼별 drop)과 결과·로그가 동일"""
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ModelCreator.Cleaner import DataCleaner
+
+
+class _OldCleaner:
+    """벡터화 이전 구현 (handle_missing / handle_outliers, 그대로 옮김)"""
+    def __init__(self, config: dict):
+        self.missing_strategy = config.get("MISSING_VALUE_STRATEGY", {})
+        self.outlier_strategy = config.get("OUTLIER_STRATEGY", {})
+
+    def handle_missing(self, df, feature_cols):
+        if not self.missing_strategy.get("enable", False):
+            print("[INFO] 결측치 처리 비활성화됨")
+            return df
+
+        method = self.missing_strategy.get("method", "drop")
+        fill_value = self.missing_strategy.get("fill_value", 0)
+        zero_threshold = self.missing_strategy.get("zero_threshold_ratio", 0.5)
+        remove_col = self.missing_strategy.get("remove_zero_by_column", False)
+        remove_row = self.missing_strategy.get("remove_zero_by_row", False)
+
+        if remove_col:
+            for col in feature_cols:
+                zero_ratio = (df[col] == 0).mean()
+                if zero_ratio > zero_threshold:
+                    print(f"[INFO] '{col}' 컬럼 제거 (0값 비율: {zero_ratio:.2f})")
+                    df = df.drop(columns=[col])
+                    feature_cols.remove(col)
+
+        if remove_row:
+            def row_zero_ratio(row):
+                return (row[feature_cols] == 0).mean()
+
+            df["__zero_ratio__"] = df.apply(row_zero_ratio, axis=1)
+            to_remove = df[df["__zero_ratio__"] > zero_threshold]
+
+            if not to_remove.empty:
+                for idx, row in to_remove.iterrows():
+                    row_snm = row.get("SNM", f"index_{idx}")
+                    print(f"[INFO] '{row_snm}' 데이터행 제거 (0값 비율: {row['__zero_ratio__']:.2f})")
+
+            df = df[df["__zero_ratio__"] <= zero_threshold].drop(columns=["__zero_ratio__"])
+
+        if method == "drop":
+            df = df.dropna()
+        elif method == "fill":
+            df = df.fillna(fill_value)
+        else:
+            raise ValueError(f"[ERROR] 지원하지 않는 결측치 처리 방식: {method}")
+
+        return df
+
+    def handle_outliers(self, df, feature_cols):
+        if not self.outlier_strategy.get("enable", False):
+            print("[INFO] 이상치 처리 비활성화됨")
+            return df
+
+        method = self.outlier_strategy.get("method", "iqr")
+        threshold = self.outlier_strategy.get("threshold", 1.5)
+
+        if method == "iqr":
+            for col in feature_cols:
+                Q1 = df[col].quantile(0.25)
+                Q3 = df[col].quantile(0.75)
+                IQR = Q3 - Q1
+                lower = Q1 - threshold * IQR
+                upper = Q3 + threshold * IQR
+                before = len(df)
+                df = df[(df[col] >= lower) & (df[col] <= upper)]
+                after = len(df)
+                print(f"[INFO] '{col}' 이상치 제거 → {before - after}개 제거됨")
+        else:
+            raise ValueError(f"[ERROR] 지원하지 않는 이상치 처리 방식: {method}")
+
+        return df
+
+
+def _frame(rng):
+    n, k = int(rng.integers(0, 60)), int(rng.integers(1, 7))
+    cols = [f"c{i}" for i in range(k)]
+    df = pd.DataFrame({c: rng.choice([0, 0, 1.5, 2, np.nan, -3, 100], size=n, p=rng.dirichlet(np.ones(7)))
+                       for c in cols})
+    if rng.random() < 0.5:
+        df.insert(0, "SNM", [f"u{i}" for i in range(n)])
+    if rng.random() < 0.3:
+        df.index = rng.permutation(n) + 100
+    return df, cols
+
+
+def _config(rng):
+    return {
+        "MISSING_VALUE_STRATEGY": {
+            "enable": True, "method": str(rng.choice(["drop", "fill"])), "fill_value": -1,
+            "zero_threshold_ratio": float(rng.choice([0.0, 0.3, 0.5, 0.8])),
+            "remove_zero_by_column": bool(rng.random() < 0.6), "remove_zero_by_row": bool(rng.random() < 0.7),
+        },
+        "OUTLIER_STRATEGY": {"enable": bool(rng.random() < 0.5), "method": "iqr",
+                             "threshold": float(rng.choice([0.5, 1.5]))},
+    }
+
+
+def _run(cls, config, df, cols):
+    out = io.StringIO()
+    feature_cols = list(cols)
+    try:
+        with contextlib.redirect_stdout(out):
+            cleaner = cls(config)
+            res = cleaner.handle_missing(df.copy(), feature_cols)
+            res = cleaner.handle_outliers(res, list(feature_cols))
+    except Exception as e:
+        return ("ERR", type(e).__name__)
+    return res, feature_cols, out.getvalue()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_old_cleaner(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(40):
+        df, cols = _frame(rng)
+        config = _config(rng)
+        old, new = _run(_OldCleaner, config, df, cols), _run(DataCleaner, config, df, cols)
+        if isinstance(old[0], str) or isinstance(new[0], str):
+            assert old == new, config
+            continue
+        pd.testing.assert_frame_equal(new[0], old[0])
+        assert new[1:] == old[1:], config
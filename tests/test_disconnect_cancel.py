@@ -0,0 +1,96 @@
+"""클라이언트 연결 종료 → 취소 토큰 → 오케스트레이터 중단"""
+import socket
+import threading
+import time
+
+import pytest
+
+from services.llm_service.model import cancellation
+from services.llm_service.model.cancellation import CancelToken, RequestCancelled, cancel_on_disconnect
+
+
+def _wait(pred, timeout=3.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if pred():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_peer_close_cancels_token():
+    server, client = socket.socketpair()
+    try:
+        token = CancelToken()
+        with cancel_on_disconnect(server, token, interval_s=0.05):
+            client.close()
+            assert _wait(lambda: token.cancelled)
+        assert token.reason == "client disconnected"
+    finally:
+        server.close()
+
+
+def test_pending_bytes_are_not_consumed():
+    server, client = socket.socketpair()
+    try:
+        token = CancelToken()
+        with cancel_on_disconnect(server, token, interval_s=0.05):
+            client.sendall(b"GET")
+            time.sleep(0.2)
+            assert not token.cancelled
+        assert server.recv(3) == b"GET"
+    finally:
+        server.close()
+        client.close()
+
+
+@pytest.mark.parametrize("rdhup", [True, False])
+def test_pending_bytes_do_not_spin_and_close_still_cancels(monkeypatch, rdhup):
+    if rdhup and not cancellation._POLLRDHUP:
+        pytest.skip("POLLRDHUP 미지원 플랫폼")
+    if not rdhup:
+        monkeypatch.setattr(cancellation, "_POLLRDHUP", 0)
+    server, client = socket.socketpair()
+    try:
+        token = CancelToken()
+        with cancel_on_disconnect(server, token, interval_s=0.05):
+            client.sendall(b"POST /next HTTP/1.1\r\n")  # keep-alive 다음 요청처럼 읽지 않은 바이트
+            cpu0 = time.process_time()
+            time.sleep(0.5)
+            # 바쁜 반복이면 감시 스레드가 코어 하나를 계속 사용 (≈0.5s)
+            assert time.process_time() - cpu0 < 0.15
+            assert not token.cancelled
+            if rdhup:
+                client.close()
+                assert _wait(lambda: token.cancelled)
+        if rdhup:
+            assert token.reason == "client disconnected"
+        assert server.recv(4) == b"POST"
+    finally:
+        server.close()
+        client.close()
+
+
+def test_non_socket_is_ignored():
+    token = CancelToken()
+    with cancel_on_disconnect(None, token):
+        pass
+    assert not token.cancelled
+
+
+def test_handle_with_deadline_stops_on_external_cancel(monkeypatch):
+    import services.llm_service.orchestrator as orch
+
+    started = threading.Event()
+
+    def slow_handle(router, cfg, repo, inp):
+        started.set()
+        while True:
+            cancellation.check()  # 백엔드/그래프 경계의 협조적 확인
+            time.sleep(0.01)
+
+    monkeypatch.setattr(orch, "handle", slow_handle)
+    token = CancelToken()
+    threading.Thread(target=lambda: started.wait(3) and token.cancel("client disconnected"), daemon=True).start()
+    with pytest.raises(RequestCancelled):
+        orch.handle_with_deadline(None, {}, None, None, 0, token=token)
@@ -0,0 +1,51 @@
+"""ESTIMATIONFUTURE 키셋 페이지네이션: 중복 key/NULL key 행 누락 없이 전체 순회"""
+import random
+import sqlite3
+
+import pytest
+
+from services.data_service.api import data_api
+
+
+def _to_sqlite(sql: str) -> str:
+    # Oracle 전용 구문만 sqlite 대응 구문으로 치환 (조건/정렬 로직은 그대로)
+    return (sql.replace("ROWIDTOCHAR(ROWID)", "ROWID")
+               .replace("CHARTOROWID(:after_rid)", ":after_rid")
+               .replace("FETCH FIRST :lim ROWS ONLY", "LIMIT :lim"))
+
+
+@pytest.fixture
+def db():
+    rng = random.Random(41)
+    conn = sqlite3.connect(":memory:")
+    conn.execute('CREATE TABLE ESTIMATIONFUTURE ("SNM" TEXT, "SCR" REAL)')
+    rows = [(rng.choice(["A대", "B대", "C대", None]), float(i)) for i in range(97)]
+    conn.executemany("INSERT INTO ESTIMATIONFUTURE VALUES (?, ?)", rows)
+    yield conn
+    conn.close()
+
+
+def _page(conn, after, after_rid, limit):
+    sql, binds, cols = data_api._export_query(["SNM", "SCR"], "SNM", after, after_rid, limit)
+    cur = conn.execute(_to_sqlite(sql), binds)
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+@pytest.mark.parametrize("limit", [1, 7, 10, 50])
+def test_pages_cover_every_row_once(db, limit):
+    seen = []
+    after = after_rid = None
+    while True:
+        page = _page(db, after, after_rid, limit)
+        if not page:
+            break
+        seen.extend(r["SCR"] for r in page)
+        after, after_rid = page[-1]["SNM"], page[-1]["_ROWID"]
+    assert sorted(seen) == [float(i) for i in range(97)]
+    assert len(seen) == len(set(seen))
+
+
+def test_unpaged_query_is_unchanged():
+    sql, binds, cols = data_api._export_query(["SNM"], "")
+    assert sql == 'SELECT "SNM" FROM ESTIMATIONFUTURE'
+    assert binds == {} and cols == ["SNM"]
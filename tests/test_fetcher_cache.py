@@ -0,0 +1,81 @@
+"""DataFetcher Parquet 캐시: 기본 끔, 켜면 MAX(ORA_ROWSCN) 지문으로 같은 행 수의 UPDATE도 감지"""
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pyarrow")
+from ModelCreator import Fetcher  # noqa: E402
+from ModelCreator.Fetcher import DataFetcher  # noqa: E402
+
+CONFIG = {"TABLE_TYPE": "DB", "DB_TABLE_NAME": "SCORES", "SCV_DATA_NAME": "unused",
+          "INPUT_COLUMNS": ["A"], "TARGET_COLUMN": "B", "SORT_COLUMNS": {"A": "ASC"}}
+
+
+class _Cursor:
+    """sqlite 커서 래퍼 (oracledb 커서 속성 prefetchrows/close 대응)"""
+    def __init__(self, conn):
+        self._cur = conn.cursor()
+        self.arraysize = self.prefetchrows = 0
+        self.queries = []
+
+    def execute(self, sql, binds=None):
+        self.queries.append(sql)
+        self._cur.execute(sql, binds or {})
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class _Conn:
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        # ORA_ROWSCN은 일반 컬럼으로 흉내 (행 변경 시 값 증가)
+        self.db.execute("CREATE TABLE SCORES (A REAL, B REAL, ORA_ROWSCN INTEGER)")
+        self.db.executemany("INSERT INTO SCORES VALUES (?, ?, 1)", [(float(i), i * 2.0) for i in range(50)])
+        self.cursors = []
+
+    def cursor(self):
+        self.cursors.append(_Cursor(self.db))
+        return self.cursors[-1]
+
+
+@pytest.fixture
+def cache_on(tmp_path, monkeypatch):
+    monkeypatch.setattr(Fetcher, "FETCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(Fetcher, "FETCH_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _fetched_from_db(conn):
+    return any(q.startswith("SELECT A, B FROM") for q in conn.cursors[-1].queries)
+
+
+@pytest.mark.skipif(bool(os.getenv("FETCH_CACHE")), reason="FETCH_CACHE 환경변수 지정됨")
+def test_cache_off_by_default():
+    assert Fetcher.FETCH_CACHE_ENABLED is False
+    conn = _Conn()
+    DataFetcher(CONFIG, conn=conn).fetch()
+    assert not any("ORA_ROWSCN" in q for q in conn.cursors[-1].queries)
+
+
+def test_same_count_update_invalidates(cache_on):
+    conn = _Conn()
+    first = DataFetcher(CONFIG, conn=conn).fetch()
+    assert _fetched_from_db(conn) and list(cache_on.glob("*.parquet"))
+
+    DataFetcher(CONFIG, conn=conn).fetch()
+    assert not _fetched_from_db(conn)
+
+    conn.db.execute("UPDATE SCORES SET B = -1, ORA_ROWSCN = 2 WHERE A = 3")
+    updated = DataFetcher(CONFIG, conn=conn).fetch()
+    assert _fetched_from_db(conn)
+    assert len(updated) == len(first) and updated.loc[3, "B"] == -1
+
+
+def test_no_rowscn_skips_cache(cache_on):
+    conn = _Conn()
+    conn.db.execute("ALTER TABLE SCORES DROP COLUMN ORA_ROWSCN")
+    DataFetcher(CONFIG, conn=conn).fetch()
+    DataFetcher(CONFIG, conn=conn).fetch()
+    assert _fetched_from_db(conn) and not list(cache_on.glob("*.parquet"))
@@ -0,0 +1,101 @@
+"""HF 연속 배칭 스케줄러: key별 묶음, max_batch 컷, 대기 마감, 취소 요청 제외, 예외 전파"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from services.llm_service.model.backends.hf_transformers import _BatchScheduler  # noqa: E402
+
+
+class _FakeRun:
+    """run_batch 대역: 받은 배치를 기록, gate가 있으면 첫 배치를 붙잡아 둠"""
+    def __init__(self, gate: threading.Event = None, fail: bool = False):
+        self.batches = []
+        self.gate = gate
+        self.fail = fail
+        self.entered = threading.Event()
+
+    def __call__(self, prompts, key):
+        self.batches.append((key, list(prompts)))
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+            self.gate = None
+        if self.fail:
+            raise RuntimeError("generate failed")
+        return [f"{p}:out" for p in prompts]
+
+
+def _scheduler(run, max_batch=8, wait_ms=200):
+    return _BatchScheduler(run, max_batch=max_batch, wait_ms=wait_ms)
+
+
+def test_groups_by_key_and_keeps_results_in_order():
+    run = _FakeRun()
+    s = _scheduler(run)
+    a1, b1, a2 = s.submit("a1", ("A",)), s.submit("b1", ("B",)), s.submit("a2", ("A",))
+    assert [f.result(2) for f in (a1, b1, a2)] == ["a1:out", "b1:out", "a2:out"]
+    assert run.batches == [(("A",), ["a1", "a2"]), (("B",), ["b1"])]
+    s.close()
+
+
+def test_max_batch_cutoff():
+    run = _FakeRun()
+    s = _scheduler(run, max_batch=2, wait_ms=500)
+    t0 = time.monotonic()
+    futs = [s.submit(f"p{i}", ("A",)) for i in range(5)]
+    assert [f.result(2) for f in futs] == [f"p{i}:out" for i in range(5)]
+    assert [len(p) for _, p in run.batches] == [2, 2, 1]
+    st = s.stats()
+    assert st["batches"] == 3 and st["requests"] == 5 and st["max_batch_seen"] == 2
+    s.close()
+    # 꽉 찬 배치는 wait_ms를 기다리지 않음 (마지막 1건만 마감까지 대기)
+    assert time.monotonic() - t0 < 0.5 + 0.4
+
+
+def test_wait_deadline_flushes_partial_batch():
+    run = _FakeRun()
+    s = _scheduler(run, max_batch=8, wait_ms=50)
+    t0 = time.monotonic()
+    assert s.submit("only", ("A",)).result(2) == "only:out"
+    elapsed = time.monotonic() - t0
+    assert 0.04 <= elapsed < 0.5
+    s.close()
+
+
+def test_cancelled_future_is_skipped():
+    gate = threading.Event()
+    run = _FakeRun(gate=gate)
+    s = _scheduler(run, max_batch=1, wait_ms=0)
+    first = s.submit("first", ("A",))
+    assert run.entered.wait(2)  # 첫 배치 실행 중 (gate에서 대기)
+    dropped = s.submit("dropped", ("A",))
+    kept = s.submit("kept", ("A",))
+    assert dropped.cancel()
+    gate.set()
+    assert first.result(2) == "first:out" and kept.result(2) == "kept:out"
+    assert [p for _, p in run.batches] == [["first"], ["kept"]]
+    s.close()
+
+
+def test_exception_fans_out_to_whole_batch():
+    run = _FakeRun(fail=True)
+    s = _scheduler(run, max_batch=4, wait_ms=100)
+    futs = [s.submit(f"p{i}", ("A",)) for i in range(3)]
+    for f in futs:
+        with pytest.raises(RuntimeError, match="generate failed"):
+            f.result(2)
+    assert len(run.batches) == 1
+    # 실패 후에도 스케줄러 스레드는 계속 동작
+    run.fail = False
+    assert s.submit("next", ("A",)).result(2) == "next:out"
+    s.close()
+
+
+def test_submit_after_close_raises():
+    s = _scheduler(_FakeRun())
+    s.close()
+    with pytest.raises(RuntimeError):
+        s.submit("late", ("A",))
@@ -0,0 +1,54 @@
+# tests/test_history_cache.py
+"""대화 tail 캐시: epoch는 대화별 — 다른 대화 쓰기는 시드를 막지 않음"""
+from services.llm_service.db.history_cache import ConversationTailCache
+
+
+def _cache():
+    return ConversationTailCache(tail=4, max_convs=8, max_bytes=0)
+
+
+def test_write_to_other_conversation_does_not_block_seed():
+    c = _cache()
+    ep = c.epoch(1)
+    c.append(2, [(10, "user", "다른 대화")])
+    c.seed(1, [(1, "user", "a"), (2, "assistant", "b")], ep)
+    assert c.get_history(1, 2) == [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+
+
+def test_write_to_same_conversation_blocks_stale_seed():
+    c = _cache()
+    ep = c.epoch(1)
+    c.append(1, [(3, "user", "새 메시지")])
+    c.seed(1, [(1, "user", "a")], ep)
+    assert c.get_history(1, 1) is None
+
+
+def test_clear_blocks_all_in_flight_seeds():
+    c = _cache()
+    ep1, ep2 = c.epoch(1), c.epoch(2)
+    c.clear()
+    c.seed(1, [(1, "user", "a")], ep1)
+    c.seed(2, [(2, "user", "b")], ep2)
+    assert c.get_history(1, 1) is None and c.get_history(2, 1) is None
+
+
+def test_summary_epoch_is_per_conversation():
+    c = _cache()
+    c.seed(1, [(1, "user", "a")], c.epoch(1))
+    ep = c.epoch(1)
+    c.invalidate(5)
+    c.set_summary(1, ("요약", 1), ep)
+    assert c.get_summary(1) == ("요약", 1)
+
+
+def test_dev_endpoints_are_loopback_only():
+    from flask import Flask
+    from services.llm_service.api import llm_api
+
+    app = Flask(__name__)
+    llm_api.register_routes_once(app, llm_api.build_handlers(app, router=None, cfg={}))
+    client = app.test_client()
+    remote = {"REMOTE_ADDR": "10.0.0.7"}
+    assert client.post("/dev/history-cache/clear", environ_base=remote).status_code == 403
+    assert client.get("/dev/history-cache", environ_base=remote).status_code == 403
+    assert client.post("/dev/history-cache/clear").get_json()["status"] == "ok"
@@ -0,0 +1,69 @@
+# tests/test_intent_classifier.py
+"""
+의도 분류 정규식/캐시 재작성 회귀 테스트
+- fixtures/intent_golden.jsonl: 재작성 전(any(k in q) 루프) 구현으로 생성한 정답 라벨
+  (큐레이션 질의 + 조합 생성 질의 650개 × 게스트/로그인)
+"""
+import json
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from services.llm_service.orchestrator import intent_classifier, tool_hints
+
+
+def _load_golden():
+    with open(os.path.join(FIXTURES, "intent_golden.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+GOLDEN = _load_golden()
+
+
+def _dump(intent):
+    return intent.model_dump() if hasattr(intent, "model_dump") else intent.dict()
+
+
+@pytest.mark.parametrize("cache_size", [0, 2048])
+def test_classify_matches_golden(monkeypatch, cache_size):
+    monkeypatch.setattr(intent_classifier, "INTENT_CACHE_SIZE", cache_size)
+    for rec in GOLDEN:
+        _assert_golden(rec)
+
+
+def _assert_golden(rec):
+    q = rec["query"]
+    assert _dump(intent_classifier.classify(q, None)) == rec["guest"], q
+    assert _dump(intent_classifier.classify(q, "u01")) == rec["user"], q
+    assert intent_classifier.extract_slots_light(q) == rec["slots"], q
+
+
+@pytest.fixture
+def cache_on(monkeypatch):
+    monkeypatch.setattr(intent_classifier, "INTENT_CACHE_SIZE", 2048)
+
+
+def test_cached_results_are_copies(cache_on):
+    q = "내 4학년 대출과 방문수"
+    first = intent_classifier.classify(q, "u01")
+    first.user_slots.clear()
+    first.external_entities.append("오염대학교")
+    assert _dump(intent_classifier.classify(q, "u01")) == _dump(intent_classifier._classify_uncached(q, True))
+
+    slots = intent_classifier.extract_slots_light(q)
+    slots["metric"] = "오염"
+    assert intent_classifier.extract_slots_light(q)["metric"] != "오염"
+
+
+def test_cache_key_ignores_user_id_value_and_whitespace(cache_on):
+    before = intent_classifier.classify_cache_info()["classify"]["hits"]
+    intent_classifier.classify("  내 점수 알려줘 ", "a")
+    intent_classifier.classify("내 점수 알려줘", "b")
+    assert intent_classifier.classify_cache_info()["classify"]["hits"] >= before + 1
+
+
+@pytest.mark.parametrize("keyword", tool_hints.GUIDE_KEYWORDS)
+def test_usage_guide_keywords(keyword):
+    assert tool_hints.detect_usage_guide(f"질문 {keyword} 관련")
+    assert not tool_hints.detect_usage_guide("   ")
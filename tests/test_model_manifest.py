@@ -0,0 +1,63 @@
+"""모델 내보내기 매니페스트: 모든 파일 저장 후 마지막에 기록, 예측 서버는 매니페스트 기준으로만 교체"""
+import os
+
+import pytest
+
+pytest.importorskip("joblib")
+from ModelCreator.Utiles.Exporter import save_model, write_manifest, manifest_path  # noqa: E402
+from Predictor.PickleLoader import PickleLoader, ModelRegistry  # noqa: E402
+
+CONFIG = {
+    "MODEL_NUM": "Num01", "MODEL_NAME": "RFR",
+    "SAVE_NAME_RULES": {"version": "v1", "suffix": ".pkl"},
+    "SCALER_CONFIG": {"enabled": False},
+    "CLUSTER_CONFIG": {"enabled": True, "params": {"KMeans": {"n_clusters": 2}}},
+}
+
+
+def _loader(tmp_path):
+    # MODEL_SAVE_PATH(.env) 없이 생성: base_dir만 임시 디렉터리로 지정
+    loader = PickleLoader.__new__(PickleLoader)
+    loader.config, loader.models, loader.registry = CONFIG, {}, ModelRegistry(mmap_mode=None)
+    loader.base_dir = str(tmp_path)
+    return loader
+
+
+def _export(tmp_path, tag):
+    saved = [save_model({"tag": tag, "i": i}, path) for i, (_, _, path) in enumerate(_loader(tmp_path).artifacts())]
+    return write_manifest(saved, manifest_path(str(tmp_path), "Num01", "RFR", "v1"))
+
+
+def test_manifest_path_matches_loader(tmp_path):
+    assert manifest_path(str(tmp_path), "Num01", "RFR", "v1") == _loader(tmp_path).manifest_path()
+
+
+def test_signature_follows_manifest_only(tmp_path):
+    loader = _loader(tmp_path)
+    _export(tmp_path, "a")
+    sig = loader.signature()
+    assert loader.manifest_consistent()
+
+    # 다음 내보내기 도중: 모델 파일 일부만 바뀜 → 서명은 그대로, 매니페스트와 불일치
+    _, _, first = loader.artifacts()[0]
+    st = os.stat(first)
+    save_model({"tag": "b"}, first)
+    os.utime(first, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert loader.signature() == sig
+    assert not loader.manifest_consistent()
+
+    # 매니페스트 기록 후에야 서명이 바뀌고 일치 상태
+    mpath = _export(tmp_path, "b")
+    st = os.stat(mpath)
+    os.utime(mpath, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10 ** 9))
+    assert loader.signature() != sig
+    assert loader.manifest_consistent()
+    assert loader.load()["rfr_clusters"][0]["tag"] == "b"
+
+
+def test_missing_manifest_falls_back_to_artifacts(tmp_path):
+    loader = _loader(tmp_path)
+    for _, _, path in loader.artifacts():
+        save_model({}, path)
+    assert len(loader.signature()) == len(loader.artifacts())
+    assert not loader.manifest_consistent()
@@ -0,0 +1,53 @@
+"""NUM06 테이블 버전 맵: 연도별 병합/TTL"""
+import pytest
+
+from services.data_service.api import num06_api
+
+
+class _Cursor:
+    def __init__(self, tables):
+        self.tables = tables  # {연도: LAST_DDL_TIME}
+        self.asked = []
+        self._rows = []
+
+    def execute(self, sql, binds):
+        names = [v for k, v in binds.items() if k != "owner"]
+        self.asked.append(sorted(int(n.split("_")[1]) for n in names))
+        self._rows = [(n, self.tables[int(n.split("_")[1])]) for n in names if int(n.split("_")[1]) in self.tables]
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.setattr(num06_api, "_versions", {})
+    monkeypatch.setattr(num06_api, "VERSION_TTL_S", 30.0)
+
+
+def test_other_year_range_does_not_evict(monkeypatch):
+    cur = _Cursor({2021: "d21", 2022: "d22", 2023: "d23"})
+    assert num06_api._table_versions(cur, [2021, 2022]) == {2021: "d21", 2022: "d22"}
+    assert num06_api._table_versions(cur, [2023]) == {2023: "d23"}
+    assert num06_api._table_versions(cur, [2021, 2022, 2023]) == {2021: "d21", 2022: "d22", 2023: "d23"}
+    assert cur.asked == [[2021, 2022], [2023]]
+
+
+def test_missing_tables_are_cached_too():
+    cur = _Cursor({2021: "d21"})
+    assert num06_api._table_versions(cur, [2020, 2021]) == {2021: "d21"}
+    assert num06_api._table_versions(cur, [2020]) == {}
+    assert cur.asked == [[2020, 2021]]
+
+
+def test_only_expired_years_are_rechecked(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(num06_api.time, "monotonic", lambda: clock[0])
+    cur = _Cursor({2021: "d21", 2022: "d22"})
+    num06_api._table_versions(cur, [2021])
+    clock[0] = 120.0
+    num06_api._table_versions(cur, [2022])
+    clock[0] = 135.0  # 2021만 TTL 경과
+    cur.tables[2021] = "d21-new"
+    assert num06_api._table_versions(cur, [2021, 2022]) == {2021: "d21-new", 2022: "d22"}
+    assert cur.asked == [[2021], [2022], [2021]]
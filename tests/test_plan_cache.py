@@ -0,0 +1,67 @@
+# tests/test_plan_cache.py
+"""
+그래프 플랜 캐시 회귀 테스트
+- fixtures/plan_golden.jsonl: 캐시 도입 전(558dcdd) plan_tasks로 생성한 플랜
+  (intent_golden 질의 150개 + 복합 질의 5개 × 게스트/로그인)
+"""
+import json
+import os
+
+import pytest
+
+from conftest import FIXTURES
+from services.llm_service.orchestrator import graph, planner
+
+
+def _load_golden():
+    with open(os.path.join(FIXTURES, "plan_golden.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+GOLDEN = _load_golden()
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = planner.PlanCache(4096)
+    monkeypatch.setattr(planner, "plan_cache", cache)
+    return cache
+
+
+def _plan(row):
+    return graph.plan_tasks(row["query"], "u01" if row["logged_in"] else None)
+
+
+def test_plans_match_golden_on_miss_and_hit(fresh_cache):
+    for row in GOLDEN:
+        assert _plan(row) == row["plan"], row["query"]
+    assert fresh_cache.stats()["misses"] == len(GOLDEN)
+
+    for row in GOLDEN:
+        assert _plan(row) == row["plan"], row["query"]
+    assert fresh_cache.stats()["hits"] == len(GOLDEN)
+
+
+def test_key_ignores_user_identity_only(fresh_cache):
+    q = "내 CPS랑 LPS 알려주고 학습환경 분석 페이지는 어디야?"
+    graph.plan_tasks(q, "u01")
+    graph.plan_tasks(q, "u02")
+    graph.plan_tasks(q, None)
+    st = fresh_cache.stats()
+    assert (st["hits"], st["misses"]) == (1, 2)
+
+
+def test_returned_plan_is_a_copy(fresh_cache):
+    row = GOLDEN[0]
+    first = _plan(row)
+    first[0]["deps"].append("X")
+    first[0]["slots"]["injected"] = True
+    assert _plan(row) == row["plan"]
+
+
+def test_disabled_cache_always_builds(monkeypatch):
+    monkeypatch.setattr(planner, "plan_cache", planner.PlanCache(0))
+    row = GOLDEN[0]
+    assert _plan(row) == row["plan"]
+    assert _plan(row) == row["plan"]
+    assert planner.plan_cache.stats()["hits"] == 0
@@ -0,0 +1,53 @@
+"""클러스터별 일괄 예측: 행 단위 반복 예측과 동일한 결과"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.cluster import KMeans  # noqa: E402
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+
+from ModelCreator.Utiles.Evaluator import predict_by_cluster  # noqa: E402
+
+
+def _per_row(models_by_cluster, cluster_ids, X):
+    # 이전 Controller_Num01 평가 루프
+    out = []
+    for i, cluster_id in enumerate(cluster_ids):
+        out.append(models_by_cluster[cluster_id].predict(X.iloc[i:i + 1])[0])
+    return np.asarray(out)
+
+
+class _Const:
+    def __init__(self, value, dtype):
+        self.value, self.dtype = value, dtype
+
+    def predict(self, X):
+        return np.full(len(X), self.value, dtype=self.dtype)
+
+
+def test_matches_per_row_loop():
+    rng = np.random.default_rng(45)
+    X = pd.DataFrame(rng.random((300, 5)) * 100, columns=[f"F{i}" for i in range(5)])
+    y = X.to_numpy() @ rng.random(5)
+    km = KMeans(n_clusters=3, n_init=3, random_state=0).fit(X)
+    models = {c: RandomForestRegressor(n_estimators=10, random_state=c).fit(X[km.labels_ == c], y[km.labels_ == c])
+              for c in range(3)}
+
+    X_test = pd.DataFrame(rng.random((120, 5)) * 100, columns=X.columns)
+    cluster_ids = km.predict(X_test)
+    np.testing.assert_array_equal(predict_by_cluster(models, cluster_ids, X_test),
+                                  _per_row(models, cluster_ids, X_test))
+
+
+def test_dtype_across_clusters():
+    X = pd.DataFrame({"F0": np.arange(4.0)})
+    models = {0: _Const(1, np.int64), 1: _Const(2.5, np.float64)}
+    y_pred = predict_by_cluster(models, np.array([0, 1, 0, 1]), X)
+    assert y_pred.dtype == np.float64
+    np.testing.assert_array_equal(y_pred, [1.0, 2.5, 1.0, 2.5])
+
+
+def test_missing_cluster_model():
+    with pytest.raises(ValueError):
+        predict_by_cluster({0: _Const(1.0, np.float64)}, np.array([0, 1]), pd.DataFrame({"F0": [0.0, 1.0]}))
@@ -0,0 +1,123 @@
+"""TokenCounter.source 보고 / PromptAssembler 섹션 예산·축소 순서"""
+from services.llm_service.chains.prompt_budget import (
+    PromptAssembler, TokenCounter, _PER_MESSAGE_OVERHEAD, _truncate_text,
+)
+
+
+def test_source_without_backend_is_approx():
+    c = TokenCounter(None, 0.5)
+    assert c.count("abcd") == 2
+    assert c.source == "approx"
+
+
+def test_backend_returning_none_reports_approx():
+    calls = []
+
+    def no_tokenizer(text):
+        calls.append(text)
+        return None
+
+    c = TokenCounter(no_tokenizer, 0.5)
+    assert c.count("abcd") == 2
+    assert c.count("abcdef") == 3
+    assert c.source == "approx"
+    assert calls == ["abcd"]  # None 이후 백엔드 재호출 없음
+
+
+def test_backend_used_and_mixed():
+    c = TokenCounter(lambda t: len(t), 0.5)
+    assert c.count("abcd") == 4
+    assert c.source == "backend"
+
+    def flaky(text):
+        if text == "boom":
+            raise RuntimeError("tokenizer error")
+        return len(text)
+
+    c = TokenCounter(flaky, 0.5)
+    c.count("abcd")
+    c.count("boom")
+    assert c.source == "mixed"
+
+
+# === PromptAssembler ===
+
+
+def _assembler(n_ctx=400, max_new=100, reserve=0):
+    cfg = {"load_params": {"n_ctx": n_ctx}, "multiturn": {"reserve_tokens": reserve},
+           "generation": {"max_new_tokens": max_new}}
+    return PromptAssembler(cfg, backend_count_fn=len)  # 1글자 = 1토큰
+
+
+def _tokens(msgs):
+    return sum(len(m["content"]) + _PER_MESSAGE_OVERHEAD for m in msgs)
+
+
+def _sections():
+    rag = "\n".join(f"snippet {i:02d} " + "r" * 19 for i in range(5))  # 5줄 × 30자
+    return [
+        ("system", [{"role": "system", "content": "S" * 20}]),
+        ("history", [{"role": "user" if i % 2 == 0 else "assistant", "content": f"turn{i}" + "h" * 55}
+                     for i in range(3)]),
+        ("rag", [{"role": "system", "content": rag}]),
+        ("summary", [{"role": "system", "content": "m" * 80}]),
+        ("user_data", [{"role": "system", "content": "d" * 80}]),
+        ("user", [{"role": "user", "content": "Q" * 30}]),
+    ]
+
+
+def test_budget_floor_is_quarter_of_context():
+    a = _assembler(n_ctx=400, reserve=50)
+    assert a.budget_for(100) == 250
+    assert a.budget_for(10_000) == 100  # 생성 토큰이 과해도 n_ctx // 4 유지
+    assert a.budget_for(None) == 250  # generation.max_new_tokens 기본값
+
+
+def test_trim_order_and_budget():
+    a = _assembler()
+    out, report = a.assemble(_sections(), max_new_tokens=100)
+    budget = report["budget"]
+    assert budget == 300
+    assert report["total"] <= budget
+
+    secs = report["sections"]
+    # history가 먼저 전부 제거되고, 그래도 넘치는 만큼만 rag 축소
+    assert secs["history"]["messages"] == 0 and secs["history"]["trimmed"]
+    assert secs["rag"]["trimmed"] and 0 < secs["rag"]["tokens"] < secs["rag"]["original_tokens"]
+    for name in ("summary", "user_data", "system", "user"):
+        assert not secs[name]["trimmed"]
+        assert secs[name]["tokens"] == secs[name]["original_tokens"]
+    # system 지시문과 현재 질문은 원문 그대로, 출력 순서도 유지
+    assert out[0] == {"role": "system", "content": "S" * 20}
+    assert out[-1] == {"role": "user", "content": "Q" * 30}
+    rag_out = out[1]["content"]
+    assert rag_out.startswith("snippet 00") and "\n" in rag_out and "snippet 04" not in rag_out
+
+
+def test_history_drops_oldest_turns_first():
+    secs = _sections()
+    total = _tokens([m for _, msgs in secs for m in msgs])
+    a = _assembler(n_ctx=total - 30 + 100)  # 예산 30토큰 초과 → 가장 오래된 턴(64토큰) 하나로 충분
+    out, report = a.assemble(secs, max_new_tokens=100)
+    contents = [m["content"] for m in out]
+    assert not any(c.startswith("turn0") for c in contents)
+    assert any(c.startswith("turn1") for c in contents) and any(c.startswith("turn2") for c in contents)
+    assert not report["sections"]["rag"]["trimmed"]
+
+
+def test_report_matches_emitted_messages():
+    a = _assembler(n_ctx=200)
+    out, report = a.assemble(_sections(), max_new_tokens=50)
+    assert report["total"] == _tokens(out) <= report["budget"]
+    assert sum(r["messages"] for r in report["sections"].values()) == len(out)
+    assert report["counter"] == "backend"
+
+
+def test_truncate_text_lines_then_chars():
+    c = TokenCounter(len, 1.0)
+    text = "aaaa\nbbbb\ncccc"
+    assert _truncate_text(text, 100, c) == text
+    assert _truncate_text(text, 10, c) == "aaaa\nbbbb"  # 줄 단위, 앞쪽 우선
+    assert _truncate_text(text, 0, c) == ""
+    cut = _truncate_text("x" * 100, 20, c)  # 한 줄도 안 맞음 → 글자 비례 컷
+    assert cut.endswith("…") and len(cut) <= 20
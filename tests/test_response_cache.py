@@ -0,0 +1,88 @@
+"""응답 캐시: 비결정적 샘플링 우회, 키 구성, TTL/LRU, 디스크 tier"""
+import pytest
+
+from services.llm_service.model import response_cache
+from services.llm_service.model.response_cache import ResponseCache, is_deterministic
+
+MSGS = [{"role": "system", "content": "sys"}, {"role": "user", "content": "질문"}]
+MODEL = {"repo_id": "m1"}
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({"do_sample": False, "temperature": 0.7}, True),
+    ({"temperature": 0}, True),
+    ({"temperature": 0.7, "top_k": 1}, True),
+    ({"do_sample": True, "top_k": 1}, True),
+    ({"do_sample": True}, False),
+    ({"do_sample": True, "temperature": 0}, False),
+    ({"temperature": 0.7}, False),
+    ({"temperature": 0.2, "top_k": 40}, False),
+    ({}, False),
+    ({"temperature": "abc"}, False),
+])
+def test_is_deterministic(params, expected):
+    assert is_deterministic(params) is expected
+
+
+def test_key_changes_with_every_input():
+    c = ResponseCache(8, 0)
+    base = c.make_key("gguf", MODEL, {"temperature": 0}, MSGS)
+    assert base == c.make_key("gguf", dict(MODEL), {"temperature": 0}, [dict(m) for m in MSGS])
+    variants = [
+        c.make_key("hf", MODEL, {"temperature": 0}, MSGS),
+        c.make_key("gguf", {"repo_id": "m2"}, {"temperature": 0}, MSGS),
+        c.make_key("gguf", MODEL, {"temperature": 0, "max_new_tokens": 10}, MSGS),
+        c.make_key("gguf", MODEL, {"temperature": 0}, MSGS[:1] + [{"role": "user", "content": "다른 질문"}]),
+        c.make_key("gguf", MODEL, {"temperature": 0}, [{"role": "user", "content": "sys"}, MSGS[1]]),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+    # 후처리 전용 키는 생성 결과에 영향 없음 → 같은 키
+    assert c.make_key("gguf", MODEL, {"temperature": 0, "force_suffix": "!"}, MSGS) == base
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    c = ResponseCache(8, ttl_s=10)
+    c.put("k", "answer")
+    now[0] += 9
+    assert c.get("k") == "answer"
+    now[0] += 2
+    assert c.get("k") is None
+    st = c.stats()
+    assert st["hits"] == 1 and st["misses"] == 1 and st["entries"] == 0
+
+
+def test_lru_eviction():
+    c = ResponseCache(2, 0)
+    c.put("a", "A")
+    c.put("b", "B")
+    assert c.get("a") == "A"  # a를 최근 사용으로
+    c.put("c", "C")  # 가장 오래 안 쓴 b 제거
+    assert c.get("b") is None
+    assert c.get("a") == "A" and c.get("c") == "C"
+
+
+def test_disabled_when_size_zero():
+    assert not ResponseCache(0, 0).enabled
+
+
+def test_disk_tier_round_trip(tmp_path, monkeypatch):
+    c = ResponseCache(4, ttl_s=60, disk_dir=str(tmp_path))
+    key = c.make_key("gguf", MODEL, {"temperature": 0}, MSGS)
+    c.put(key, "디스크 답변")
+    assert (tmp_path / key[:2] / f"{key}.json").exists()
+
+    # 재시작(새 인스턴스, 메모리 비어 있음) → 디스크에서 읽어 메모리로 올림
+    c2 = ResponseCache(4, ttl_s=60, disk_dir=str(tmp_path))
+    assert c2.get(key) == "디스크 답변"
+    assert c2.stats()["disk_hits"] == 1 and c2.stats()["entries"] == 1
+
+    # 만료된 디스크 항목은 삭제 후 miss
+    real_time = response_cache.time.time
+    monkeypatch.setattr(response_cache.time, "time", lambda: real_time() + 120)
+    c3 = ResponseCache(4, ttl_s=60, disk_dir=str(tmp_path))
+    assert c3.get(key) is None
+    assert not (tmp_path / key[:2] / f"{key}.json").exists()
+
+    assert c.clear() == 1
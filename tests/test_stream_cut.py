@@ -0,0 +1,82 @@
+"""스트리밍 조기 중단(StreamCutter) == 전체 생성 후 컷(cut_text) 동치성"""
+import random
+
+import pytest
+
+from services.llm_service.model.backends.base import IBackend
+from services.llm_service.model.stream_cut import StreamCutter, cut_text
+
+_ALPHABET = ["가", "나", "a", "b", "1", " ", " ", "  ", "\n", "\n\n", " \n ", ".", "!", "?", "。", "\t"]
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 120)))
+
+
+def _chunks(rng: random.Random, text: str):
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, 6)
+        yield text[i:i + n]
+        i += n
+
+
+def _stream(cutter: StreamCutter, pieces) -> str:
+    """GGUF/OpenVINO 스트리밍 경로처럼 on_piece가 True면 거기서 중단"""
+    out = []
+    for piece in pieces:
+        out.append(piece)
+        if cutter.feed(piece):
+            break
+    return "".join(out)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_early_stop_matches_full_text(seed):
+    rng = random.Random(seed)
+    for _ in range(4000):
+        text = _random_text(rng)
+        limits = (rng.choice([0, 0, 5, 20, 60]), rng.choice([0, 0, 1, 2, 3]), rng.choice([0, 0, 1, 2, 4]))
+        cutter = StreamCutter.from_limits(*limits)
+        if cutter is None:
+            continue
+        prefix = _stream(cutter, _chunks(rng, text))
+        assert cut_text(prefix, *limits) == cut_text(text, *limits), (text, limits, prefix)
+
+
+def test_stops_before_end_of_long_answer():
+    sentences = [f"{i}번째 문장입니다." for i in range(50)]
+    cutter = StreamCutter.from_limits(0, 2, 0)
+    prefix = _stream(cutter, (s + " " for s in sentences))
+    assert cutter.stopped
+    assert len(prefix) < len(" ".join(sentences))
+    assert cut_text(prefix, 0, 2, 0) == "0번째 문장입니다. 1번째 문장입니다."
+
+
+def test_no_limits_means_no_cutter():
+    assert StreamCutter.from_limits(0, 0, 0) is None
+
+
+class _BatchOnly(IBackend):
+    def __init__(self, text):
+        self.text = text
+
+    def name(self):
+        return "batch"
+
+    def warmup(self):
+        pass
+
+    def generate(self, messages, gen_params):
+        return self.text
+
+    def close(self):
+        pass
+
+
+def test_default_generate_stream_equals_generate():
+    backend = _BatchOnly("첫 문장. 둘째 문장.\n셋째 줄")
+    cutter = StreamCutter.from_limits(0, 1, 0)
+    streamed = backend.generate_stream([], {}, cutter.feed)
+    assert streamed == backend.generate([], {})
+    assert cut_text(streamed, 0, 1, 0) == "첫 문장."
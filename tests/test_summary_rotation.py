@@ -0,0 +1,57 @@
+"""요약 롤링은 응답 경로 밖에서 처리 — 요약 생성이 막혀 있어도 응답은 바로 반환"""
+import threading
+from types import SimpleNamespace
+
+
+class _BlockingRouter:
+    backend_name = "fake"
+    model_name = "fake"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def generate_messages(self, messages, overrides=None):
+        self.started.set()
+        self.release.wait(10)
+        return "- 요약"
+
+
+def test_response_does_not_wait_for_summary(monkeypatch):
+    from flask import Flask
+    from services.llm_service.api import llm_api
+
+    upserts = []
+    monkeypatch.setattr(llm_api.repo, "append_turn", lambda *a, **k: None)
+    monkeypatch.setattr(llm_api.repo, "fetch_history",
+                        lambda conv_id, limit=None: [{"role": "user", "content": "q"}] * (limit or 1))
+    monkeypatch.setattr(llm_api.repo, "get_latest_summary", lambda conv_id: None)
+    monkeypatch.setattr(llm_api.repo, "max_msg_id", lambda conv_id: 42)
+    monkeypatch.setattr(llm_api.repo, "upsert_summary_on_latest_row",
+                        lambda conv_id, summary_text, cover_to_msg_id: upserts.append((conv_id, summary_text)))
+    monkeypatch.setattr(llm_api, "orchestrate",
+                        lambda router, cfg, repo, inp: SimpleNamespace(answer="답변", route="llm", meta={}))
+
+    router = _BlockingRouter()
+    app = Flask(__name__)
+    app.add_url_rule("/api/chat", "api_chat",
+                     llm_api.build_handlers(app, router=router, cfg={"multiturn": {"summary_turns": 2}})["api_chat"],
+                     methods=["POST"])
+    client = app.test_client()
+    headers = {"X-User-Id": "u01", "X-Conv-Id": "7"}
+
+    resp = client.post("/api/chat", json={"message": "안녕"}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json()["answer"] == "답변"
+    assert router.started.wait(5)  # 요약은 워커에서 진행 중
+    assert upserts == []
+
+    # 같은 대화의 다음 턴도 기다리지 않음
+    assert client.post("/api/chat", json={"message": "또"}, headers=headers).status_code == 200
+
+    router.release.set()
+    for _ in range(100):
+        if upserts:
+            break
+        threading.Event().wait(0.05)
+    assert upserts and upserts[0] == (7, "- 요약")
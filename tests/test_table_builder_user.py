@@ -0,0 +1,93 @@
+"""TableBuilderUser 일괄 예측: 실패 행만 None, 나머지는 단건 예측과 동일"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.cluster import KMeans  # noqa: E402
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+
+from Predictor.PredictionCache import PredictionMemo  # noqa: E402
+from Predictor.TableBuilder_User import TableBuilderUser  # noqa: E402
+
+INPUT_COLS = ["YR", "CPSS_CPS", "LPS_LPS", "VPS_VPS", "LIB_A", "LIB_B"]
+
+
+def _builder(cluster: bool):
+    rng = np.random.default_rng(43)
+    X = rng.random((200, len(INPUT_COLS))) * 100
+    y = X @ rng.random(len(INPUT_COLS))
+    tb = TableBuilderUser.__new__(TableBuilderUser)
+    tb.config = {"SCALER_CONFIG": {"enabled": False}, "CLUSTER_CONFIG": {"enabled": cluster}}
+    tb.input_cols = INPUT_COLS
+    tb.user_features = ["CPSS_CPS", "LPS_LPS", "VPS_VPS"]
+    tb.memo = None
+    tb.model_version = "t"
+    if cluster:
+        km = KMeans(n_clusters=2, n_init=3, random_state=0).fit(X)
+        tb.models = {"cluster_model": km, "rfr_clusters": {
+            c: RandomForestRegressor(n_estimators=5, random_state=0).fit(X[km.labels_ == c], y[km.labels_ == c])
+            for c in (0, 1)}}
+    else:
+        tb.models = {"rfr_full": RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)}
+    lib = {"A대": {"LIB_A": 10.0, "LIB_B": 20.0}, "B대": {"LIB_A": 55.0, "LIB_B": 70.0},
+           "BAD": {"LIB_A": "n/a", "LIB_B": 1.0}}  # 숫자가 아닌 피처 → 예측 실패
+    tb._load_library_data_many = lambda snms, yr: {s: lib[s] for s in snms if s in lib}
+    tb._load_library_data = lambda snm, yr: dict(lib[snm])  # 기존 단건 경로용
+    return tb
+
+
+def _baseline_predict_from_payload(tb, payload):
+    """변경 전 predict_from_payload: 학년마다 _load_library_data + 1행 DataFrame으로 _predict_df"""
+    snm = payload["USR_SNM"]
+    results = {}
+    for nth in ["1ST", "2ND", "3RD", "4TH"]:
+        if f"{nth}_YR" not in payload:
+            continue
+        try:
+            yr = int(payload[f"{nth}_YR"])
+            merged = {
+                "YR": yr,
+                "CPSS_CPS": float(payload.get(f"{nth}_USR_CPS", 0) or 0),
+                "LPS_LPS": float(payload.get(f"{nth}_USR_LPS", 0) or 0),
+                "VPS_VPS": float(payload.get(f"{nth}_USR_VPS", 0) or 0),
+                **tb._load_library_data(snm, yr),
+            }
+            results[f"SCR_EST_{nth}"] = float(tb._predict_df(pd.DataFrame([merged]))[0])
+        except Exception:
+            results[f"SCR_EST_{nth}"] = None
+    return results
+
+
+def _payload(snm, cps):
+    return {"USR_SNM": snm, "1ST_YR": 2023, "1ST_USR_CPS": cps, "1ST_USR_LPS": 3, "1ST_USR_VPS": 4,
+            "2ND_YR": 2024, "2ND_USR_CPS": cps + 1, "2ND_USR_LPS": 5, "2ND_USR_VPS": 6}
+
+
+@pytest.mark.parametrize("cluster", [False, True])
+def test_one_bad_row_does_not_null_the_batch(cluster):
+    tb = _builder(cluster)
+    payloads = [_payload("A대", 10), _payload("BAD", 20), _payload("B대", 90)]
+    batch = tb.predict_from_payloads(payloads)
+
+    assert batch[1] == {"SCR_EST_1ST": None, "SCR_EST_2ND": None}
+    for i in (0, 2):
+        baseline = _baseline_predict_from_payload(tb, payloads[i])
+        assert batch[i] == baseline
+        assert all(v is not None for v in baseline.values())
+
+
+@pytest.mark.parametrize("cluster", [False, True])
+def test_batch_and_memo_match_baseline_per_row_path(cluster):
+    tb = _builder(cluster)
+    tb.memo, tb.model_version = PredictionMemo(), "v1"
+    payloads = [_payload("A대" if i % 2 else "B대", i * 7.5) for i in range(20)]
+    payloads.append({"USR_SNM": "A대", "1ST_YR": 2023, "1ST_USR_CPS": 1, "3RD_YR": 2025})  # 일부 학년만/누락 값
+    payloads.append(_payload("없는대", 5))  # 대학 피처 없음 → None
+    baseline = [_baseline_predict_from_payload(tb, p) for p in payloads]
+
+    assert tb.predict_from_payloads(payloads) == baseline  # 메모 미스 → 일괄 예측
+    assert tb.memo.stats()["hits"] == 0
+    assert tb.predict_from_payloads(payloads) == baseline  # 메모 적중 경로
+    assert tb.memo.stats()["hits"] > 0
+    assert [tb.predict_from_payload(p) for p in payloads] == baseline
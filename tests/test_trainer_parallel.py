@@ -0,0 +1,75 @@
+"""클러스터 병렬 학습: 순차 학습과 같은 모델/지표, n_jobs 재조정은 전체 스레드 설정에만"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("joblib")
+from ModelCreator import Trainer  # noqa: E402
+from ModelCreator.Trainer import ModelTrainer  # noqa: E402
+
+INPUT_COLS = [f"F{i}" for i in range(4)]
+PARAMS = {
+    "full": {"n_estimators": 5, "random_state": 0},
+    "0": {"n_estimators": 8, "max_depth": 6, "random_state": 0, "n_jobs": -1},
+    "1": {"n_estimators": 8, "random_state": 1},  # n_jobs 미지정 → 1스레드 유지
+    "2": {"n_estimators": 8, "random_state": 2, "n_jobs": 1},
+}
+
+
+def _frame():
+    rng = np.random.default_rng(46)
+    sizes = {2: 60, 0: 200, 1: 120}  # 클러스터 크기/등장 순서를 섞음
+    parts = []
+    for cid, n in sizes.items():
+        X = rng.random((n, len(INPUT_COLS))) + cid
+        parts.append(pd.DataFrame(X, columns=INPUT_COLS).assign(Target=X @ [1, 2, 3, 4] + cid, cluster_id=cid))
+    return pd.concat(parts).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def _train(n_workers):
+    trainer = ModelTrainer("RandomForestRegressor", PARAMS, INPUT_COLS, test_size=0.2, target_col="Target",
+                           cluster_enabled=True, n_workers=n_workers)
+    return trainer, trainer.train_by_cluster(_frame())
+
+
+def test_parallel_matches_sequential(monkeypatch):
+    # CPU 1개 환경에서도 병렬(loky) 경로를 타도록 CPU 수를 고정: 프로세스 3 × 스레드 2
+    monkeypatch.setattr(Trainer.os, "cpu_count", lambda: 6)
+    seq, seq_metrics = _train(1)
+    par, par_metrics = _train(3)
+
+    assert list(seq_metrics) == list(par_metrics) == [0, 1, 2]
+    assert list(seq.models_by_cluster) == list(par.models_by_cluster) == [0, 1, 2]
+    assert seq_metrics == par_metrics
+    X = _frame()[INPUT_COLS]
+    for cid in (0, 1, 2):
+        np.testing.assert_array_equal(seq.models_by_cluster[cid].predict(X), par.models_by_cluster[cid].predict(X))
+
+    assert par.models_by_cluster[0].n_jobs == 2        # -1 → CPU 수 // 프로세스 수
+    assert par.models_by_cluster[1].n_jobs is None     # 미지정은 그대로
+    assert par.models_by_cluster[2].n_jobs == 1
+
+
+@pytest.mark.parametrize("model_type, params, expected", [
+    ("RandomForestRegressor", {"n_jobs": -1}, True),
+    ("RandomForestRegressor", {}, False),
+    ("RandomForestRegressor", {"n_jobs": 1}, False),
+    ("RandomForestRegressor", {"n_jobs": 4}, False),
+    ("XGBRegressor", {}, True),
+    ("XGBRegressor", {"n_jobs": -1}, True),
+    ("XGBRegressor", {"n_jobs": 2}, False),
+])
+def test_uses_all_cores(model_type, params, expected):
+    assert Trainer._uses_all_cores(model_type, params) is expected
+
+
+def test_fit_cluster_keeps_unset_n_jobs():
+    df = _frame()
+    rows = np.flatnonzero(df["cluster_id"].to_numpy() == 1)
+    _, model, _, _ = Trainer._fit_cluster("RandomForestRegressor", 1, PARAMS, df[INPUT_COLS].to_numpy(),
+                                          df["Target"].to_numpy(), rows, INPUT_COLS, 0.2, n_jobs=3)
+    assert model.n_jobs is None
+    _, model, _, _ = Trainer._fit_cluster("RandomForestRegressor", 0, PARAMS, df[INPUT_COLS].to_numpy(),
+                                          df["Target"].to_numpy(), np.flatnonzero(df["cluster_id"] == 0),
+                                          INPUT_COLS, 0.2, n_jobs=3)
+    assert model.n_jobs == 3
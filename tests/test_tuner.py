@@ -0,0 +1,57 @@
+"""Successive Halving 탐색: rung 수 정수 계산, early stopping 전용 분할, 클러스터별 PARAMS 반영"""
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("xgboost")
+from ModelCreator import Tuner  # noqa: E402
+from ModelCreator.Tuner import HyperparamTuner, write_tuned_config  # noqa: E402
+
+
+def _config(model_type):
+    return {
+        "MODEL_TYPE": model_type,
+        "PARAMS": {"full": {"n_estimators": 20, "random_state": 0}, "0": {"n_estimators": 20, "max_depth": 3}},
+        "TUNING_PARAMS": {"max_depth": {"type": "int", "range": [2, 6]}},
+    }
+
+
+def _data(n=120):
+    rng = np.random.default_rng(47)
+    X = rng.random((n, 4))
+    return X, X @ rng.random(4)
+
+
+@pytest.mark.parametrize("n, eta, rungs", [(27, 3, 4), (26, 3, 3), (8, 2, 4), (9, 3, 3), (1, 3, 1), (125, 5, 4)])
+def test_rungs_integer(n, eta, rungs, monkeypatch):
+    X, y = _data()
+    tuner = HyperparamTuner(_config("RandomForestRegressor"), X, y)
+    monkeypatch.setattr(tuner, "candidates", lambda _n: [{"n_estimators": 10}] * n)
+    monkeypatch.setattr(tuner, "_evaluate", lambda p, t: {"rmse": 1.0, "best_n_estimators": t})
+    assert tuner.search(n_candidates=n, eta=eta)["rungs"] == rungs
+
+
+def test_early_stopping_split_disjoint_from_validation():
+    X, y = _data()
+    tuner = HyperparamTuner(_config("XGBRegressor"), X, y)
+    assert tuner.early_stopping
+    for X_fit, _, X_va, _, X_es, _ in tuner.folds:
+        assert len(X_es) == int((len(X_fit) + len(X_es)) * Tuner.TUNING_ES_FRACTION)
+        rows = lambda a: {tuple(r) for r in a}  # noqa: E731
+        assert not rows(X_es) & rows(X_va) and not rows(X_es) & rows(X_fit)
+
+
+def test_cluster_params_key(tmp_path):
+    X, y = _data()
+    tuner = HyperparamTuner(_config("RandomForestRegressor"), X, y, params_key=0)
+    assert tuner.params_key == "0" and tuner.base_params["max_depth"] == 3
+    result = {**tuner.search(n_candidates=4, eta=2), "history": tuner.history}
+
+    out = write_tuned_config(_config("RandomForestRegressor"), {"0": result}, str(tmp_path / "cfg.json"))
+    with open(out, encoding="utf-8") as f:
+        tuned = json.load(f)
+    assert tuned["PARAMS"]["0"]["max_depth"] == result["best_params"]["max_depth"]
+    assert tuned["PARAMS"]["full"] == _config("RandomForestRegressor")["PARAMS"]["full"]
+    assert tuned["TUNING_RESULT"]["by_params"]["0"]["history"]
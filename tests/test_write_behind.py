@@ -0,0 +1,59 @@
+# tests/test_write_behind.py
+"""write-behind 버퍼: flush 실패 시 행을 버리지 않고 백오프 재시도, 대화 내 순서 유지"""
+import pytest
+
+from services.llm_service.db import llm_repository_cx as repo
+
+
+class FakeDB:
+    def __init__(self):
+        self.rows = []
+        self.down = False
+        self.poison = set()  # 기록 불가 content
+
+    def insert(self, rows):
+        if self.down or (len(rows) > 1 and any(r[3] in self.poison for r in rows)):
+            raise RuntimeError("ORA-03113")
+        if rows[0][3] in self.poison:
+            raise RuntimeError("ORA-01461")
+        self.rows.extend(rows)
+        return list(range(len(rows)))
+
+
+@pytest.fixture
+def buf(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(repo, "_insert_messages", db.insert)
+    b = repo._WriteBehindBuffer(interval_ms=60_000, max_batch=1000)
+    return b, db
+
+
+def _row(conv, text):
+    return (conv, "u01", "user", text, 0)
+
+
+def test_rows_survive_outage_with_backoff(buf):
+    b, db = buf
+    b.submit([_row(1, "a"), _row(1, "b")])
+    db.down = True
+    assert b.flush() == 0
+    assert b.has_pending()
+    assert b.flush() == 0            # 백오프 중에는 시도하지 않음
+    db.down = False
+    assert b.flush() == 0            # 아직 백오프 시간 전
+    assert b.flush(force=True) == 2  # 강제 flush (종료 시) 는 즉시 기록
+    assert [r[3] for r in db.rows] == ["a", "b"]
+    assert not b.has_pending()
+
+
+def test_poison_row_does_not_block_other_conversations(buf):
+    b, db = buf
+    db.poison = {"bad"}
+    b.submit([_row(1, "q1"), _row(1, "bad"), _row(2, "x"), _row(1, "q2"), _row(2, "y")])
+    assert b.flush() == 3
+    assert [r[3] for r in db.rows] == ["q1", "x", "y"]
+    # 같은 대화의 후속 행은 순서 유지를 위해 함께 보류
+    assert [r[3] for r in b._pending] == ["bad", "q2"]
+    db.poison = set()
+    assert b.flush(force=True) == 2
+    assert [r[3] for r in db.rows] == ["q1", "x", "y", "bad", "q2"]